@@ -1,6 +1,7 @@
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
 from alembic import context
 import os
 import sys
@@ -12,6 +13,10 @@ from app.db.base import Base
 from app.models.user import User
 from app.models.violation import Violation
 from app.models.camera import Camera
+from app.models.violation_rollup import ViolationDailyRollup
+from app.models.plate_ngram import ViolationPlateNgram
+from app.models.evidence import EvidenceBlob
+from app.models.violation_archive import ViolationArchive
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
@@ -59,6 +64,10 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Needed by the trigram index on violations.license_plate_normalized
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            connection.commit()
         context.configure(
             connection=connection, target_metadata=target_metadata
         )
@@ -0,0 +1,112 @@
+"""initial schema
+
+users, cameras and violations as the application created them before
+migrations were tracked. scripts/create_database.py stamps databases from
+that time with this revision.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 04:05:59.502191
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cameras',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('camera_code', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('location', sa.String(length=200), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('camera_type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('rtsp_url', sa.String(length=500), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('installation_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_maintenance', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cameras_camera_code'), 'cameras', ['camera_code'], unique=True)
+    op.create_index(op.f('ix_cameras_id'), 'cameras', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('citizen_id', sa.String(length=20), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('badge_number', sa.String(length=20), nullable=True),
+    sa.Column('department', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_badge_number'), 'users', ['badge_number'], unique=True)
+    op.create_index(op.f('ix_users_citizen_id'), 'users', ['citizen_id'], unique=True)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('violations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('violation_code', sa.String(length=20), nullable=False),
+    sa.Column('license_plate', sa.String(length=20), nullable=False),
+    sa.Column('violation_type', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=False),
+    sa.Column('violation_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('fine_amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('video_url', sa.String(length=500), nullable=True),
+    sa.Column('processed_by', sa.Integer(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processing_notes', sa.Text(), nullable=True),
+    sa.Column('reported_by', sa.Integer(), nullable=True),
+    sa.Column('evidence_urls', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['camera_id'], ['cameras.id'], ),
+    sa.ForeignKeyConstraint(['processed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['reported_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_violations_id'), 'violations', ['id'], unique=False)
+    op.create_index(op.f('ix_violations_license_plate'), 'violations', ['license_plate'], unique=False)
+    op.create_index(op.f('ix_violations_violation_code'), 'violations', ['violation_code'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_violations_violation_code'), table_name='violations')
+    op.drop_index(op.f('ix_violations_license_plate'), table_name='violations')
+    op.drop_index(op.f('ix_violations_id'), table_name='violations')
+    op.drop_table('violations')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_index(op.f('ix_users_citizen_id'), table_name='users')
+    op.drop_index(op.f('ix_users_badge_number'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_cameras_id'), table_name='cameras')
+    op.drop_index(op.f('ix_cameras_camera_code'), table_name='cameras')
+    op.drop_table('cameras')
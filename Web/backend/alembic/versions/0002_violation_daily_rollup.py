@@ -0,0 +1,41 @@
+"""violation daily rollup
+
+Per-day violation counts by camera, type, status and source, kept up to
+date by the violation crud functions. Databases that already have the
+table (created by the old create_database.py) keep it; run
+scripts/rebuild_violation_rollup.py to fill it for existing violations.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 04:06:05.117402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('violation_daily_rollup'):
+        return
+    op.create_table('violation_daily_rollup',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=False),
+    sa.Column('violation_type', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('violation_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'camera_id', 'violation_type', 'status', 'source')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('violation_daily_rollup')
@@ -0,0 +1,59 @@
+"""normalized license plates
+
+violations.license_plate_normalized with a b-tree index for exact
+lookups, plus a pg_trgm GIN index on PostgreSQL or the plate n-gram side
+table elsewhere for substring search. Existing plates are normalized
+here; run scripts/rebuild_plate_index.py afterwards to fill the n-gram
+table. Parts created by the old create_database.py are left as they are.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 04:06:07.630215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'license_plate_normalized' not in {column['name'] for column in inspector.get_columns('violations')}:
+        op.add_column('violations', sa.Column('license_plate_normalized', sa.String(length=20), nullable=True))
+        # Same canonical form as app.core.plates.normalize_plate for the usual separators
+        op.execute(
+            "UPDATE violations SET license_plate_normalized = "
+            "UPPER(REPLACE(REPLACE(REPLACE(license_plate, '-', ''), '.', ''), ' ', ''))"
+        )
+    indexes = {index['name'] for index in inspector.get_indexes('violations')}
+    if 'ix_violations_license_plate_normalized' not in indexes:
+        op.create_index(op.f('ix_violations_license_plate_normalized'), 'violations', ['license_plate_normalized'], unique=False)
+    if op.get_context().dialect.name == "postgresql" and 'ix_violations_license_plate_normalized_trgm' not in indexes:
+        # pg_trgm is created by env.py before migrations run
+        op.create_index('ix_violations_license_plate_normalized_trgm', 'violations', ['license_plate_normalized'], unique=False, postgresql_using='gin', postgresql_ops={'license_plate_normalized': 'gin_trgm_ops'})
+
+    if not inspector.has_table('violation_plate_ngrams'):
+        op.create_table('violation_plate_ngrams',
+        sa.Column('gram', sa.String(length=3), nullable=False),
+        sa.Column('violation_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['violation_id'], ['violations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('gram', 'violation_id')
+        )
+        op.create_index(op.f('ix_violation_plate_ngrams_violation_id'), 'violation_plate_ngrams', ['violation_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_violation_plate_ngrams_violation_id'), table_name='violation_plate_ngrams')
+    op.drop_table('violation_plate_ngrams')
+    if op.get_context().dialect.name == "postgresql":
+        op.drop_index('ix_violations_license_plate_normalized_trgm', table_name='violations')
+    op.drop_index(op.f('ix_violations_license_plate_normalized'), table_name='violations')
+    op.drop_column('violations', 'license_plate_normalized')
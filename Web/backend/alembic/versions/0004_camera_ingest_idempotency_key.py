@@ -0,0 +1,38 @@
+"""camera ingest idempotency key
+
+violations.idempotency_key, unique per camera, so a camera retrying an
+ingest batch does not create the same violation twice. Parts created by
+the old create_database.py are left as they are.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 04:06:09.884170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'idempotency_key' not in {column['name'] for column in inspector.get_columns('violations')}:
+        op.add_column('violations', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+    if 'uq_violations_camera_idempotency_key' not in {constraint['name'] for constraint in inspector.get_unique_constraints('violations')}:
+        # SQLite cannot add a constraint in place; batch mode rebuilds the table there
+        with op.batch_alter_table('violations') as batch_op:
+            batch_op.create_unique_constraint('uq_violations_camera_idempotency_key', ['camera_id', 'idempotency_key'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('violations') as batch_op:
+        batch_op.drop_constraint('uq_violations_camera_idempotency_key', type_='unique')
+    op.drop_column('violations', 'idempotency_key')
@@ -0,0 +1,46 @@
+"""evidence blobs
+
+Content-addressed evidence files with reference counts. last_seen_at is
+the last upload that stored or deduplicated onto a blob; garbage
+collection counts its grace period from then. A table created by the old
+create_database.py gets the columns it is missing. Run
+scripts/gc_evidence.py --recount to count references from violations.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 04:06:11.752908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('evidence_blobs'):
+        op.create_table('evidence_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('storage_key', sa.String(length=200), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+        )
+    elif 'last_seen_at' not in {column['name'] for column in inspector.get_columns('evidence_blobs')}:
+        op.add_column('evidence_blobs', sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        op.execute("UPDATE evidence_blobs SET last_seen_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_table('evidence_blobs')
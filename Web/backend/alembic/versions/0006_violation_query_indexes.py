@@ -0,0 +1,56 @@
+"""violation query indexes
+
+Composite and partial indexes for the hot violation queries: newest-first
+lists (optionally by status), the pending officer queue, officer
+performance, camera efficiency, citizen reports and date ranges. On
+PostgreSQL they are built CONCURRENTLY so writes continue during the build.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 04:06:13.898400
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'pending'")
+
+INDEXES = [
+    ('ix_violations_created_at_id', ['created_at', 'id'], {}),
+    ('ix_violations_status_created_at_id', ['status', 'created_at', 'id'], {}),
+    ('ix_violations_pending_created_at_id', ['created_at', 'id'], {'postgresql_where': PENDING, 'sqlite_where': PENDING}),
+    ('ix_violations_processed_by_processed_at', ['processed_by', 'processed_at'], {}),
+    ('ix_violations_camera_id_violation_time', ['camera_id', 'violation_time'], {}),
+    ('ix_violations_reported_by_status', ['reported_by', 'status'], {}),
+    ('ix_violations_violation_time', ['violation_time'], {}),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, columns, options in INDEXES:
+                op.create_index(name, 'violations', columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **options)
+    else:
+        for name, columns, options in INDEXES:
+            op.create_index(name, 'violations', columns, unique=False, **options)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='violations', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='violations')
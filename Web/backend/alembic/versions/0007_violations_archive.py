@@ -0,0 +1,58 @@
+"""violations archive
+
+Cold table for closed violations moved out of violations by
+scripts/archive_violations.py. Same columns and ids, no foreign keys.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 04:16:02.251126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('violations_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('violation_code', sa.String(length=20), nullable=False),
+    sa.Column('license_plate', sa.String(length=20), nullable=False),
+    sa.Column('license_plate_normalized', sa.String(length=20), nullable=True),
+    sa.Column('violation_type', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=200), nullable=False),
+    sa.Column('violation_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('fine_amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('video_url', sa.String(length=500), nullable=True),
+    sa.Column('idempotency_key', sa.String(length=64), nullable=True),
+    sa.Column('processed_by', sa.Integer(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processing_notes', sa.Text(), nullable=True),
+    sa.Column('reported_by', sa.Integer(), nullable=True),
+    sa.Column('evidence_urls', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_violations_archive_license_plate_normalized'), 'violations_archive', ['license_plate_normalized'], unique=False)
+    op.create_index(op.f('ix_violations_archive_violation_code'), 'violations_archive', ['violation_code'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_violations_archive_violation_code'), table_name='violations_archive')
+    op.drop_index(op.f('ix_violations_archive_license_plate_normalized'), table_name='violations_archive')
+    op.drop_table('violations_archive')
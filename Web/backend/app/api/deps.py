@@ -1,11 +1,18 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Callable, Generator, Optional, Tuple
+from fastapi import Depends, HTTPException, Query, Request, status
+import math
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import verify_token
+from app.core.pagination import decode_cursor, InvalidCursor
+from app.core.rate_limit import lookup_rate_limiter
+from app.core.config import settings
 from app.db.session import SessionLocal
+from app.db.async_session import AsyncSessionLocal, get_async_engine
 from app.models.user import User
-from app.crud.user import get_user_by_id
+from app.crud.user import get_user_snapshot
+from app.crud.aio import user as aio_user
 
 security = HTTPBearer()
 
@@ -16,23 +23,40 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    token = credentials.credentials
-    user_id = verify_token(token)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    user_id = verify_token(credentials.credentials)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = get_user_by_id(db, user_id=int(user_id))
+    return int(user_id)
+
+def _check_user(user: Optional[User]) -> User:
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+def get_current_user(
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    return _check_user(get_user_snapshot(db, user_id=_token_user_id(credentials)))
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    return _check_user(await aio_user.get_user_snapshot(db, user_id=_token_user_id(credentials)))
+
 def get_current_authority_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -52,3 +76,35 @@ def get_current_officer_user(
             detail="Not enough permissions"
         )
     return current_user
+
+async def get_current_officer_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    return get_current_officer_user(current_user)
+
+def cursor_param(*types: type) -> Callable[..., Optional[Tuple]]:
+    """Dependency decoding the opaque `cursor` query parameter into its key values"""
+    async def get_cursor(cursor: Optional[str] = Query(None)) -> Optional[Tuple]:
+        if not cursor:
+            return None
+        try:
+            return decode_cursor(cursor, *types)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return get_cursor
+
+def get_client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def rate_limit_lookup(request: Request) -> None:
+    retry_after = lookup_rate_limiter.acquire(get_client_ip(request))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
@@ -0,0 +1,94 @@
+from typing import Optional
+import mimetypes
+import os
+import time
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.config import settings
+from app.core.derivatives import UPLOADS_URL_PREFIX, local_upload_path
+from app.core.evidence_delivery import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    RangeNotSatisfiable,
+    etag_matches,
+    file_etag,
+    is_immutable_path,
+    iter_file,
+    parse_range,
+    verify_upload_signature,
+)
+
+router = APIRouter()
+
+def _stat_file(path: str) -> Optional[os.stat_result]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat if os.path.isfile(path) else None
+
+def _cache_control(file_path: str, expires: Optional[int]) -> str:
+    if settings.EVIDENCE_SIGNED_URLS:
+        # Signed URLs are per-user and expire; keep them out of shared caches
+        return f"private, max-age={max(min(expires - int(time.time()), 31536000), 0)}"
+    return IMMUTABLE_CACHE_CONTROL if is_immutable_path(file_path) else REVALIDATE_CACHE_CONTROL
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_upload(
+    file_path: str,
+    request: Request,
+    expires: Optional[int] = None,
+    signature: Optional[str] = None,
+):
+    """
+    Serve an uploaded file with strong ETags, If-None-Match (304) and
+    single byte ranges (206), so video evidence can be seeked and
+    immutable evidence cached by browsers and proxies.
+    """
+    if settings.EVIDENCE_SIGNED_URLS and not verify_upload_signature(file_path, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired link")
+
+    path = local_upload_path(UPLOADS_URL_PREFIX + file_path)
+    # Hidden names cover in-progress .part files written next to evidence
+    if path is None or any(part.startswith(".") for part in file_path.split("/")):
+        raise HTTPException(status_code=404, detail="File not found")
+    stat = await run_in_threadpool(_stat_file, path)
+    if stat is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = stat.st_size
+    etag = file_etag(file_path, stat)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _cache_control(file_path, expires),
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or etag_matches(if_range, etag, weak=False):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    length = end - start + 1 if size else 0
+    headers["Content-Length"] = str(length)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        iter_file(path, start, length), status_code=status_code, headers=headers, media_type=media_type
+    )
@@ -1,8 +1,16 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, violations, users, cameras, statistics, officer, reports, citizen
+from app.api.v1.endpoints import auth, violations, users, cameras, statistics, officer, reports, citizen, metrics
+from app.api.v1.endpoints.aio import violations as aio_violations, statistics as aio_statistics
+from app.core.config import settings
 
 api_router = APIRouter()
 
+if settings.DB_ASYNC:
+    # Registered first so they take over the matching sync routes; hidden from
+    # the schema because they mirror the sync signatures exactly
+    api_router.include_router(aio_violations.router, prefix="/violations", tags=["violations"], include_in_schema=False)
+    api_router.include_router(aio_statistics.router, prefix="/statistics", tags=["statistics"], include_in_schema=False)
+
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(violations.router, prefix="/violations", tags=["violations"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -11,3 +19,4 @@ api_router.include_router(statistics.router, prefix="/statistics", tags=["statis
 api_router.include_router(officer.router, prefix="/officer", tags=["officer"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(citizen.router, prefix="/citizen", tags=["citizen"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -0,0 +1 @@
+# Async versions of the hot read endpoints, mounted ahead of the sync ones when DB_ASYNC is enabled
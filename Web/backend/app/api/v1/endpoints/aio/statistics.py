@@ -0,0 +1,43 @@
+from typing import Any
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.crud.aio import violation as crud_violation, camera as crud_camera, user as crud_user
+from app.models.user import User
+from app.core.cache import dashboard_cache
+
+router = APIRouter()
+
+@router.get("/dashboard")
+async def get_dashboard_statistics(
+    db: AsyncSession = Depends(deps.get_async_db),
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(deps.get_current_officer_user_async),
+) -> Any:
+    """
+    Get comprehensive dashboard statistics. For officers and authority users.
+    """
+    violation_stats = await dashboard_cache.aget_or_set(
+        ("violations", "statistics", days),
+        lambda: crud_violation.get_violation_statistics(db, days=days)
+    )
+    camera_stats = await dashboard_cache.aget_or_set(
+        ("cameras", "statistics"),
+        lambda: crud_camera.get_camera_statistics(db)
+    )
+    
+    # User statistics (only for authority)
+    user_stats = {}
+    if current_user.role == "authority":
+        user_stats = await dashboard_cache.aget_or_set(
+            ("users", "statistics"),
+            lambda: crud_user.get_user_statistics(db)
+        )
+    
+    return {
+        "violations": violation_stats,
+        "cameras": camera_stats,
+        "users": user_stats,
+        "period_days": days
+    }
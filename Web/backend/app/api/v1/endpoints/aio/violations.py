@@ -0,0 +1,92 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.api import deps
+from app.crud.aio import violation as crud_violation
+from app.schemas.violation import Violation, ViolationSummary, violation_summaries_json
+from app.models.user import User
+from app.core.cache import dashboard_cache, lookup_cache
+from app.core.plates import normalize_plate
+from app.core.pagination import split_page, json_page_response
+
+router = APIRouter()
+
+@router.get("/", response_model=List[ViolationSummary])
+async def read_violations(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = Query(None),
+    license_plate: Optional[str] = Query(None),
+    violation_type: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    after: Optional[tuple] = Depends(deps.cursor_param(datetime, int)),
+    current_user: User = Depends(deps.get_current_officer_user_async),
+) -> Any:
+    """
+    Retrieve violation summaries with filters. For officers and authority users.
+    The X-Next-Cursor response header holds the cursor for the next page.
+    """
+    violations = await crud_violation.get_violation_summaries(
+        db, 
+        skip=skip, 
+        limit=limit + 1,
+        status=status,
+        license_plate=license_plate,
+        violation_type=violation_type,
+        date_from=date_from,
+        date_to=date_to,
+        after=after
+    )
+    violations, next_cursor = split_page(violations, limit, key=lambda v: (v.created_at, v.id))
+    return json_page_response(violation_summaries_json(violations), next_cursor)
+
+@router.get("/lookup", response_model=List[Violation])
+async def lookup_violations(
+    _: None = Depends(deps.rate_limit_lookup),
+    db: AsyncSession = Depends(deps.get_async_db),
+    license_plate: Optional[str] = Query(None),
+    violation_code: Optional[str] = Query(None),
+) -> Any:
+    """
+    Public endpoint to lookup violations by license plate or violation code.
+    Responses are cached per plate/code and requests are rate limited per client.
+    """
+    if not license_plate and not violation_code:
+        raise HTTPException(
+            status_code=400,
+            detail="Either license_plate or violation_code must be provided"
+        )
+    
+    if violation_code:
+        cache_key = ("code", violation_code)
+    else:
+        cache_key = ("plate", normalize_plate(license_plate))
+    
+    async def load():
+        if violation_code:
+            violation = await crud_violation.get_violation_by_code(db, violation_code)
+            violations = [violation] if violation else []
+        else:
+            violations = await crud_violation.get_violations_by_license_plate(db, license_plate)
+        return [Violation.model_validate(v).model_dump(mode="json") for v in violations]
+    
+    return JSONResponse(content=await lookup_cache.aget_or_set(cache_key, load))
+
+@router.get("/statistics")
+async def get_violation_statistics(
+    db: AsyncSession = Depends(deps.get_async_db),
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(deps.get_current_officer_user_async),
+) -> Any:
+    """
+    Get violation statistics. For officers and authority users.
+    """
+    return await dashboard_cache.aget_or_set(
+        ("violations", "statistics", days),
+        lambda: crud_violation.get_violation_statistics(db, days=days)
+    )
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -13,25 +14,32 @@ from app.schemas.user import User, Token, UserLogin
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db),
     form_data: UserLogin = None
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = crud_user.authenticate_user(
-        db, username=form_data.username, password=form_data.password, role=form_data.role
+    # Username, role and is_active are checked with one quick query before the
+    # bcrypt check, which runs on the password hashing pool
+    user = await run_in_threadpool(
+        crud_user.get_login_candidate, db, username=form_data.username, role=form_data.role
     )
-    if not user:
+    try:
+        password_ok = user is not None and await security.password_hasher.averify(
+            form_data.password, user.hashed_password
+        )
+    except security.PasswordHasherBusy as e:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username, password, or role"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
         )
-    elif not user.is_active:
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Inactive user"
+            detail="Incorrect username, password, or role"
         )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
@@ -1,33 +1,131 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Any, AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.crud import camera as crud_camera
+from app.crud import camera as crud_camera, violation as crud_violation
 from app.schemas.camera import Camera, CameraCreate, CameraUpdate
+from app.schemas.violation import CameraViolationIngest, CameraIngestResult
 from app.models.user import User
+from app.core.config import settings
+from app.core.derivatives import derivative_pipeline
+from app.core.cache import dashboard_cache
+from app.core.pagination import split_page, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_detection_list = TypeAdapter(List[CameraViolationIngest])
+
+def _too_many_detections() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"At most {settings.INGEST_MAX_ITEMS} detections per request"
+    )
+
+def _body_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Request body larger than {settings.INGEST_MAX_BODY_BYTES} bytes"
+    )
+
+async def _read_limited(request: Request) -> AsyncIterator[bytes]:
+    """
+    The request body in chunks, refused with 413 once it passes
+    INGEST_MAX_BODY_BYTES: up front from Content-Length, otherwise as the
+    bytes arrive, so an oversized body is never held in memory
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.INGEST_MAX_BODY_BYTES:
+        raise _body_too_large()
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.INGEST_MAX_BODY_BYTES:
+            raise _body_too_large()
+        yield chunk
+
+async def _read_ndjson(request: Request) -> List[CameraViolationIngest]:
+    detections = []
+    line_number = 0
+    buffer = b""
+
+    def check_line_size(line: bytes) -> None:
+        if len(line) > settings.INGEST_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line {line_number + 1} is larger than {settings.INGEST_MAX_LINE_BYTES} bytes"
+            )
+
+    def parse(line: bytes) -> None:
+        nonlocal line_number
+        check_line_size(line)
+        line_number += 1
+        if not line.strip():
+            return
+        if len(detections) >= settings.INGEST_MAX_ITEMS:
+            raise _too_many_detections()
+        try:
+            detections.append(CameraViolationIngest.model_validate_json(line))
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", line_number, *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+
+    async for chunk in _read_limited(request):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line)
+        # An unfinished line is refused as soon as it is too long, not when it ends
+        check_line_size(buffer)
+    parse(buffer)
+    return detections
+
+async def _read_json(request: Request) -> List[CameraViolationIngest]:
+    body = b"".join([chunk async for chunk in _read_limited(request)])
+    try:
+        detections = _detection_list.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+    if len(detections) > settings.INGEST_MAX_ITEMS:
+        raise _too_many_detections()
+    return detections
+
 @router.get("/", response_model=List[Camera])
 def read_cameras(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = Query(None),
     camera_type: Optional[str] = Query(None),
+    after: Optional[tuple] = Depends(deps.cursor_param(int)),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
     Retrieve cameras with filters. For officers and authority users.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
     cameras = crud_camera.get_cameras(
         db, 
         skip=skip, 
-        limit=limit,
+        limit=limit + 1,
         status=status,
-        camera_type=camera_type
+        camera_type=camera_type,
+        after_id=after[0] if after else None
     )
+    cameras, next_cursor = split_page(cameras, limit, key=lambda c: (c.id,))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return cameras
 
 @router.get("/statistics")
@@ -38,7 +136,10 @@ def get_camera_statistics(
     """
     Get camera statistics. For officers and authority users.
     """
-    return crud_camera.get_camera_statistics(db)
+    return dashboard_cache.get_or_set(
+        ("cameras", "statistics"),
+        lambda: crud_camera.get_camera_statistics(db)
+    )
 
 @router.get("/{camera_id}", response_model=Camera)
 def read_camera(
@@ -55,6 +156,66 @@ def read_camera(
         raise HTTPException(status_code=404, detail="Camera not found")
     return camera
 
+@router.post(
+    "/{camera_id}/violations",
+    response_model=CameraIngestResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/CameraViolationIngest"}}
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/CameraViolationIngest"}
+                },
+            },
+        }
+    },
+)
+async def ingest_camera_violations(
+    camera_id: int,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_officer_user),
+) -> Any:
+    """
+    Bulk ingest of a camera's detections, as a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson), inserted in one transaction. Bodies
+    over INGEST_MAX_BODY_BYTES (and NDJSON lines over INGEST_MAX_LINE_BYTES)
+    are refused with 413 before they are parsed. Each
+    detection carries an idempotency_key; detections already ingested for
+    this camera are reported as duplicates instead of creating new violations.
+    For officers and authority users.
+    """
+    camera = await run_in_threadpool(crud_camera.get_camera, db, camera_id=camera_id)
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        detections = await _read_ndjson(request)
+    else:
+        detections = await _read_json(request)
+    
+    results = await run_in_threadpool(
+        crud_violation.ingest_camera_violations, db, camera_id=camera_id, detections=detections
+    )
+    # Duplicates had their derivatives scheduled when they were first ingested
+    first_by_key = {}
+    for detection in detections:
+        first_by_key.setdefault(detection.idempotency_key, detection)
+    derivative_pipeline.submit(
+        first_by_key[result["idempotency_key"]].image_url for result in results if not result["duplicate"]
+    )
+    created = sum(1 for result in results if not result["duplicate"])
+    return {
+        "received": len(detections),
+        "created": created,
+        "duplicates": len(results) - created,
+        "violations": results
+    }
+
 @router.post("/", response_model=Camera)
 def create_camera(
     *,
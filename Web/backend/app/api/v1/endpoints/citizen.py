@@ -2,19 +2,20 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import os
-import uuid
 
 from app.api import deps
 from app.crud import violation as crud_violation, user as crud_user
-from app.schemas.violation import Violation, ViolationReport
+from app.crud import analytics as crud_analytics
+from app.schemas.violation import Violation, ViolationReport, ViolationSummary, violation_summaries_json
 from app.schemas.user import UserUpdate
 from app.models.user import User
-from app.core.config import settings
+from app.core.uploads import check_content_types, store_evidence_uploads
+from app.core.derivatives import derivative_pipeline
+from app.core.pagination import json_page_response
 
 router = APIRouter()
 
-@router.get("/my-violations", response_model=List[Violation])
+@router.get("/my-violations", response_model=List[ViolationSummary])
 def get_my_violations(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -23,17 +24,16 @@ def get_my_violations(
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get violations reported by current citizen.
+    Get summaries of the violations reported by current citizen, newest first.
     """
-    query = db.query(crud_violation.Violation).filter(
-        crud_violation.Violation.reported_by == current_user.id
+    violations = crud_violation.get_violation_summaries(
+        db,
+        skip=skip,
+        limit=limit,
+        status=status,
+        reported_by=current_user.id
     )
-    
-    if status:
-        query = query.filter(crud_violation.Violation.status == status)
-    
-    violations = query.offset(skip).limit(limit).all()
-    return violations
+    return json_page_response(violation_summaries_json(violations))
 
 @router.post("/report-violation", response_model=Violation)
 async def report_violation(
@@ -70,39 +70,16 @@ async def report_violation(
 async def upload_evidence_for_report(
     *,
     files: List[UploadFile] = File(...),
+    db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Upload evidence files for violation reports.
+    Upload evidence files for violation reports. Files are stored once per
+    distinct content; a repeated upload returns the existing URL.
     """
-    uploaded_files = []
-    
-    for file in files:
-        # Validate file type
-        allowed_types = ["image/jpeg", "image/png", "image/jpg", "video/mp4"]
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {file.content_type} not allowed"
-            )
-        
-        # Generate unique filename
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"citizen_{current_user.id}_{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
-        
-        # Save file
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            if len(content) > settings.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail="File too large"
-                )
-            buffer.write(content)
-        
-        uploaded_files.append(f"/uploads/{unique_filename}")
+    check_content_types(files, ["image/jpeg", "image/png", "image/jpg", "video/mp4"])
+    uploaded_files = [upload.url for upload in await store_evidence_uploads(db, files)]
+    derivative_pipeline.submit(uploaded_files)
     
     return {
         "message": f"Uploaded {len(uploaded_files)} files successfully",
@@ -117,26 +94,12 @@ def get_my_reports_statistics(
     """
     Get statistics of citizen's violation reports.
     """
-    from app.models.violation import Violation
-    
-    total_reports = db.query(Violation).filter(
-        Violation.reported_by == current_user.id
-    ).count()
-    
-    pending_reports = db.query(Violation).filter(
-        Violation.reported_by == current_user.id,
-        Violation.status == "pending"
-    ).count()
-    
-    processed_reports = db.query(Violation).filter(
-        Violation.reported_by == current_user.id,
-        Violation.status == "processed"
-    ).count()
+    counts = crud_analytics.count_by(db, "status", reported_by=current_user.id)
     
-    rejected_reports = db.query(Violation).filter(
-        Violation.reported_by == current_user.id,
-        Violation.status == "rejected"
-    ).count()
+    total_reports = sum(counts.values())
+    pending_reports = counts.get("pending", 0)
+    processed_reports = counts.get("processed", 0)
+    rejected_reports = counts.get("rejected", 0)
     
     return {
         "total_reports": total_reports,
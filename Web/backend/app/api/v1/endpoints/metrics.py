@@ -0,0 +1,37 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.models.user import User
+from app.db.pool import pool_metrics
+from app.core.security import password_hasher
+from app.core.derivatives import derivative_pipeline
+
+router = APIRouter()
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    current_user: User = Depends(deps.get_current_authority_user),
+) -> Any:
+    """
+    Connection pool usage and checkout wait times for this process. For authority users only.
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+@router.get("/password-hashing")
+async def get_password_hashing_metrics(
+    current_user: User = Depends(deps.get_current_authority_user),
+) -> Any:
+    """
+    Password hashing pool load and queue wait times for this process. For authority users only.
+    """
+    return password_hasher.stats()
+
+@router.get("/derivatives")
+async def get_derivative_metrics(
+    current_user: User = Depends(deps.get_current_authority_user),
+) -> Any:
+    """
+    Image derivative pipeline backlog for this process. For authority users only.
+    """
+    return derivative_pipeline.stats()
@@ -1,59 +1,69 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import os
-import uuid
 
 from app.api import deps
 from app.crud import violation as crud_violation, camera as crud_camera
-from app.schemas.violation import Violation, ViolationUpdate
+from app.crud import analytics as crud_analytics
+from app.schemas.violation import Violation, ViolationUpdate, ViolationSummary, violation_summaries_json
 from app.models.user import User
-from app.core.config import settings
+from app.core.uploads import check_content_types, store_evidence_uploads
+from app.core.derivatives import derivative_pipeline
+from app.core.pagination import split_page, json_page_response
 
 router = APIRouter()
 
-@router.get("/assigned-violations", response_model=List[Violation])
+@router.get("/assigned-violations", response_model=List[ViolationSummary])
 def get_assigned_violations(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = Query("pending"),
+    after: Optional[tuple] = Depends(deps.cursor_param(datetime, int)),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
     Get violations assigned to current officer or pending violations.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
-    violations = crud_violation.get_violations(
+    violations = crud_violation.get_violation_summaries(
         db, 
         skip=skip, 
-        limit=limit,
-        status=status
+        limit=limit + 1,
+        status=status,
+        after=after
     )
-    return violations
+    violations, next_cursor = split_page(violations, limit, key=lambda v: (v.created_at, v.id))
+    return json_page_response(violation_summaries_json(violations), next_cursor)
 
-@router.get("/my-processed-violations", response_model=List[Violation])
+@router.get("/my-processed-violations", response_model=List[ViolationSummary])
 def get_my_processed_violations(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     days: int = Query(30, ge=1, le=365),
+    after: Optional[tuple] = Depends(deps.cursor_param(datetime, int)),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
     Get violations processed by current officer in the last N days.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
     date_from = datetime.utcnow() - timedelta(days=days)
     
     # In a real implementation, you'd filter by processed_by = current_user.id
-    violations = crud_violation.get_violations(
+    violations = crud_violation.get_violation_summaries(
         db, 
         skip=skip, 
-        limit=limit,
+        limit=limit + 1,
         status="processed",
-        date_from=date_from
+        date_from=date_from,
+        after=after
     )
-    return violations
+    violations, next_cursor = split_page(violations, limit, key=lambda v: (v.created_at, v.id))
+    return json_page_response(violation_summaries_json(violations), next_cursor)
 
 @router.put("/process-violation/{violation_id}", response_model=Violation)
 def process_violation(
@@ -97,40 +107,17 @@ async def upload_evidence(
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
-    Upload additional evidence for a violation.
+    Upload additional evidence for a violation. Files are stored once per
+    distinct content and appended to the violation's evidence.
     """
-    violation = crud_violation.get_violation(db, violation_id=violation_id)
+    violation = await run_in_threadpool(crud_violation.get_violation, db, violation_id=violation_id)
     if not violation:
         raise HTTPException(status_code=404, detail="Violation not found")
     
-    uploaded_files = []
-    
-    for file in files:
-        # Validate file type
-        allowed_types = ["image/jpeg", "image/png", "image/jpg", "video/mp4", "video/avi"]
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {file.content_type} not allowed"
-            )
-        
-        # Generate unique filename
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
-        
-        # Save file
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            if len(content) > settings.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail="File too large"
-                )
-            buffer.write(content)
-        
-        uploaded_files.append(f"/uploads/{unique_filename}")
+    check_content_types(files, ["image/jpeg", "image/png", "image/jpg", "video/mp4", "video/avi"])
+    uploaded_files = [upload.url for upload in await store_evidence_uploads(db, files)]
+    await run_in_threadpool(crud_violation.add_violation_evidence, db, violation, uploaded_files)
+    derivative_pipeline.submit(uploaded_files)
     
     return {
         "message": f"Uploaded {len(uploaded_files)} files successfully",
@@ -149,24 +136,24 @@ def get_workload_statistics(
     date_from = datetime.utcnow() - timedelta(days=days)
     
     # In a real implementation, these would be filtered by current_user.id
-    total_assigned = crud_violation.get_violations(
-        db, status="pending", limit=1000
-    )
+    pending_count = crud_analytics.count_by(
+        db, "status", status="pending"
+    ).get("pending", 0)
     
-    total_processed = crud_violation.get_violations(
-        db, status="processed", date_from=date_from, limit=1000
-    )
+    processed_count = crud_analytics.count_by(
+        db, "status", date_from=date_from, status="processed"
+    ).get("processed", 0)
     
     return {
-        "pending_violations": len(total_assigned),
-        "processed_violations": len(total_processed),
-        "processing_rate": len(total_processed) / max(len(total_assigned) + len(total_processed), 1) * 100,
+        "pending_violations": pending_count,
+        "processed_violations": processed_count,
+        "processing_rate": processed_count / max(pending_count + processed_count, 1) * 100,
         "period_days": days,
         "officer_name": current_user.full_name,
         "badge_number": current_user.badge_number
     }
 
-@router.get("/recent-activity", response_model=List[Violation])
+@router.get("/recent-activity", response_model=List[ViolationSummary])
 def get_recent_activity(
     db: Session = Depends(deps.get_db),
     limit: int = Query(10, ge=1, le=50),
@@ -176,12 +163,12 @@ def get_recent_activity(
     Get officer's recent activity (last processed violations).
     """
     # In a real implementation, this would filter by processed_by = current_user.id
-    violations = crud_violation.get_violations(
+    violations = crud_violation.get_violation_summaries(
         db, 
         limit=limit,
         status="processed"
     )
-    return violations
+    return json_page_response(violation_summaries_json(violations))
 
 @router.post("/quick-process")
 def quick_process_violations(
@@ -201,48 +188,20 @@ def quick_process_violations(
             detail="Action must be 'approve' or 'reject'"
         )
     
-    processed_violations = []
-    failed_violations = []
+    status = "processed" if action == "approve" else "rejected"
+    processing_notes = notes or f"Bulk {action} by officer {current_user.badge_number}"
     
-    for violation_id in violation_ids:
-        try:
-            violation = crud_violation.get_violation(db, violation_id=violation_id)
-            if not violation:
-                failed_violations.append({
-                    "violation_id": violation_id,
-                    "error": "Violation not found"
-                })
-                continue
-            
-            if violation.status != "pending":
-                failed_violations.append({
-                    "violation_id": violation_id,
-                    "error": "Violation is not pending"
-                })
-                continue
-            
-            status = "processed" if action == "approve" else "rejected"
-            processing_notes = notes or f"Bulk {action} by officer {current_user.badge_number}"
-            
-            violation_update = ViolationUpdate(
-                status=status,
-                processing_notes=processing_notes
-            )
-            
-            updated_violation = crud_violation.update_violation(
-                db,
-                violation_id=violation_id,
-                violation_update=violation_update,
-                processed_by=current_user.id
-            )
-            
-            processed_violations.append(updated_violation.id)
-            
-        except Exception as e:
-            failed_violations.append({
-                "violation_id": violation_id,
-                "error": str(e)
-            })
+    processed_violations, failures = crud_violation.bulk_update_status(
+        db,
+        violation_ids=violation_ids,
+        status=status,
+        processing_notes=processing_notes,
+        processed_by=current_user.id
+    )
+    failed_violations = [
+        {"violation_id": violation_id, "error": error}
+        for violation_id, error in failures.items()
+    ]
     
     return {
         "message": f"Processed {len(processed_violations)} violations",
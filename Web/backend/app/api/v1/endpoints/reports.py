@@ -1,13 +1,18 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
 
 from app.api import deps
-from app.models.violation import Violation
-from app.models.camera import Camera
+from app.core.pagination import split_page
+from app.crud import violation_rollup as crud_rollup
+from app.crud import analytics as crud_analytics
+from app.crud import export as crud_export
+from app.core.export_jobs import export_jobs, ExportQueueFull
+from app.db.session import SessionLocal
 from app.models.user import User
+from app.schemas.export import ExportJob, ExportJobCreate
 
 router = APIRouter()
 
@@ -21,25 +26,19 @@ def get_violation_trends(
     Get violation trends over time for reports and analytics.
     """
     date_from = datetime.utcnow() - timedelta(days=days)
+    day_from = date_from.date()
+    
+    # Read pre-aggregated daily counts from the rollup table
+    counts = crud_rollup.get_daily_counts(
+        db, day_from=day_from, day_to=day_from + timedelta(days=days - 1)
+    )
     
-    # Group violations by date (simplified version)
-    # In a real implementation, you'd use proper SQL grouping
     violations_by_day = []
     for i in range(days):
-        day = date_from + timedelta(days=i)
-        day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-        
-        count = db.query(Violation).filter(
-            and_(
-                Violation.violation_time >= day_start,
-                Violation.violation_time < day_end
-            )
-        ).count()
-        
+        day = day_from + timedelta(days=i)
         violations_by_day.append({
-            "date": day_start.strftime("%Y-%m-%d"),
-            "count": count
+            "date": day.strftime("%Y-%m-%d"),
+            "count": counts.get(day, 0)
         })
     
     return {
@@ -51,54 +50,52 @@ def get_violation_trends(
 def get_performance_report(
     db: Session = Depends(deps.get_db),
     days: int = Query(30, ge=1, le=365),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    sort_by: str = Query("processed_violations", pattern="^(processed_violations|median_processing_seconds|p90_processing_seconds|full_name|badge_number)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
     Get performance report for officers (authority only) or self-report for officers.
+    Processing times are in seconds from creation to processing.
     """
     date_from = datetime.utcnow() - timedelta(days=days)
     
     if current_user.role == "authority":
         # Authority can see all officers' performance
-        officers = db.query(User).filter(User.role == "officer", User.is_active == True).all()
-        
-        performance_data = []
-        for officer in officers:
-            processed_count = db.query(Violation).filter(
-                and_(
-                    Violation.processed_by == officer.id,
-                    Violation.processed_at >= date_from
-                )
-            ).count()
-            
-            performance_data.append({
-                "officer_id": officer.id,
-                "officer_name": officer.full_name,
-                "badge_number": officer.badge_number,
-                "processed_violations": processed_count,
-                "department": officer.department
-            })
+        performance_data, total_officers = crud_analytics.officer_performance(
+            db,
+            date_from=date_from,
+            sort_by=sort_by,
+            descending=order == "desc",
+            skip=skip,
+            limit=limit
+        )
         
         return {
             "period_days": days,
+            "total_officers": total_officers,
+            "skip": skip,
+            "limit": limit,
             "officers_performance": performance_data
         }
     
     else:
         # Officer can only see their own performance
-        processed_count = db.query(Violation).filter(
-            and_(
-                Violation.processed_by == current_user.id,
-                Violation.processed_at >= date_from
-            )
-        ).count()
+        rows, _ = crud_analytics.officer_performance(
+            db, date_from=date_from, officer_id=current_user.id
+        )
+        performance = rows[0] if rows else {}
         
         return {
             "period_days": days,
             "officer_performance": {
                 "officer_name": current_user.full_name,
                 "badge_number": current_user.badge_number,
-                "processed_violations": processed_count,
+                "processed_violations": performance.get("processed_violations", 0),
+                "median_processing_seconds": performance.get("median_processing_seconds"),
+                "p90_processing_seconds": performance.get("p90_processing_seconds"),
                 "department": current_user.department
             }
         }
@@ -107,41 +104,31 @@ def get_performance_report(
 def get_camera_efficiency(
     db: Session = Depends(deps.get_db),
     days: int = Query(30, ge=1, le=365),
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[tuple] = Depends(deps.cursor_param(int, int)),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
     Get camera efficiency report showing violations detected per camera.
+    Pass the returned next_cursor to fetch the following page.
     """
     date_from = datetime.utcnow() - timedelta(days=days)
     
-    cameras = db.query(Camera).filter(Camera.status == "active").all()
-    
-    camera_efficiency = []
-    for camera in cameras:
-        violation_count = db.query(Violation).filter(
-            and_(
-                Violation.camera_id == camera.id,
-                Violation.violation_time >= date_from
-            )
-        ).count()
-        
-        camera_efficiency.append({
-            "camera_id": camera.id,
-            "camera_code": camera.camera_code,
-            "camera_name": camera.name,
-            "location": camera.location,
-            "camera_type": camera.camera_type,
-            "violations_detected": violation_count,
-            "efficiency_rate": violation_count / days  # violations per day
-        })
+    # Fetch one extra row to know whether another page exists
+    camera_efficiency, summary = crud_analytics.camera_efficiency(
+        db, date_from=date_from, days=days, after=after, limit=limit + 1
+    )
     
-    # Sort by violations detected (descending)
-    camera_efficiency.sort(key=lambda x: x["violations_detected"], reverse=True)
+    camera_efficiency, next_cursor = split_page(
+        camera_efficiency, limit, key=lambda c: (c["violations_detected"], c["camera_id"])
+    )
     
     return {
         "period_days": days,
         "camera_efficiency": camera_efficiency,
-        "total_cameras": len(cameras)
+        "total_cameras": summary["total_cameras"],
+        "cameras_without_detections": summary["cameras_without_detections"],
+        "next_cursor": next_cursor
     }
 
 @router.get("/export-data")
@@ -151,44 +138,42 @@ def export_violation_data(
     date_to: Optional[datetime] = Query(None),
     status: Optional[str] = Query(None),
     violation_type: Optional[str] = Query(None),
+    format: str = Query("json", pattern="^(json|csv|ndjson)$"),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
-    Export violation data for reports (simplified version).
-    In a real implementation, this would generate CSV/Excel files.
+    Export violation data for reports.
+    format=csv or format=ndjson streams the rows with constant memory;
+    format=json returns a single JSON document with a summary.
     """
     if not date_from:
         date_from = datetime.utcnow() - timedelta(days=30)
     if not date_to:
         date_to = datetime.utcnow()
     
-    query = db.query(Violation).filter(
-        and_(
-            Violation.violation_time >= date_from,
-            Violation.violation_time <= date_to
-        )
+    query = crud_export.build_export_query(
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        violation_type=violation_type
     )
     
-    if status:
-        query = query.filter(Violation.status == status)
-    if violation_type:
-        query = query.filter(Violation.violation_type.ilike(f"%{violation_type}%"))
-    
-    violations = query.all()
+    if format != "json":
+        render = crud_export.EXPORT_RENDERERS[format]
+        
+        def stream():
+            # Own session: the rows are produced after the endpoint has returned
+            with SessionLocal() as stream_db:
+                yield from render(crud_export.iter_export_rows(stream_db, query))
+        
+        filename = f"violations_{date_from:%Y%m%d}_{date_to:%Y%m%d}.{format}"
+        return StreamingResponse(
+            stream(),
+            media_type=crud_export.EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
     
-    export_data = []
-    for violation in violations:
-        export_data.append({
-            "violation_code": violation.violation_code,
-            "license_plate": violation.license_plate,
-            "violation_type": violation.violation_type,
-            "location": violation.location,
-            "violation_time": violation.violation_time.isoformat(),
-            "fine_amount": violation.fine_amount,
-            "status": violation.status,
-            "source": violation.source,
-            "processed_at": violation.processed_at.isoformat() if violation.processed_at else None
-        })
+    export_data = list(crud_export.iter_export_rows(db, query))
     
     return {
         "export_summary": {
@@ -202,3 +187,64 @@ def export_violation_data(
         },
         "data": export_data
     }
+
+@router.post("/export-jobs", response_model=ExportJob, status_code=202)
+def create_export_job(
+    *,
+    job_in: ExportJobCreate,
+    current_user: User = Depends(deps.get_current_officer_user),
+) -> Any:
+    """
+    Start a background export. Poll the returned job for progress and
+    download the file once it has completed.
+    """
+    date_to = job_in.date_to or datetime.utcnow()
+    date_from = job_in.date_from or date_to - timedelta(days=30)
+    
+    try:
+        job = export_jobs.submit(
+            owner_id=current_user.id,
+            format=job_in.format,
+            filters={
+                "date_from": date_from,
+                "date_to": date_to,
+                "status": job_in.status,
+                "violation_type": job_in.violation_type
+            }
+        )
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+def _get_visible_export_job(job_id: str, current_user: User):
+    job = export_jobs.get(job_id)
+    if not job or (job.owner_id != current_user.id and current_user.role != "authority"):
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@router.get("/export-jobs/{job_id}", response_model=ExportJob)
+def get_export_job(
+    job_id: str,
+    current_user: User = Depends(deps.get_current_officer_user),
+) -> Any:
+    """
+    Get the status and progress of an export job.
+    """
+    return _get_visible_export_job(job_id, current_user).to_dict()
+
+@router.get("/export-jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    current_user: User = Depends(deps.get_current_officer_user),
+) -> Any:
+    """
+    Download the file produced by a completed export job.
+    """
+    job = _get_visible_export_job(job_id, current_user)
+    if job.status != "completed" or not job.file_path:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    return FileResponse(
+        job.file_path,
+        media_type=crud_export.EXPORT_MEDIA_TYPES[job.format],
+        filename=f"violations_export_{job.id}.{job.format}"
+    )
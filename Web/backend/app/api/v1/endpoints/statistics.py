@@ -1,11 +1,14 @@
-from typing import Any
-from fastapi import APIRouter, Depends, Query
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
 from app.api import deps
 from app.crud import violation as crud_violation, camera as crud_camera, user as crud_user
+from app.crud import analytics as crud_analytics
 from app.models.user import User
+from app.core.config import settings
+from app.core.cache import dashboard_cache
 
 router = APIRouter()
 
@@ -18,23 +21,22 @@ def get_dashboard_statistics(
     """
     Get comprehensive dashboard statistics. For officers and authority users.
     """
-    violation_stats = crud_violation.get_violation_statistics(db, days=days)
-    camera_stats = crud_camera.get_camera_statistics(db)
+    violation_stats = dashboard_cache.get_or_set(
+        ("violations", "statistics", days),
+        lambda: crud_violation.get_violation_statistics(db, days=days)
+    )
+    camera_stats = dashboard_cache.get_or_set(
+        ("cameras", "statistics"),
+        lambda: crud_camera.get_camera_statistics(db)
+    )
     
     # User statistics (only for authority)
     user_stats = {}
     if current_user.role == "authority":
-        total_users = len(crud_user.get_users(db))
-        officers = len(crud_user.get_users_by_role(db, "officer"))
-        citizens = len(crud_user.get_users_by_role(db, "citizen"))
-        authorities = len(crud_user.get_users_by_role(db, "authority"))
-        
-        user_stats = {
-            "total_users": total_users,
-            "officers": officers,
-            "citizens": citizens,
-            "authorities": authorities
-        }
+        user_stats = dashboard_cache.get_or_set(
+            ("users", "statistics"),
+            lambda: crud_user.get_user_statistics(db)
+        )
     
     return {
         "violations": violation_stats,
@@ -54,16 +56,9 @@ def get_violations_by_type(
     """
     date_from = datetime.utcnow() - timedelta(days=days)
     
-    # This would need a more complex query in a real implementation
-    # For now, returning sample data structure
-    return {
-        "speeding": 45,
-        "red_light": 32,
-        "parking": 28,
-        "no_helmet": 15,
-        "wrong_lane": 12,
-        "period_days": days
-    }
+    result = crud_analytics.count_by(db, "violation_type", date_from=date_from)
+    result["period_days"] = days
+    return result
 
 @router.get("/violations/by-location")
 def get_violations_by_location(
@@ -76,13 +71,62 @@ def get_violations_by_location(
     """
     date_from = datetime.utcnow() - timedelta(days=days)
     
-    # This would need a more complex query in a real implementation
-    # For now, returning sample data structure
+    result = crud_analytics.count_by(db, "location", date_from=date_from)
+    result["period_days"] = days
+    return result
+
+@router.get("/analytics")
+def get_violation_analytics(
+    db: Session = Depends(deps.get_db),
+    group_by: List[str] = Query([]),
+    bucket: Optional[str] = Query(None, pattern="^(hour|day|week|month)$"),
+    days: int = Query(30, ge=1, le=365),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    time_field: str = Query("violation_time", pattern="^(violation_time|created_at|processed_at)$"),
+    status: Optional[str] = Query(None),
+    violation_type: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    camera_id: Optional[int] = Query(None),
+    processed_by: Optional[int] = Query(None),
+    top_n: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: User = Depends(deps.get_current_officer_user),
+) -> Any:
+    """
+    Aggregate violations by any combination of dimensions and an optional time
+    bucket (in the report timezone). For officers and authority users.
+    """
+    if not date_from:
+        date_from = datetime.utcnow() - timedelta(days=days)
+    
+    try:
+        rows = crud_analytics.aggregate_violations(
+            db,
+            group_by=group_by,
+            bucket=bucket,
+            date_from=date_from,
+            date_to=date_to,
+            time_field=time_field,
+            filters={
+                "status": status,
+                "violation_type": violation_type,
+                "source": source,
+                "location": location,
+                "camera_id": camera_id,
+                "processed_by": processed_by,
+            },
+            limit=top_n,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     return {
-        "Đường Nguyễn Huệ": 25,
-        "Đường Lê Lợi": 20,
-        "Đường Trần Hưng Đạo": 18,
-        "Đường Hai Bà Trưng": 15,
-        "Đường Điện Biên Phủ": 12,
-        "period_days": days
+        "group_by": group_by,
+        "bucket": bucket,
+        "timezone": settings.REPORT_TIMEZONE,
+        "time_field": time_field,
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat() if date_to else None,
+        "data": rows
     }
@@ -1,25 +1,34 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.crud import user as crud_user
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.models.user import User as UserModel
+from app.core.pagination import split_page, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 @router.get("/", response_model=List[User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[tuple] = Depends(deps.cursor_param(int)),
     current_user: UserModel = Depends(deps.get_current_authority_user),
 ) -> Any:
     """
     Retrieve users. Only for authority users.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
-    users = crud_user.get_users(db, skip=skip, limit=limit)
+    users = crud_user.get_users(
+        db, skip=skip, limit=limit + 1, after_id=after[0] if after else None
+    )
+    users, next_cursor = split_page(users, limit, key=lambda u: (u.id,))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 @router.post("/", response_model=User)
@@ -66,15 +75,23 @@ def update_user(
 
 @router.get("/officers", response_model=List[User])
 def read_officers(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[tuple] = Depends(deps.cursor_param(int)),
     current_user: UserModel = Depends(deps.get_current_authority_user),
 ) -> Any:
     """
     Retrieve officers. Only for authority users.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
-    officers = crud_user.get_users_by_role(db, role="officer", skip=skip, limit=limit)
+    officers = crud_user.get_users_by_role(
+        db, role="officer", skip=skip, limit=limit + 1, after_id=after[0] if after else None
+    )
+    officers, next_cursor = split_page(officers, limit, key=lambda u: (u.id,))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return officers
 
 @router.delete("/{user_id}")
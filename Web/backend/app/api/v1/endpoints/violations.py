@@ -1,16 +1,24 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.api import deps
 from app.crud import violation as crud_violation
-from app.schemas.violation import Violation, ViolationCreate, ViolationUpdate, ViolationReport, ViolationLookup
+from app.schemas.violation import (
+    Violation, ViolationCreate, ViolationUpdate, ViolationReport, ViolationLookup,
+    ViolationSummary, violation_summaries_json,
+)
 from app.models.user import User
+from app.core.cache import dashboard_cache, lookup_cache
+from app.core.plates import normalize_plate
+from app.core.pagination import split_page, json_page_response
+from app.core.derivatives import derivative_pipeline
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Violation])
+@router.get("/", response_model=List[ViolationSummary])
 def read_violations(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -20,31 +28,37 @@ def read_violations(
     violation_type: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    after: Optional[tuple] = Depends(deps.cursor_param(datetime, int)),
     current_user: User = Depends(deps.get_current_officer_user),
 ) -> Any:
     """
-    Retrieve violations with filters. For officers and authority users.
+    Retrieve violation summaries with filters. For officers and authority users.
+    The X-Next-Cursor response header holds the cursor for the next page.
     """
-    violations = crud_violation.get_violations(
+    violations = crud_violation.get_violation_summaries(
         db, 
         skip=skip, 
-        limit=limit,
+        limit=limit + 1,
         status=status,
         license_plate=license_plate,
         violation_type=violation_type,
         date_from=date_from,
-        date_to=date_to
+        date_to=date_to,
+        after=after
     )
-    return violations
+    violations, next_cursor = split_page(violations, limit, key=lambda v: (v.created_at, v.id))
+    return json_page_response(violation_summaries_json(violations), next_cursor)
 
 @router.get("/lookup", response_model=List[Violation])
 def lookup_violations(
+    _: None = Depends(deps.rate_limit_lookup),
     db: Session = Depends(deps.get_db),
     license_plate: Optional[str] = Query(None),
     violation_code: Optional[str] = Query(None),
 ) -> Any:
     """
     Public endpoint to lookup violations by license plate or violation code.
+    Responses are cached per plate/code and requests are rate limited per client.
     """
     if not license_plate and not violation_code:
         raise HTTPException(
@@ -53,14 +67,19 @@ def lookup_violations(
         )
     
     if violation_code:
-        violation = crud_violation.get_violation_by_code(db, violation_code)
-        return [violation] if violation else []
+        cache_key = ("code", violation_code)
+    else:
+        cache_key = ("plate", normalize_plate(license_plate))
     
-    if license_plate:
-        violations = crud_violation.get_violations_by_license_plate(db, license_plate)
-        return violations
+    def load():
+        if violation_code:
+            violation = crud_violation.get_violation_by_code(db, violation_code)
+            violations = [violation] if violation else []
+        else:
+            violations = crud_violation.get_violations_by_license_plate(db, license_plate)
+        return [Violation.model_validate(v).model_dump(mode="json") for v in violations]
     
-    return []
+    return JSONResponse(content=lookup_cache.get_or_set(cache_key, load))
 
 @router.get("/statistics")
 def get_violation_statistics(
@@ -71,7 +90,10 @@ def get_violation_statistics(
     """
     Get violation statistics. For officers and authority users.
     """
-    return crud_violation.get_violation_statistics(db, days=days)
+    return dashboard_cache.get_or_set(
+        ("violations", "statistics", days),
+        lambda: crud_violation.get_violation_statistics(db, days=days)
+    )
 
 @router.get("/{violation_id}", response_model=Violation)
 def read_violation(
@@ -99,6 +121,7 @@ def create_violation(
     Create new violation. For officers and authority users.
     """
     violation = crud_violation.create_violation(db, violation=violation_in)
+    derivative_pipeline.submit([violation.image_url])
     return violation
 
 @router.post("/report", response_model=Violation)
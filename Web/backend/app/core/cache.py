@@ -0,0 +1,115 @@
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+from collections import OrderedDict
+import threading
+import time
+from app.core.config import settings
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache with per-entry expiry.
+
+    Keys are tuples whose first element is a namespace, so that writes can
+    invalidate everything derived from one table at once. A ttl of 0
+    disables caching.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    async def aget_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_many(self, keys: Iterable[Hashable]) -> None:
+        keys = keys if isinstance(keys, (set, frozenset)) else set(keys)
+        with self._lock:
+            # Whichever side is smaller bounds the work done under the lock
+            if len(keys) < len(self._data):
+                for key in keys:
+                    self._data.pop(key, None)
+            else:
+                for key in [k for k in self._data if k in keys]:
+                    del self._data[key]
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        self.invalidate_where(lambda k: isinstance(k, tuple) and bool(k) and k[0] == namespace)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+# Dashboard / statistics aggregates, namespaced by "violations", "cameras" and "users"
+dashboard_cache = TTLCache(maxsize=256, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+# Public /violations/lookup responses, keyed by ("plate", normalized query) or ("code", violation_code)
+lookup_cache = TTLCache(
+    maxsize=settings.LOOKUP_CACHE_MAX_ENTRIES, ttl=settings.LOOKUP_CACHE_TTL_SECONDS
+)
+
+# Authenticated user snapshots, keyed by ("user", user_id)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,322 @@
+"""
+Camera stream ingestion: one reader thread per camera samples frames and
+hands them to a pool of worker threads through bounded per-camera queues.
+
+A full queue drops its oldest frame instead of blocking, so readers always
+keep up with their stream and a slow consumer only ever loses stale frames.
+Workers take frames from the camera queues in turn, so one busy camera
+cannot starve the others.
+"""
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass
+import logging
+import os
+import threading
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Window for the per-camera frame rates
+RATE_WINDOW_SECONDS = 5.0
+
+@dataclass
+class CameraFeed:
+    camera_id: int
+    camera_code: str
+    location: str  # stream URL or local video path
+
+@dataclass
+class Frame:
+    camera_id: int
+    camera_code: str
+    sequence: int  # frames read from the source before this one since it was opened
+    captured_at: float  # time.time() when the frame was read
+    image: Any  # BGR array as decoded by OpenCV
+
+def camera_source(rtsp_url: str) -> str:
+    """The stream URL, or the path of a local stand-in video for a plain file name"""
+    if "://" in rtsp_url or os.path.isabs(rtsp_url):
+        return rtsp_url
+    return os.path.join(settings.CAMERA_VIDEO_DIR, rtsp_url)
+
+class VideoSource:
+    """An OpenCV capture of an RTSP stream or a local video file"""
+
+    def __init__(self, location: str):
+        import cv2
+
+        self.is_file = "://" not in location
+        self._capture = cv2.VideoCapture(location)
+        if not self._capture.isOpened():
+            self._capture.release()
+            raise ConnectionError(f"Could not open video source {location}")
+        if not self.is_file:
+            # Buffered stream frames only add latency
+            self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.fps = self._capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def grab(self) -> bool:
+        """Read the next frame without decoding it"""
+        return self._capture.grab()
+
+    def retrieve(self) -> Any:
+        """Decode the frame read by the last grab(), or None"""
+        ok, image = self._capture.retrieve()
+        return image if ok else None
+
+    def release(self) -> None:
+        self._capture.release()
+
+class _Rate:
+    """Events per second over the last RATE_WINDOW_SECONDS"""
+
+    def __init__(self):
+        self._times: Deque[float] = deque()
+
+    def add(self, now: float) -> None:
+        self._times.append(now)
+        self._trim(now)
+
+    def per_second(self, now: float) -> float:
+        self._trim(now)
+        return len(self._times) / RATE_WINDOW_SECONDS
+
+    def _trim(self, now: float) -> None:
+        while self._times and self._times[0] < now - RATE_WINDOW_SECONDS:
+            self._times.popleft()
+
+class FrameQueue:
+    """Bounded queue of one camera's sampled frames; a put into a full queue drops the oldest"""
+
+    def __init__(self, maxsize: int, ready: threading.Condition):
+        self.maxsize = max(maxsize, 1)
+        self._frames: Deque[Frame] = deque()
+        self._ready = ready
+        self.dropped = 0
+
+    def put(self, frame: Frame) -> None:
+        with self._ready:
+            if len(self._frames) >= self.maxsize:
+                self._frames.popleft()
+                self.dropped += 1
+            self._frames.append(frame)
+            self._ready.notify()
+
+    def pop(self) -> Optional[Frame]:
+        # Callers hold the shared ready condition
+        return self._frames.popleft() if self._frames else None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+class CameraReader(threading.Thread):
+    """
+    Reads one camera, decoding only the frames it samples. Lost streams are
+    reopened with exponential backoff; local videos loop at their own frame
+    rate so they behave like a live camera.
+    """
+
+    def __init__(
+        self,
+        feed: CameraFeed,
+        output: FrameQueue,
+        sample_fps: float,
+        stop: threading.Event,
+        open_source: Callable[[str], Any] = VideoSource,
+    ):
+        super().__init__(name=f"camera-{feed.camera_code}", daemon=True)
+        self.feed = feed
+        self.output = output
+        self.sample_fps = sample_fps
+        self._stop_event = stop
+        self._open_source = open_source
+        self._lock = threading.Lock()
+        self._read_rate = _Rate()
+        self._sample_rate = _Rate()
+        self._processed_rate = _Rate()
+        self.connected = False
+        self.reconnects = 0
+        self.frames_read = 0
+        self.frames_sampled = 0
+        self.frames_processed = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_frame_at: Optional[float] = None
+        self.lag_seconds: Optional[float] = None
+
+    def run(self) -> None:
+        delay = settings.CAMERA_RECONNECT_MIN_SECONDS
+        while not self._stop_event.is_set():
+            try:
+                source = self._open_source(self.feed.location)
+            except Exception as e:
+                self.record_error(e)
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, settings.CAMERA_RECONNECT_MAX_SECONDS)
+                continue
+
+            self.connected = True
+            try:
+                got_frames = self._read(source)
+            except Exception as e:
+                self.record_error(e)
+                got_frames = False
+            finally:
+                self.connected = False
+                source.release()
+            if self._stop_event.is_set():
+                break
+
+            if got_frames:
+                delay = settings.CAMERA_RECONNECT_MIN_SECONDS
+                if getattr(source, "is_file", False):
+                    # End of a stand-in video: start it over right away
+                    continue
+            self.reconnects += 1
+            logger.warning("Camera %s stream ended, reconnecting in %.1fs", self.feed.camera_code, delay)
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, settings.CAMERA_RECONNECT_MAX_SECONDS)
+
+    def _read(self, source: Any) -> bool:
+        """Read until the source runs out or the service stops. Returns whether any frame was read."""
+        interval = 1.0 / self.sample_fps if self.sample_fps > 0 else 0.0
+        pace = 1.0 / source.fps if getattr(source, "is_file", False) and source.fps > 0 else 0.0
+        started = time.monotonic()
+        next_sample = started
+        sequence = 0
+        while not self._stop_event.is_set():
+            if not source.grab():
+                break
+            now = time.monotonic()
+            captured_at = time.time()
+            with self._lock:
+                self.frames_read += 1
+                self.last_frame_at = captured_at
+                self._read_rate.add(now)
+
+            if now >= next_sample:
+                next_sample += interval
+                if next_sample <= now:
+                    next_sample = now + interval
+                image = source.retrieve()
+                if image is not None:
+                    self.output.put(Frame(self.feed.camera_id, self.feed.camera_code, sequence, captured_at, image))
+                    with self._lock:
+                        self.frames_sampled += 1
+                        self._sample_rate.add(now)
+            sequence += 1
+            if pace:
+                self._stop_event.wait(max(0.0, started + sequence * pace - time.monotonic()))
+        return sequence > 0
+
+    def record_error(self, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+            self.last_error = str(error)
+        logger.warning("Camera %s: %s", self.feed.camera_code, error)
+
+    def record_processed(self, frame: Frame) -> None:
+        finished = time.time()
+        with self._lock:
+            self.frames_processed += 1
+            self._processed_rate.add(time.monotonic())
+            self.lag_seconds = finished - frame.captured_at
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "camera_id": self.feed.camera_id,
+                "connected": self.connected,
+                "reconnects": self.reconnects,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "read_fps": round(self._read_rate.per_second(now), 2),
+                "sampled_fps": round(self._sample_rate.per_second(now), 2),
+                "processed_fps": round(self._processed_rate.per_second(now), 2),
+                "frames_read": self.frames_read,
+                "frames_sampled": self.frames_sampled,
+                "frames_processed": self.frames_processed,
+                "frames_dropped": self.output.dropped,
+                "queue_depth": len(self.output),
+                "lag_seconds": round(self.lag_seconds, 3) if self.lag_seconds is not None else None,
+                "seconds_since_frame": (
+                    round(time.time() - self.last_frame_at, 3) if self.last_frame_at is not None else None
+                ),
+            }
+
+class CameraIngestService:
+    """
+    Runs a CameraReader per feed and worker threads that pass sampled frames
+    to handler (for example the detection model). Without a handler frames
+    are only counted.
+    """
+
+    def __init__(
+        self,
+        feeds: List[CameraFeed],
+        handler: Optional[Callable[[Frame], None]] = None,
+        sample_fps: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        open_source: Callable[[str], Any] = VideoSource,
+    ):
+        self.handler = handler
+        self.workers = workers or settings.CAMERA_INGEST_WORKERS
+        sample_fps = settings.CAMERA_SAMPLE_FPS if sample_fps is None else sample_fps
+        queue_size = queue_size or settings.CAMERA_QUEUE_SIZE
+        self._stop_event = threading.Event()
+        self._ready = threading.Condition()
+        self.readers = [
+            CameraReader(feed, FrameQueue(queue_size, self._ready), sample_fps, self._stop_event, open_source)
+            for feed in feeds
+        ]
+        self._threads: List[threading.Thread] = []
+        self._next_reader = 0
+
+    def start(self) -> None:
+        for reader in self.readers:
+            reader.start()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"camera-ingest-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        with self._ready:
+            self._ready.notify_all()
+        for thread in self.readers + self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def _next_frame(self) -> Optional[Tuple[CameraReader, Frame]]:
+        # Round robin over the cameras, starting after the one served last
+        with self._ready:
+            while not self._stop_event.is_set():
+                for offset in range(len(self.readers)):
+                    index = (self._next_reader + offset) % len(self.readers)
+                    frame = self.readers[index].output.pop()
+                    if frame is not None:
+                        self._next_reader = index + 1
+                        return self.readers[index], frame
+                self._ready.wait(0.5)
+        return None
+
+    def _work(self) -> None:
+        while True:
+            item = self._next_frame()
+            if item is None:
+                return
+            reader, frame = item
+            try:
+                if self.handler is not None:
+                    self.handler(frame)
+            except Exception as e:
+                reader.record_error(e)
+            reader.record_processed(frame)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {reader.feed.camera_code: reader.stats() for reader in self.readers}
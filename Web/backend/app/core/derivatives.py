@@ -0,0 +1,162 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from concurrent.futures import Future, ProcessPoolExecutor
+import importlib.util
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_URL_PREFIX = "/uploads/"
+
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png"}
+
+# Derivative kinds, stored next to the original as <name>.<kind>.jpg
+THUMBNAIL = "thumb"
+PREVIEW = "preview"
+
+def local_upload_path(url: Optional[str]) -> Optional[str]:
+    """Filesystem path of a /uploads/... URL, or None for anything else"""
+    if not url or not url.startswith(UPLOADS_URL_PREFIX):
+        return None
+    parts = url[len(UPLOADS_URL_PREFIX):].split("/")
+    if any(part in ("", ".", "..") for part in parts):
+        return None
+    return os.path.join(settings.UPLOAD_DIR, *parts)
+
+def is_image_url(url: Optional[str]) -> bool:
+    extension = os.path.splitext(url or "")[1].lstrip(".").lower()
+    return extension in IMAGE_EXTENSIONS
+
+def derivative_path(source_path: str, kind: str) -> str:
+    return f"{os.path.splitext(source_path)[0]}.{kind}.jpg"
+
+def derivative_url(url: Optional[str], kind: str) -> Optional[str]:
+    """
+    URL of a local image's derivative, or None for anything else. Built
+    without touching the disk, so list endpoints do not stat a file per row;
+    /uploads answers 404 until the derivative has been generated.
+    """
+    if not is_image_url(url) or local_upload_path(url) is None:
+        return None
+    return f"{os.path.splitext(url)[0]}.{kind}.jpg"
+
+def _save_jpeg(image, target: str, quality: int) -> None:
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".derivative-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def generate_derivatives(source_path: str) -> List[str]:
+    """
+    Write a fixed-size thumbnail and a web-sized preview of an image next to
+    it. Runs in a worker process. Returns the paths written.
+    """
+    from PIL import Image, ImageOps
+
+    targets = {
+        THUMBNAIL: derivative_path(source_path, THUMBNAIL),
+        PREVIEW: derivative_path(source_path, PREVIEW),
+    }
+    missing = {kind: path for kind, path in targets.items() if not os.path.exists(path)}
+    if not missing:
+        return []
+
+    preview_edge = settings.PREVIEW_MAX_EDGE
+    thumbnail_size = (settings.THUMBNAIL_WIDTH, settings.THUMBNAIL_HEIGHT)
+    written = []
+    with Image.open(source_path) as image:
+        # Let the JPEG decoder downscale while decoding; much cheaper for large camera frames
+        image.draft("RGB", (preview_edge, preview_edge))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+
+        if PREVIEW in missing:
+            preview = image.copy()
+            preview.thumbnail((preview_edge, preview_edge), Image.LANCZOS)
+            _save_jpeg(preview, missing[PREVIEW], settings.PREVIEW_QUALITY)
+            written.append(missing[PREVIEW])
+        if THUMBNAIL in missing:
+            thumbnail = ImageOps.fit(image, thumbnail_size, Image.LANCZOS)
+            _save_jpeg(thumbnail, missing[THUMBNAIL], settings.THUMBNAIL_QUALITY)
+            written.append(missing[THUMBNAIL])
+    return written
+
+class DerivativePipeline:
+    """
+    Generates image derivatives on a process pool, outside the request path.
+    The pool is started on first use; without Pillow installed nothing is
+    scheduled and the schema simply reports no derivatives.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.available = importlib.util.find_spec("PIL") is not None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a threaded server process is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(self, urls: Iterable[Optional[str]]) -> List[Future]:
+        """Schedule derivatives for the local images among urls that do not have them yet"""
+        if not self.available or self.max_workers <= 0:
+            return []
+        futures = []
+        for url in urls:
+            if not is_image_url(url):
+                continue
+            path = local_upload_path(url)
+            if path is None or not os.path.exists(path):
+                continue
+            if all(os.path.exists(derivative_path(path, kind)) for kind in (THUMBNAIL, PREVIEW)):
+                continue
+            with self._lock:
+                if path in self._pending:
+                    continue
+                self._pending.add(path)
+                future = self._pool().submit(generate_derivatives, path)
+            future.add_done_callback(lambda f, path=path: self._done(path, f))
+            futures.append(future)
+        return futures
+
+    def _done(self, path: str, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(path)
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Could not generate derivatives for %s: %s", path, future.exception())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "available": self.available,
+                "workers": self.max_workers,
+                "pending": len(self._pending),
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+derivative_pipeline = DerivativePipeline(max_workers=settings.DERIVATIVE_WORKERS)
@@ -0,0 +1,125 @@
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urlencode
+import hashlib
+import hmac
+import os
+import re
+import time
+from app.core.config import settings
+from app.core.derivatives import UPLOADS_URL_PREFIX
+
+# Content-addressed evidence and its derivatives never change once written
+_IMMUTABLE_PATH = re.compile(r"^evidence/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\.[a-z]+)?\.[a-z0-9]+$")
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+def _signing_key() -> bytes:
+    if settings.EVIDENCE_URL_SIGNING_KEY:
+        return settings.EVIDENCE_URL_SIGNING_KEY.encode()
+    # A URL signature must never double as a JWT signature, so derive a separate key
+    return hmac.new(settings.SECRET_KEY.encode(), b"evidence-url-signing", hashlib.sha256).digest()
+
+def _signature(path: str, expires: int) -> str:
+    message = f"{path}:{expires}".encode()
+    return hmac.new(_signing_key(), message, hashlib.sha256).hexdigest()
+
+def url_expiry(ttl: int, now: float, window: int) -> int:
+    """At least ttl seconds from now, rounded up to the next multiple of window"""
+    expires = int(now) + ttl
+    if window > 0:
+        expires = (expires // window + 1) * window
+    return expires
+
+def sign_upload_url(
+    url: str, ttl: Optional[int] = None, now: Optional[float] = None, window: Optional[int] = None
+) -> str:
+    """
+    Append an expiring signature to a /uploads URL. Within one window the
+    same URL is signed identically, so browsers and proxies can cache it.
+    """
+    ttl = settings.EVIDENCE_URL_TTL_SECONDS if ttl is None else ttl
+    window = settings.EVIDENCE_URL_WINDOW_SECONDS if window is None else window
+    expires = url_expiry(ttl, now if now is not None else time.time(), window)
+    path = url[len(UPLOADS_URL_PREFIX):]
+    return f"{url}?{urlencode({'expires': expires, 'signature': _signature(path, expires)})}"
+
+def verify_upload_signature(path: str, expires: Optional[int], signature: Optional[str]) -> bool:
+    if expires is None or not signature or expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(path, expires), signature)
+
+def public_upload_url(url: Optional[str]) -> Optional[str]:
+    """URL to hand to clients: signed when EVIDENCE_SIGNED_URLS is on, unchanged otherwise"""
+    if not url or not settings.EVIDENCE_SIGNED_URLS or not url.startswith(UPLOADS_URL_PREFIX):
+        return url
+    return sign_upload_url(url)
+
+def is_immutable_path(path: str) -> bool:
+    return _IMMUTABLE_PATH.match(path) is not None
+
+def file_etag(path: str, stat: os.stat_result) -> str:
+    """Strong ETag: the content hash for evidence blobs, mtime and size for everything else"""
+    match = _IMMUTABLE_PATH.match(path)
+    if match and not match.group(2):
+        return f'"{match.group(1)}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """If-None-Match uses weak comparison, If-Range strong comparison"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) of a single-range Range header, or None to send
+    the whole file (no header, or a form we do not serve partially, such
+    as multiple ranges). Raises RangeNotSatisfiable when it lies past the end.
+    """
+    if not header:
+        return None
+    match = _BYTE_RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+def iter_file(path: str, start: int, length: int, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    with open(path, "rb") as source:
+        source.seek(start)
+        while length > 0:
+            chunk = source.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
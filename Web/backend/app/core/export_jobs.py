@@ -0,0 +1,236 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.crud import export as crud_export
+from app.db.session import SessionLocal
+
+class ExportQueueFull(Exception):
+    pass
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_TIMESTAMPS = ("created_at", "started_at", "finished_at")
+# Progress is written to the job's state file at most this often
+_PROGRESS_SAVE_SECONDS = 1.0
+
+@dataclass
+class ExportJobState:
+    id: str
+    owner_id: int
+    format: str
+    filters: Dict[str, Any]
+    status: str = "queued"
+    rows_written: int = 0
+    total_rows: Optional[int] = None
+    error: Optional[str] = None
+    file_path: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    _started_monotonic: Optional[float] = None
+
+    def to_state(self) -> Dict[str, Any]:
+        """What the state file holds; filters only matter to the worker running the job"""
+        state = {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "format": self.format,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "error": self.error,
+            "file_path": self.file_path,
+        }
+        for name in _TIMESTAMPS:
+            value = getattr(self, name)
+            state[name] = value.isoformat() if value else None
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ExportJobState":
+        values = dict(state, filters={})
+        for name in _TIMESTAMPS:
+            values[name] = datetime.fromisoformat(state[name]) if state.get(name) else None
+        return cls(**values)
+
+    def _elapsed(self) -> Optional[float]:
+        if self._started_monotonic is not None:
+            return time.monotonic() - self._started_monotonic
+        # A job running in another worker process
+        if self.started_at is not None:
+            return (datetime.utcnow() - self.started_at).total_seconds()
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = None
+        eta_seconds = None
+        if self.status == "completed":
+            progress = 1.0
+            eta_seconds = 0.0
+        elif self.total_rows:
+            progress = min(self.rows_written / self.total_rows, 1.0)
+            elapsed = self._elapsed()
+            if self.rows_written and elapsed is not None:
+                remaining = max(self.total_rows - self.rows_written, 0)
+                eta_seconds = round(elapsed / self.rows_written * remaining, 1)
+        return {
+            "id": self.id,
+            "format": self.format,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "progress": progress,
+            "eta_seconds": eta_seconds,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "download_url": (
+                f"{settings.API_V1_STR}/reports/export-jobs/{self.id}/download"
+                if self.status == "completed" else None
+            ),
+        }
+
+class ExportJobManager:
+    """
+    Runs violation exports on a small bounded thread pool, outside the request
+    path, writing the result to EXPORT_DIR. Each job's state is also written
+    to <job id>.json beside its export, so with several worker processes
+    sharing EXPORT_DIR any of them can answer polls and downloads. The
+    queue limit applies per process.
+    """
+
+    def __init__(self, max_workers: int, max_queued: int, export_dir: str):
+        self.max_queued = max_queued
+        self.export_dir = export_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs: Dict[str, ExportJobState] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, owner_id: int, format: str, filters: Dict[str, Any]) -> ExportJobState:
+        self._expire_old_jobs()
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+            if active >= self.max_queued:
+                raise ExportQueueFull("Too many export jobs in progress, try again later")
+            job = ExportJobState(
+                id=uuid.uuid4().hex,
+                owner_id=owner_id,
+                format=format,
+                filters=filters,
+            )
+            self._jobs[job.id] = job
+        self._save(job)
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJobState]:
+        """A job of this process, or of another one sharing EXPORT_DIR"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job or self._load(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self.export_dir, f"{job_id}.json")
+
+    def _save(self, job: ExportJobState) -> None:
+        os.makedirs(self.export_dir, exist_ok=True)
+        path = self._state_path(job.id)
+        # Written aside and renamed, so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as output:
+            json.dump(job.to_state(), output)
+        os.replace(temp_path, path)
+
+    def _load(self, job_id: str) -> Optional[ExportJobState]:
+        # job_id comes from the URL; only real job ids may become a path
+        if not _JOB_ID.match(job_id):
+            return None
+        try:
+            with open(self._state_path(job_id), encoding="utf-8") as state_file:
+                return ExportJobState.from_state(json.load(state_file))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _stored_jobs(self) -> List[ExportJobState]:
+        try:
+            names = os.listdir(self.export_dir)
+        except FileNotFoundError:
+            return []
+        jobs = (self._load(name[:-len(".json")]) for name in names if name.endswith(".json"))
+        return [job for job in jobs if job is not None]
+
+    def _count_rows(self, rows: Iterable[Dict[str, Any]], job: ExportJobState) -> Iterator[Dict[str, Any]]:
+        saved_at = time.monotonic()
+        for row in rows:
+            job.rows_written += 1
+            if time.monotonic() - saved_at >= _PROGRESS_SAVE_SECONDS:
+                self._save(job)
+                saved_at = time.monotonic()
+            yield row
+
+    def _run(self, job: ExportJobState) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job._started_monotonic = time.monotonic()
+        final_path = os.path.join(self.export_dir, f"{job.id}.{job.format}")
+        part_path = final_path + ".part"
+        try:
+            self._save(job)
+            query = crud_export.build_export_query(**job.filters)
+            render = crud_export.EXPORT_RENDERERS[job.format]
+            with SessionLocal() as db:
+                job.total_rows = db.execute(
+                    select(func.count()).select_from(query.subquery())
+                ).scalar()
+                rows = self._count_rows(crud_export.iter_export_rows(db, query), job)
+                with open(part_path, "w", encoding="utf-8", newline="") as output:
+                    for chunk in render(rows):
+                        output.write(chunk)
+            os.replace(part_path, final_path)
+            job.file_path = final_path
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._save(job)
+
+    def _expire_old_jobs(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        # State files cover the jobs of every process, this one's included
+        for job in self._stored_jobs():
+            if job.finished_at is not None and job.finished_at < cutoff:
+                for path in (job.file_path, self._state_path(job.id)):
+                    if path:
+                        # Another process may be expiring the same job
+                        with suppress(FileNotFoundError):
+                            os.remove(path)
+
+export_jobs = ExportJobManager(
+    max_workers=settings.EXPORT_MAX_WORKERS,
+    max_queued=settings.EXPORT_MAX_QUEUED_JOBS,
+    export_dir=settings.EXPORT_DIR,
+)
@@ -0,0 +1,52 @@
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from datetime import datetime
+import base64
+import json
+from fastapi import Response
+
+# Response header carrying the cursor of the next page on list endpoints
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort-key values into an opaque, URL-safe cursor"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Decode a cursor produced by encode_cursor, converting each value to the given type"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("unexpected cursor shape")
+        values = []
+        for value, value_type in zip(payload, types):
+            if value is None:
+                values.append(None)
+            elif value_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(value_type(value))
+        return tuple(values)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+def split_page(rows: Sequence[Any], limit: int, key: Callable[[Any], Tuple[Any, ...]]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim rows fetched with limit + 1 down to limit and return the cursor for
+    the next page (None on the last page).
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+def json_page_response(content: bytes, next_cursor: Optional[str] = None) -> Response:
+    """Response for an already encoded JSON page, with the next-page cursor header when there is one"""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,29 @@
+from typing import List, Set
+import re
+
+_PLATE_SEPARATORS = re.compile(r"[\s.\-]+")
+
+NGRAM_SIZE = 3
+
+def normalize_plate(plate: str) -> str:
+    """Canonical form of a license plate: uppercase, without '-', '.' or whitespace"""
+    return _PLATE_SEPARATORS.sub("", plate or "").upper()
+
+def plate_ngrams(normalized_plate: str) -> List[str]:
+    """Distinct n-grams of a normalized plate, used by the n-gram side index"""
+    grams = {
+        normalized_plate[i:i + NGRAM_SIZE]
+        for i in range(len(normalized_plate) - NGRAM_SIZE + 1)
+    }
+    return sorted(grams)
+
+def plate_queries_matching(normalized_plate: str) -> Set[str]:
+    """
+    Every normalized plate search (see crud.plate_search.plate_filter) that
+    matches a plate: its short prefixes and all its longer substrings.
+    """
+    queries = {normalized_plate[:length] for length in range(1, min(NGRAM_SIZE, len(normalized_plate) + 1))}
+    for start in range(len(normalized_plate)):
+        for end in range(start + NGRAM_SIZE, len(normalized_plate) + 1):
+            queries.add(normalized_plate[start:end])
+    return queries
@@ -0,0 +1,48 @@
+from typing import Hashable
+from collections import OrderedDict
+import threading
+import time
+from app.core.config import settings
+
+class TokenBucketLimiter:
+    """
+    In-process token bucket per client key. Each key holds up to `burst`
+    tokens, refilled at `rate` tokens per second. A rate of 0 or less
+    disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100000):
+        self.rate = rate
+        # A bucket that can never hold a whole token would refuse every request
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for key. Returns 0 if allowed, else seconds until a token is available."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                tokens, updated_at = bucket
+                bucket[0] = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / self.rate
+
+lookup_rate_limiter = TokenBucketLimiter(
+    rate=settings.LOOKUP_RATE_LIMIT_PER_MINUTE / 60.0,
+    burst=settings.LOOKUP_RATE_LIMIT_BURST,
+)
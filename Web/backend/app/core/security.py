@@ -1,10 +1,103 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Callable, Dict, Union, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
+import time
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+class PasswordHasherBusy(Exception):
+    pass
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated bounded thread pool (bcrypt releases the GIL),
+    so password checks cannot starve the request threadpool. At most
+    max_pending operations may be queued or running; beyond that the async
+    methods raise PasswordHasherBusy, while the blocking ones wait for a slot.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, sample_size: int = 1000):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._queue_waits = deque(maxlen=sample_size)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.total_run_time = 0.0
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, block: bool = False) -> Future:
+        if not self._slots.acquire(blocking=block):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Too many concurrent password checks, try again shortly")
+        with self._lock:
+            self.pending += 1
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.pending -= 1
+                    self.completed += 1
+                    self.total_queue_wait += started - submitted
+                    self.total_run_time += finished - started
+                    self._queue_waits.append(started - submitted)
+                self._slots.release()
+
+        return self._executor.submit(run)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(pwd_context.verify, plain_password, hashed_password, block=True).result()
+
+    def hash(self, password: str) -> str:
+        return self._submit(pwd_context.hash, password, block=True).result()
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(pwd_context.verify, plain_password, hashed_password))
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(pwd_context.hash, password))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._queue_waits)
+            p95 = waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else None
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_ms": {
+                    "avg": round(self.total_queue_wait / self.completed * 1000, 3) if self.completed else None,
+                    "p95": round(p95 * 1000, 3) if p95 is not None else None,
+                    "max": round(waits[-1] * 1000, 3) if waits else None,
+                },
+                "avg_hash_ms": round(self.total_run_time / self.completed * 1000, 3) if self.completed else None,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -20,10 +113,10 @@ def create_access_token(
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def verify_token(token: str) -> Optional[str]:
     try:
@@ -0,0 +1,194 @@
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+import hashlib
+import os
+import re
+import tempfile
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud import evidence as crud_evidence
+
+class UploadTooLarge(Exception):
+    pass
+
+@dataclass
+class SavedUpload:
+    filename: str
+    path: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+    deduplicated: bool = False
+
+    @property
+    def url(self) -> str:
+        return f"/uploads/{self.filename}"
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject multipart request bodies larger than max_size with 413 before
+    they are parsed. Starlette spools the whole form before an endpoint or
+    its dependencies run, so save_upload's per-file limit alone cannot stop
+    an oversized body from being received. The Content-Length header is
+    checked up front; bodies without one are cut off once they pass it.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            response = JSONResponse({"detail": "Request body too large"}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+def safe_extension(filename: Optional[str]) -> str:
+    """Lowercase extension of a client-supplied filename, reduced to letters and digits"""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    return re.sub(r"[^a-z0-9]", "", extension)[:10] or "bin"
+
+def check_content_types(files: Iterable[UploadFile], allowed_types: Iterable[str]) -> None:
+    allowed_types = set(allowed_types)
+    for file in files:
+        if file.content_type not in allowed_types:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File type {file.content_type} not allowed"
+            )
+
+def _write_chunk(output: BinaryIO, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    output.write(chunk)
+
+async def save_upload(
+    file: UploadFile,
+    filename: str,
+    directory: Optional[str] = None,
+    max_size: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> SavedUpload:
+    """
+    Stream an upload to directory/filename in fixed-size chunks, hashing it
+    on the way. Disk writes run off the event loop into a temp file that is
+    renamed into place only once complete; crossing max_size aborts with
+    UploadTooLarge and leaves nothing behind. By then Starlette has already
+    spooled the request body; UploadSizeLimitMiddleware bounds that part.
+    """
+    directory = directory or settings.UPLOAD_DIR
+    max_size = settings.MAX_FILE_SIZE if max_size is None else max_size
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    final_path = os.path.join(directory, *filename.split("/"))
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(final_path), prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as output:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(f"{file.filename} is larger than {max_size} bytes")
+                await run_in_threadpool(_write_chunk, output, digest, chunk)
+        await run_in_threadpool(os.replace, temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return SavedUpload(
+        filename=filename,
+        path=final_path,
+        size=size,
+        sha256=digest.hexdigest(),
+        content_type=file.content_type,
+    )
+
+async def hash_upload(
+    file: UploadFile, max_size: Optional[int] = None, chunk_size: Optional[int] = None
+) -> Tuple[str, int]:
+    """sha256 and size of an upload, read in chunks without writing anything; rewinds the file"""
+    max_size = settings.MAX_FILE_SIZE if max_size is None else max_size
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    size = 0
+    await file.seek(0)
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLarge(f"{file.filename} is larger than {max_size} bytes")
+        await run_in_threadpool(digest.update, chunk)
+    await file.seek(0)
+    return digest.hexdigest(), size
+
+async def store_evidence(db: Session, file: UploadFile) -> SavedUpload:
+    """
+    Store an upload once per distinct content under its sha256. Content that
+    is already stored returns the existing blob without writing the file
+    again, and marks it seen so it is not collected before it is referenced.
+    """
+    sha256, size = await hash_upload(file)
+    blob = await run_in_threadpool(crud_evidence.touch_blob, db, sha256)
+    if blob is not None:
+        path = crud_evidence.storage_path(blob.storage_key)
+        if await run_in_threadpool(os.path.exists, path):
+            return SavedUpload(
+                filename=blob.storage_key,
+                path=path,
+                size=blob.size,
+                sha256=sha256,
+                content_type=blob.content_type,
+                deduplicated=True,
+            )
+
+    key = blob.storage_key if blob is not None else crud_evidence.storage_key(sha256, safe_extension(file.filename))
+    saved = await save_upload(file, key)
+    if saved.sha256 != sha256:
+        await run_in_threadpool(os.remove, saved.path)
+        raise HTTPException(status_code=400, detail="Upload changed while it was being stored")
+    await run_in_threadpool(crud_evidence.register_blob, db, sha256, key, size, file.content_type)
+    return saved
+
+async def store_evidence_uploads(db: Session, files: List[UploadFile]) -> List[SavedUpload]:
+    """
+    Store every file of a request in the evidence store. Oversized files are
+    rejected with 400 "File too large"; blobs already stored by the request
+    stay unreferenced and are collected by scripts/gc_evidence.py.
+    """
+    try:
+        return [await store_evidence(db, file) for file in files]
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="File too large")
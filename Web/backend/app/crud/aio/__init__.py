@@ -0,0 +1 @@
+# Async counterparts of the crud modules, used when DB_ASYNC is enabled
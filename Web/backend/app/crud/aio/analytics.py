@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.analytics import build_aggregate_query, format_aggregate_rows
+
+async def aggregate_violations(
+    db: AsyncSession,
+    group_by: Sequence[str] = (),
+    bucket: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    time_field: str = "violation_time",
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    query = build_aggregate_query(
+        db, group_by, bucket, date_from, date_to, time_field, filters, limit
+    )
+    result = await db.execute(query)
+    return format_aggregate_rows(result.mappings(), bucket)
+
+async def count_by(
+    db: AsyncSession,
+    dimension: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    time_field: str = "violation_time",
+    limit: Optional[int] = None,
+    **filters: Any,
+) -> Dict[Any, int]:
+    """Map of dimension value -> violation count"""
+    rows = await aggregate_violations(
+        db,
+        group_by=[dimension],
+        date_from=date_from,
+        date_to=date_to,
+        time_field=time_field,
+        filters=filters,
+        limit=limit,
+    )
+    return {row[dimension]: row["count"] for row in rows}
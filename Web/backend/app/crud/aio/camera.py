@@ -0,0 +1,7 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.camera import CAMERA_STATUS_COUNTS, camera_statistics_from_counts
+
+async def get_camera_statistics(db: AsyncSession):
+    """Get camera statistics"""
+    result = await db.execute(CAMERA_STATUS_COUNTS)
+    return camera_statistics_from_counts(dict(result.all()))
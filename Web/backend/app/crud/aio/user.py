@@ -0,0 +1,24 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.crud.user import USER_ROLE_COUNTS, user_statistics_from_counts, user_snapshot_values
+from app.core.cache import user_cache
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def get_user_snapshot(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Detached copy of the user, served from the user cache when possible"""
+    values = user_cache.get(("user", user_id))
+    if values is None:
+        user = await get_user_by_id(db, user_id)
+        if user is None:
+            return None
+        values = user_snapshot_values(user)
+        user_cache.set(("user", user_id), values)
+    return User(**values)
+
+async def get_user_statistics(db: AsyncSession):
+    """Get user counts by role"""
+    result = await db.execute(USER_ROLE_COUNTS)
+    return user_statistics_from_counts(dict(result.all()))
@@ -0,0 +1,73 @@
+from typing import Optional, List, Tuple
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from app.models.violation import Violation
+from app.crud.violation import (
+    build_violations_query,
+    build_code_query,
+    build_license_plate_query,
+    violation_statistics_from_counts,
+    VIOLATION_SUMMARY_COLUMNS,
+)
+from app.crud.violation_archive import build_archived_code_query, build_archived_plate_query
+from app.db.partitions import archived_partition_tables
+from app.crud.aio.analytics import count_by
+
+async def _archived_partitions(db: AsyncSession) -> list:
+    return await db.run_sync(lambda session: archived_partition_tables(session.connection()))
+
+async def get_violation_by_code(db: AsyncSession, violation_code: str) -> Optional[Row]:
+    result = await db.execute(build_code_query(violation_code))
+    violation = result.first()
+    if violation is None:
+        partitions = await _archived_partitions(db)
+        result = await db.execute(build_archived_code_query(partitions, violation_code))
+        violation = result.first()
+    return violation
+
+async def get_violations(
+    db: AsyncSession, 
+    skip: int = 0, 
+    limit: int = 100,
+    status: Optional[str] = None,
+    license_plate: Optional[str] = None,
+    violation_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[Violation]:
+    query = build_violations_query(
+        db,
+        skip=skip,
+        limit=limit,
+        status=status,
+        license_plate=license_plate,
+        violation_type=violation_type,
+        date_from=date_from,
+        date_to=date_to,
+        after=after
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_violation_summaries(db: AsyncSession, **filters) -> List[Row]:
+    result = await db.execute(build_violations_query(db, columns=VIOLATION_SUMMARY_COLUMNS, **filters))
+    return result.all()
+
+async def get_violations_by_license_plate(db: AsyncSession, license_plate: str) -> List[Row]:
+    result = await db.execute(build_license_plate_query(db, license_plate))
+    violations = result.all()
+    if not violations:
+        partitions = await _archived_partitions(db)
+        result = await db.execute(build_archived_plate_query(partitions, license_plate))
+        violations = result.all()
+    return violations
+
+async def get_violation_statistics(db: AsyncSession, days: int = 30):
+    """Get violation statistics for the last N days"""
+    date_from = datetime.utcnow() - timedelta(days=days)
+    
+    counts = await count_by(db, "status", date_from=date_from, time_field="created_at")
+    
+    return violation_statistics_from_counts(counts, days)
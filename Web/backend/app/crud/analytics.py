@@ -0,0 +1,417 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from datetime import datetime, date
+from zoneinfo import ZoneInfo
+import re
+from sqlalchemy import func, select, and_, or_, asc, desc, case, literal_column, null
+from sqlalchemy.orm import Session
+from app.models.violation import Violation
+from app.models.user import User
+from app.models.camera import Camera
+from app.core.config import settings
+
+# Columns that analytics queries may group by
+DIMENSIONS = {
+    "violation_type": Violation.violation_type,
+    "location": Violation.location,
+    "camera_id": Violation.camera_id,
+    "status": Violation.status,
+    "source": Violation.source,
+    "processed_by": Violation.processed_by,
+}
+
+# Columns that analytics queries may filter on with equality
+FILTERS = {
+    **DIMENSIONS,
+    "reported_by": Violation.reported_by,
+}
+
+TIME_FIELDS = {
+    "violation_time": Violation.violation_time,
+    "created_at": Violation.created_at,
+    "processed_at": Violation.processed_at,
+}
+
+BUCKETS = ("hour", "day", "week", "month")
+
+_SQLITE_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H:00",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m-01",
+}
+
+def _timezone_name() -> str:
+    tz = settings.REPORT_TIMEZONE
+    # Validates the name and keeps it safe to inline as a SQL literal
+    ZoneInfo(tz)
+    if not re.fullmatch(r"[A-Za-z0-9_/+\-]+", tz):
+        raise ValueError(f"Invalid report timezone {tz!r}")
+    return tz
+
+def _sqlite_offset_modifier(tz: str) -> str:
+    offset = datetime.now(ZoneInfo(tz)).utcoffset()
+    minutes = int(offset.total_seconds() // 60) if offset else 0
+    return f"{minutes:+d} minutes"
+
+def time_bucket(db: Session, column, bucket: str):
+    """SQL expression truncating a UTC timestamp column to a bucket in the report timezone"""
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown time bucket {bucket!r}")
+    tz = _timezone_name()
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Literal columns keep the SELECT and GROUP BY expressions textually identical
+        local_time = func.timezone(literal_column(f"'{tz}'"), column)
+        return func.date_trunc(literal_column(f"'{bucket}'"), local_time)
+
+    # SQLite stores naive UTC timestamps; shift by the zone's current offset
+    modifier = literal_column(f"'{_sqlite_offset_modifier(tz)}'")
+    if bucket == "week":
+        return func.date(column, modifier, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    return func.strftime(literal_column(f"'{_SQLITE_BUCKET_FORMATS[bucket]}'"), column, modifier)
+
+def _format_bucket(value: Any, bucket: str) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        if bucket == "hour":
+            return value.strftime(_SQLITE_BUCKET_FORMATS["hour"])
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+def build_aggregate_query(
+    db: Session,
+    group_by: Sequence[str] = (),
+    bucket: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    time_field: str = "violation_time",
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+):
+    """
+    Single GROUP BY query counting violations (and summing fines) by the
+    given dimensions and an optional time bucket. With a bucket, limit keeps
+    the top groups by their total over the period, with all their buckets.
+    """
+    unknown = [d for d in group_by if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown group_by dimension(s): {', '.join(unknown)}")
+    if time_field not in TIME_FIELDS:
+        raise ValueError(f"Unknown time field {time_field!r}")
+    time_column = TIME_FIELDS[time_field]
+
+    group_columns = [DIMENSIONS[d].label(d) for d in group_by]
+    bucket_column = None
+    if bucket:
+        bucket_column = time_bucket(db, time_column, bucket).label("bucket")
+        group_columns.insert(0, bucket_column)
+
+    def restrict(query):
+        if date_from:
+            query = query.where(time_column >= date_from)
+        if date_to:
+            query = query.where(time_column <= date_to)
+        for name, value in (filters or {}).items():
+            if name not in FILTERS:
+                raise ValueError(f"Unknown filter {name!r}")
+            if value is not None:
+                query = query.where(FILTERS[name] == value)
+        return query
+
+    count_column = func.count(Violation.id).label("count")
+    query = restrict(select(
+        *group_columns,
+        count_column,
+        func.coalesce(func.sum(Violation.fine_amount), 0).label("total_fine"),
+    ))
+    if group_columns:
+        query = query.group_by(*group_columns)
+
+    if bucket_column is None:
+        query = query.order_by(desc(count_column))
+        return query.limit(limit) if limit else query
+    if not limit:
+        return query.order_by(bucket_column, desc(count_column))
+
+    if not group_by:
+        # top_n keeps the busiest buckets, still listed in time order
+        busiest = query.order_by(desc(count_column)).limit(limit).subquery()
+        return select(busiest).order_by(busiest.c.bucket)
+
+    # top_n ranks whole groups by their total over the period and keeps every bucket of the top ones
+    dimension_columns = [DIMENSIONS[d].label(d) for d in group_by]
+    top_groups = restrict(select(*dimension_columns)).group_by(*dimension_columns).order_by(
+        desc(func.count(Violation.id))
+    ).limit(limit).subquery()
+    query = query.join(
+        top_groups,
+        and_(*[DIMENSIONS[d].is_not_distinct_from(top_groups.c[d]) for d in group_by]),
+    )
+    return query.order_by(bucket_column, desc(count_column))
+
+def format_aggregate_rows(rows: Iterable[Mapping[str, Any]], bucket: Optional[str] = None) -> List[Dict[str, Any]]:
+    results = []
+    for row in rows:
+        item = dict(row)
+        if bucket:
+            item["bucket"] = _format_bucket(item["bucket"], bucket)
+        item["total_fine"] = float(item["total_fine"] or 0)
+        results.append(item)
+    return results
+
+def aggregate_violations(
+    db: Session,
+    group_by: Sequence[str] = (),
+    bucket: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    time_field: str = "violation_time",
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Count violations (and sum fines) grouped by the given dimensions and an
+    optional time bucket, as a single GROUP BY query.
+    """
+    query = build_aggregate_query(
+        db, group_by, bucket, date_from, date_to, time_field, filters, limit
+    )
+    return format_aggregate_rows(db.execute(query).mappings(), bucket)
+
+def count_by(
+    db: Session,
+    dimension: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    time_field: str = "violation_time",
+    limit: Optional[int] = None,
+    **filters: Any,
+) -> Dict[Any, int]:
+    """Map of dimension value -> violation count"""
+    rows = aggregate_violations(
+        db,
+        group_by=[dimension],
+        date_from=date_from,
+        date_to=date_to,
+        time_field=time_field,
+        filters=filters,
+        limit=limit,
+    )
+    return {row[dimension]: row["count"] for row in rows}
+
+def seconds_between(db: Session, start, end):
+    """SQL expression for the number of seconds from start to end"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+def has_percentile_cont(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+def percentile(db: Session, fraction: float, expression):
+    """Continuous percentile of expression, or NULL where the database lacks percentile_cont"""
+    if has_percentile_cont(db):
+        return func.percentile_cont(fraction).within_group(expression)
+    return null()
+
+def percentile_cont(values: Sequence[float], fraction: float) -> Optional[float]:
+    """percentile_cont in Python: linear interpolation between the two nearest ranks"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def _processing_latencies(db: Session, officer_ids: Iterable[int], date_from: datetime) -> Dict[int, List[float]]:
+    latency = seconds_between(db, Violation.created_at, Violation.processed_at)
+    latencies: Dict[int, List[float]] = {officer_id: [] for officer_id in officer_ids}
+    for officer_id, seconds in db.execute(
+        select(Violation.processed_by, latency).where(
+            Violation.processed_by.in_(list(latencies)),
+            Violation.processed_at >= date_from,
+        )
+    ):
+        if seconds is not None:
+            latencies[officer_id].append(float(seconds))
+    return latencies
+
+OFFICER_SORT_FIELDS = (
+    "processed_violations",
+    "median_processing_seconds",
+    "p90_processing_seconds",
+    "full_name",
+    "badge_number",
+)
+
+OFFICER_PERCENTILES = {"median_processing_seconds": 0.5, "p90_processing_seconds": 0.9}
+
+def _sort_officers(rows: List[Dict[str, Any]], sort_by: str, descending: bool) -> None:
+    # Same order as the SQL sort: NULLs last either way, then officer id
+    def key(row):
+        value = row[sort_by]
+        if value is None:
+            return (1, 0, row["officer_id"])
+        return (0, -value if descending else value, row["officer_id"])
+    rows.sort(key=key)
+
+def officer_performance(
+    db: Session,
+    date_from: datetime,
+    officer_id: Optional[int] = None,
+    sort_by: str = "processed_violations",
+    descending: bool = True,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Processed-violation counts and processing latency percentiles per officer,
+    as one grouped join of users and violations. Returns (rows, total_officers).
+    Databases without percentile_cont (SQLite) get the percentiles computed
+    here from the officers' latencies; sorting by one of them then sorts and
+    pages every officer in Python.
+    """
+    if sort_by not in OFFICER_SORT_FIELDS:
+        raise ValueError(f"Unknown sort field {sort_by!r}")
+
+    latency = seconds_between(db, Violation.created_at, Violation.processed_at)
+    processed = func.count(Violation.id).label("processed_violations")
+    median = percentile(db, 0.5, latency).label("median_processing_seconds")
+    p90 = percentile(db, 0.9, latency).label("p90_processing_seconds")
+    columns = {
+        "processed_violations": processed,
+        "median_processing_seconds": median,
+        "p90_processing_seconds": p90,
+        "full_name": User.full_name,
+        "badge_number": User.badge_number,
+    }
+
+    query = select(
+        User.id.label("officer_id"),
+        User.full_name.label("officer_name"),
+        User.badge_number,
+        User.department,
+        processed,
+        median,
+        p90,
+        func.count().over().label("total_officers"),
+    ).select_from(User).outerjoin(
+        Violation,
+        and_(Violation.processed_by == User.id, Violation.processed_at >= date_from),
+    ).group_by(
+        User.id, User.full_name, User.badge_number, User.department
+    )
+
+    if officer_id is not None:
+        officers = User.id == officer_id
+    else:
+        officers = and_(User.role == "officer", User.is_active == True)
+    query = query.where(officers)
+
+    percentiles_in_sql = has_percentile_cont(db)
+    page_in_sql = percentiles_in_sql or sort_by not in OFFICER_PERCENTILES
+    sort_column = columns[sort_by]
+    sort_column = desc(sort_column) if descending else asc(sort_column)
+    query = query.order_by(sort_column.nulls_last(), User.id)
+    if page_in_sql:
+        query = query.offset(skip)
+        if limit:
+            query = query.limit(limit)
+
+    rows = []
+    total = 0
+    for row in db.execute(query).mappings():
+        item = dict(row)
+        total = item.pop("total_officers")
+        for key in ("median_processing_seconds", "p90_processing_seconds"):
+            if item[key] is not None:
+                item[key] = float(item[key])
+        rows.append(item)
+
+    if not percentiles_in_sql and rows:
+        latencies = _processing_latencies(db, [row["officer_id"] for row in rows], date_from)
+        for row in rows:
+            for key, fraction in OFFICER_PERCENTILES.items():
+                row[key] = percentile_cont(latencies[row["officer_id"]], fraction)
+        if not page_in_sql:
+            _sort_officers(rows, sort_by, descending)
+            rows = rows[skip:skip + limit] if limit else rows[skip:]
+
+    if not rows and skip:
+        total = db.query(func.count(User.id)).filter(officers).scalar()
+    return rows, total
+
+def camera_efficiency(
+    db: Session,
+    date_from: datetime,
+    days: int,
+    after: Optional[Tuple[int, int]] = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Violations detected per active camera, ranked in SQL, as one LEFT JOIN
+    aggregate. `after` is the (violations_detected, camera_id) keyset of the
+    last row on the previous page. Returns (rows, summary).
+    """
+    detected = func.count(Violation.id)
+    ranked = select(
+        Camera.id.label("camera_id"),
+        Camera.camera_code,
+        Camera.name.label("camera_name"),
+        Camera.location,
+        Camera.camera_type,
+        detected.label("violations_detected"),
+        (detected * 1.0 / days).label("efficiency_rate"),
+        func.rank().over(order_by=desc(detected)).label("rank"),
+        func.count().over().label("total_cameras"),
+        func.sum(case((detected == 0, 1), else_=0)).over().label("cameras_without_detections"),
+    ).select_from(Camera).outerjoin(
+        Violation,
+        and_(Violation.camera_id == Camera.id, Violation.violation_time >= date_from),
+    ).where(
+        Camera.status == "active"
+    ).group_by(
+        Camera.id, Camera.camera_code, Camera.name, Camera.location, Camera.camera_type
+    ).subquery()
+
+    query = select(ranked)
+    if after is not None:
+        last_detected, last_id = after
+        query = query.where(
+            or_(
+                ranked.c.violations_detected < last_detected,
+                and_(
+                    ranked.c.violations_detected == last_detected,
+                    ranked.c.camera_id > last_id,
+                ),
+            )
+        )
+    query = query.order_by(desc(ranked.c.violations_detected), ranked.c.camera_id).limit(limit)
+
+    rows = []
+    summary = {"total_cameras": 0, "cameras_without_detections": 0}
+    for row in db.execute(query).mappings():
+        item = dict(row)
+        summary["total_cameras"] = item.pop("total_cameras")
+        summary["cameras_without_detections"] = int(item.pop("cameras_without_detections") or 0)
+        item["efficiency_rate"] = float(item["efficiency_rate"])
+        # A camera that detected nothing in the whole period is usually broken
+        item["no_detections"] = item["violations_detected"] == 0
+        rows.append(item)
+
+    if not rows and after is not None:
+        # Past the last page: the window totals are not available from any row
+        total, without_detections = db.execute(
+            select(
+                func.count(),
+                func.sum(case((ranked.c.violations_detected == 0, 1), else_=0)),
+            ).select_from(ranked)
+        ).one()
+        summary = {
+            "total_cameras": total,
+            "cameras_without_detections": int(without_detections or 0),
+        }
+    return rows, summary
@@ -1,7 +1,9 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.camera import Camera
 from app.schemas.camera import CameraCreate, CameraUpdate
+from app.core.cache import dashboard_cache
 
 def get_camera(db: Session, camera_id: int) -> Optional[Camera]:
     return db.query(Camera).filter(Camera.id == camera_id).first()
@@ -14,7 +16,8 @@ def get_cameras(
     skip: int = 0, 
     limit: int = 100,
     status: Optional[str] = None,
-    camera_type: Optional[str] = None
+    camera_type: Optional[str] = None,
+    after_id: Optional[int] = None
 ) -> List[Camera]:
     query = db.query(Camera)
     
@@ -23,12 +26,25 @@ def get_cameras(
     if camera_type:
         query = query.filter(Camera.camera_type == camera_type)
     
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(Camera.id)
+    if after_id is not None:
+        query = query.filter(Camera.id > after_id)
+    else:
+        query = query.offset(skip)
+    
+    return query.limit(limit).all()
+
+def get_streaming_cameras(db: Session) -> List[Camera]:
+    """Active cameras with a stream (or stand-in video) to read frames from"""
+    return db.query(Camera).filter(
+        Camera.status == "active", Camera.rtsp_url.isnot(None), Camera.rtsp_url != ""
+    ).order_by(Camera.id).all()
 
 def create_camera(db: Session, camera: CameraCreate) -> Camera:
     db_camera = Camera(**camera.dict())
     db.add(db_camera)
     db.commit()
+    dashboard_cache.invalidate_namespace("cameras")
     db.refresh(db_camera)
     return db_camera
 
@@ -39,6 +55,7 @@ def update_camera(db: Session, camera_id: int, camera_update: CameraUpdate) -> O
         for field, value in update_data.items():
             setattr(db_camera, field, value)
         db.commit()
+        dashboard_cache.invalidate_namespace("cameras")
         db.refresh(db_camera)
     return db_camera
 
@@ -47,19 +64,22 @@ def delete_camera(db: Session, camera_id: int) -> bool:
     if db_camera:
         db.delete(db_camera)
         db.commit()
+        dashboard_cache.invalidate_namespace("cameras")
         return True
     return False
 
-def get_camera_statistics(db: Session):
-    """Get camera statistics"""
-    total_cameras = db.query(Camera).count()
-    active_cameras = db.query(Camera).filter(Camera.status == "active").count()
-    inactive_cameras = db.query(Camera).filter(Camera.status == "inactive").count()
-    maintenance_cameras = db.query(Camera).filter(Camera.status == "maintenance").count()
-    
+# Cameras per status, for the dashboard
+CAMERA_STATUS_COUNTS = select(Camera.status, func.count(Camera.id)).group_by(Camera.status)
+
+def camera_statistics_from_counts(counts: Dict[str, int]):
     return {
-        "total_cameras": total_cameras,
-        "active_cameras": active_cameras,
-        "inactive_cameras": inactive_cameras,
-        "maintenance_cameras": maintenance_cameras
+        "total_cameras": sum(counts.values()),
+        "active_cameras": counts.get("active", 0),
+        "inactive_cameras": counts.get("inactive", 0),
+        "maintenance_cameras": counts.get("maintenance", 0)
     }
+
+def get_camera_statistics(db: Session):
+    """Get camera statistics"""
+    counts = dict(db.execute(CAMERA_STATUS_COUNTS).all())
+    return camera_statistics_from_counts(counts)
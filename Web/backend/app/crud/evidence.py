@@ -0,0 +1,179 @@
+from typing import Dict, Iterable, List, Optional
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+import os
+import re
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.evidence import EvidenceBlob
+from app.models.violation import Violation
+from app.models.violation_archive import ViolationArchive
+from app.db.partitions import archived_partition_tables
+from app.core.config import settings
+from app.core.derivatives import PREVIEW, THUMBNAIL, derivative_path
+
+EVIDENCE_PREFIX = "evidence"
+
+_EVIDENCE_URL = re.compile(rf"^/uploads/{EVIDENCE_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})\.[a-z0-9]+$")
+
+def storage_key(sha256: str, extension: str) -> str:
+    """Sharded path of a blob relative to UPLOAD_DIR: evidence/ab/cd/<sha256>.<ext>"""
+    return f"{EVIDENCE_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}"
+
+def storage_path(key: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, *key.split("/"))
+
+def sha256_from_url(url: Optional[str]) -> Optional[str]:
+    match = _EVIDENCE_URL.match((url or "").strip())
+    return match.group(1) if match else None
+
+def violation_evidence_urls(
+    image_url: Optional[str], video_url: Optional[str], evidence_urls: Optional[str]
+) -> List[str]:
+    """Every file URL a violation row refers to"""
+    urls = [url for url in (image_url, video_url) if url]
+    if evidence_urls:
+        urls.extend(url.strip() for url in evidence_urls.split(",") if url.strip())
+    return urls
+
+def get_blob(db: Session, sha256: str) -> Optional[EvidenceBlob]:
+    return db.get(EvidenceBlob, sha256)
+
+def touch_blob(db: Session, sha256: str) -> Optional[EvidenceBlob]:
+    """
+    Mark a stored blob as just uploaded again, so garbage collection waits a
+    full grace period for the report that will refer to it. Returns None when
+    there is no such blob (or collection removed it first).
+    """
+    result = db.execute(
+        update(EvidenceBlob).where(EvidenceBlob.sha256 == sha256).values(last_seen_at=func.now()),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return get_blob(db, sha256) if result.rowcount else None
+
+def register_blob(db: Session, sha256: str, key: str, size: int, content_type: Optional[str]) -> EvidenceBlob:
+    """Record a stored blob; a concurrent upload of the same content keeps the first row and marks it seen"""
+    values = {
+        "sha256": sha256,
+        "storage_key": key,
+        "size": size,
+        "content_type": content_type,
+        "ref_count": 0,
+    }
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(
+            insert(EvidenceBlob)
+            .values(**values)
+            .on_conflict_do_update(index_elements=[EvidenceBlob.sha256], set_={"last_seen_at": func.now()})
+        )
+    elif get_blob(db, sha256) is None:
+        db.add(EvidenceBlob(**values))
+    else:
+        return touch_blob(db, sha256)
+    db.commit()
+    return get_blob(db, sha256)
+
+def _apply_reference_deltas(db: Session, deltas: Dict[str, int]) -> None:
+    # One UPDATE per distinct delta, usually a single statement
+    by_delta = defaultdict(list)
+    for sha, change in deltas.items():
+        if change:
+            by_delta[change].append(sha)
+    for change, shas in by_delta.items():
+        db.execute(
+            update(EvidenceBlob)
+            .where(EvidenceBlob.sha256.in_(shas))
+            .values(ref_count=EvidenceBlob.ref_count + change),
+            execution_options={"synchronize_session": False},
+        )
+
+def add_references(db: Session, urls: Iterable[Optional[str]], delta: int = 1) -> None:
+    """Adjust ref_count for the evidence blobs behind these URLs. Does not commit."""
+    counts = Counter(sha for sha in map(sha256_from_url, urls) if sha)
+    _apply_reference_deltas(db, {sha: count * delta for sha, count in counts.items()})
+
+def recount_references(db: Session, batch_size: int = 1000) -> int:
+    """
+    Recompute every ref_count from violations, violations_archive and any
+    detached violation partitions kept in the archive schema. Returns the
+    number of referenced blobs.
+    """
+    counts = Counter()
+    sources = [Violation.__table__, ViolationArchive.__table__] + archived_partition_tables(db.connection())
+    for source in sources:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(source.c.id, source.c.image_url, source.c.video_url, source.c.evidence_urls)
+                .where(source.c.id > last_id)
+                .order_by(source.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                for url in violation_evidence_urls(row.image_url, row.video_url, row.evidence_urls):
+                    sha = sha256_from_url(url)
+                    if sha:
+                        counts[sha] += 1
+            last_id = rows[-1].id
+
+    db.execute(update(EvidenceBlob).values(ref_count=0))
+    _apply_reference_deltas(db, counts)
+    db.commit()
+    return len(counts)
+
+def _remove_blob_files(key: str) -> None:
+    # The original and its image derivatives, which are served from the same URL space
+    path = storage_path(key)
+    for file_path in (path, derivative_path(path, THUMBNAIL), derivative_path(path, PREVIEW)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+def collect_garbage(db: Session, grace: Optional[timedelta] = None, dry_run: bool = False) -> List[EvidenceBlob]:
+    """
+    Delete blobs no violation refers to once nothing has uploaded them for
+    the grace period (uploads for reports still being written have no
+    references yet, and a deduplicated upload restarts the period).
+    Only files whose row the guarded DELETE actually removed are unlinked,
+    before the commit, so a blob referenced in the meantime keeps its file.
+    Returns the blobs removed.
+    """
+    if grace is None:
+        grace = timedelta(hours=settings.EVIDENCE_GC_GRACE_HOURS)
+    cutoff = datetime.utcnow() - grace
+    condition = (EvidenceBlob.ref_count <= 0) & (EvidenceBlob.last_seen_at < cutoff)
+    blobs = db.execute(select(EvidenceBlob).where(condition)).scalars().all()
+    if dry_run or not blobs:
+        return blobs
+
+    for blob in blobs:
+        db.expunge(blob)
+    if db.get_bind().dialect.delete_returning:
+        deleted = set(db.execute(
+            delete(EvidenceBlob)
+            .where(condition, EvidenceBlob.sha256.in_([blob.sha256 for blob in blobs]))
+            .returning(EvidenceBlob.sha256),
+            execution_options={"synchronize_session": False},
+        ).scalars())
+    else:
+        deleted = set()
+        for blob in blobs:
+            result = db.execute(
+                delete(EvidenceBlob).where(condition, EvidenceBlob.sha256 == blob.sha256),
+                execution_options={"synchronize_session": False},
+            )
+            if result.rowcount:
+                deleted.add(blob.sha256)
+
+    removed = [blob for blob in blobs if blob.sha256 in deleted]
+    try:
+        for blob in removed:
+            _remove_blob_files(blob.storage_key)
+    finally:
+        db.commit()
+    return removed
@@ -0,0 +1,97 @@
+from typing import Any, Dict, Iterable, Iterator, Optional
+from datetime import datetime
+import csv
+import io
+import json
+from sqlalchemy import select, and_
+from sqlalchemy.orm import Session
+from app.models.violation import Violation
+from app.core.config import settings
+
+EXPORT_COLUMNS = [
+    Violation.violation_code,
+    Violation.license_plate,
+    Violation.violation_type,
+    Violation.location,
+    Violation.violation_time,
+    Violation.fine_amount,
+    Violation.status,
+    Violation.source,
+    Violation.processed_at,
+]
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def build_export_query(
+    date_from: datetime,
+    date_to: datetime,
+    status: Optional[str] = None,
+    violation_type: Optional[str] = None,
+):
+    """Column-only select for violation exports"""
+    query = select(*EXPORT_COLUMNS).where(
+        and_(
+            Violation.violation_time >= date_from,
+            Violation.violation_time <= date_to
+        )
+    )
+
+    if status:
+        query = query.where(Violation.status == status)
+    if violation_type:
+        query = query.where(Violation.violation_type.ilike(f"%{violation_type}%"))
+
+    return query
+
+def iter_export_rows(db: Session, query, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream export rows through a server-side cursor, batch_size rows at a time"""
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for row in result:
+        item = dict(row._mapping)
+        for key in ("violation_time", "processed_at"):
+            if item[key] is not None:
+                item[key] = item[key].isoformat()
+        yield item
+
+def iter_csv(rows: Iterable[Dict[str, Any]], chunk_rows: int = 500) -> Iterator[str]:
+    """Render rows as CSV, yielding a chunk every chunk_rows rows"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    # Send the header straight away so the client sees the first byte early
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], chunk_rows: int = 500) -> Iterator[str]:
+    """Render rows as newline-delimited JSON, yielding a chunk every chunk_rows rows"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+EXPORT_RENDERERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
@@ -0,0 +1,87 @@
+from typing import Iterable, Tuple
+from sqlalchemy import func, select, delete, false, and_, bindparam
+from sqlalchemy.orm import Session
+from app.models.violation import Violation
+from app.models.plate_ngram import ViolationPlateNgram
+from app.core.plates import normalize_plate, plate_ngrams, NGRAM_SIZE
+
+def uses_ngram_index(db: Session) -> bool:
+    """PostgreSQL searches through pg_trgm; other databases use the n-gram side table"""
+    return db.get_bind().dialect.name != "postgresql"
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _prefix_range(column, prefix: str):
+    # Range form of LIKE 'prefix%' that any btree index can serve
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+def plate_filter(db: Session, license_plate: str):
+    """
+    SQL criterion matching violations whose plate contains license_plate,
+    compared in normalized form and served by an index:
+    - shorter than the n-gram size: prefix range scan on the btree index
+    - PostgreSQL: LIKE '%...%' served by the pg_trgm GIN index
+    - otherwise: candidates from the n-gram side index, confirmed with LIKE
+    """
+    plate = normalize_plate(license_plate)
+    column = Violation.license_plate_normalized
+    if not plate:
+        return false()
+    if len(plate) < NGRAM_SIZE:
+        return _prefix_range(column, plate)
+
+    contains = column.like(f"%{_escape_like(plate)}%", escape="\\")
+    if not uses_ngram_index(db):
+        return contains
+
+    grams = plate_ngrams(plate)
+    candidates = select(ViolationPlateNgram.violation_id).where(
+        ViolationPlateNgram.gram.in_(grams)
+    ).group_by(ViolationPlateNgram.violation_id).having(
+        func.count(ViolationPlateNgram.gram) == len(grams)
+    )
+    return and_(Violation.id.in_(candidates), contains)
+
+def index_plates(db: Session, rows: Iterable[Tuple[int, str]]) -> None:
+    """Add n-gram index entries for (violation_id, normalized_plate) pairs. Does not commit."""
+    if not uses_ngram_index(db):
+        return
+    entries = [
+        {"gram": gram, "violation_id": violation_id}
+        for violation_id, normalized in rows
+        for gram in plate_ngrams(normalized or "")
+    ]
+    if entries:
+        db.execute(ViolationPlateNgram.__table__.insert(), entries)
+
+def rebuild_plate_index(db: Session, batch_size: int = 1000) -> int:
+    """Backfill normalized plates and rebuild the n-gram side index. Returns rows processed."""
+    if uses_ngram_index(db):
+        db.execute(delete(ViolationPlateNgram))
+
+    processed = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Violation.id, Violation.license_plate)
+            .where(Violation.id > last_id)
+            .order_by(Violation.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        normalized_rows = [(row.id, normalize_plate(row.license_plate)) for row in rows]
+        table = Violation.__table__
+        db.execute(
+            table.update()
+            .where(table.c.id == bindparam("row_id"))
+            .values(license_plate_normalized=bindparam("normalized")),
+            [{"row_id": row_id, "normalized": normalized} for row_id, normalized in normalized_rows],
+        )
+        index_plates(db, normalized_rows)
+        db.commit()
+        processed += len(rows)
+        last_id = rows[-1].id
+    return processed
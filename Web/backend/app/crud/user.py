@@ -1,8 +1,10 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
+from app.core.cache import dashboard_cache, user_cache
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
@@ -10,17 +12,63 @@ def get_user(db: Session, user_id: int) -> Optional[User]:
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
+def user_snapshot_values(user: User) -> dict:
+    """Column values of user, minus the password hash, for the user cache"""
+    values = {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+    values.pop("hashed_password", None)
+    return values
+
+def get_user_snapshot(db: Session, user_id: int) -> Optional[User]:
+    """
+    Detached copy of the user, served from the user cache when possible so
+    authentication needs no query. Not attached to any session.
+    """
+    values = user_cache.get(("user", user_id))
+    if values is None:
+        user = get_user_by_id(db, user_id)
+        if user is None:
+            return None
+        values = user_snapshot_values(user)
+        user_cache.set(("user", user_id), values)
+    return User(**values)
+
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def _page(query, skip: int, limit: int, after_id: Optional[int]):
+    query = query.order_by(User.id)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[User]:
+    return _page(db.query(User), skip, limit, after_id)
+
+def get_users_by_role(
+    db: Session, role: str, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[User]:
+    return _page(db.query(User).filter(User.role == role), skip, limit, after_id)
 
-def get_users_by_role(db: Session, role: str, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
+# Users per role, for the dashboard
+USER_ROLE_COUNTS = select(User.role, func.count(User.id)).group_by(User.role)
+
+def user_statistics_from_counts(counts: Dict[str, int]):
+    return {
+        "total_users": sum(counts.values()),
+        "officers": counts.get("officer", 0),
+        "citizens": counts.get("citizen", 0),
+        "authorities": counts.get("authority", 0)
+    }
+
+def get_user_statistics(db: Session):
+    """Get user counts by role"""
+    counts = dict(db.execute(USER_ROLE_COUNTS).all())
+    return user_statistics_from_counts(counts)
 
 def create_user(db: Session, user: UserCreate) -> User:
     hashed_password = get_password_hash(user.password)
@@ -38,6 +86,7 @@ def create_user(db: Session, user: UserCreate) -> User:
     )
     db.add(db_user)
     db.commit()
+    dashboard_cache.invalidate_namespace("users")
     db.refresh(db_user)
     return db_user
 
@@ -48,19 +97,24 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
         for field, value in update_data.items():
             setattr(db_user, field, value)
         db.commit()
+        dashboard_cache.invalidate_namespace("users")
+        user_cache.invalidate(("user", user_id))
         db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, username: str, password: str, role: str) -> Optional[User]:
+def get_login_candidate(db: Session, username: str, role: str) -> Optional[User]:
+    """The user that may log in with these credentials, checked before the costly password hash"""
     user = get_user_by_username(db, username)
+    if not user or user.role != role or not user.is_active:
+        return None
+    return user
+
+def authenticate_user(db: Session, username: str, password: str, role: str) -> Optional[User]:
+    user = get_login_candidate(db, username, role)
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
         return None
-    if user.role != role:
-        return None
-    if not user.is_active:
-        return None
     return user
 
 def deactivate_user(db: Session, user_id: int) -> Optional[User]:
@@ -68,5 +122,7 @@ def deactivate_user(db: Session, user_id: int) -> Optional[User]:
     if db_user:
         db_user.is_active = False
         db.commit()
+        dashboard_cache.invalidate_namespace("users")
+        user_cache.invalidate(("user", user_id))
         db.refresh(db_user)
     return db_user
@@ -1,22 +1,76 @@
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import select, update, desc, tuple_, literal, String, Row
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime, timedelta
 from app.models.violation import Violation
-from app.schemas.violation import ViolationCreate, ViolationUpdate
+from app.schemas.violation import ViolationCreate, ViolationUpdate, CameraViolationIngest, VIOLATION_SUMMARY_FIELDS
+from app.core.config import settings
+from app.crud.violation_rollup import (
+    record_violation_created,
+    record_violations_created,
+    record_status_change,
+    record_status_changes,
+)
+from app.crud.analytics import count_by
+from app.crud.plate_search import plate_filter, index_plates
+from app.crud.evidence import add_references, violation_evidence_urls
+from app.crud.violation_archive import (
+    get_archived_violation_by_code,
+    get_archived_violations_by_license_plate,
+    lookup_columns,
+)
+from app.core.plates import normalize_plate, plate_queries_matching
+from app.core.cache import dashboard_cache, lookup_cache
 import uuid
 
 def generate_violation_code() -> str:
     """Generate unique violation code"""
     return f"VL{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
 
+def invalidate_lookup_cache(violation_code: str, normalized_plate: Optional[str]) -> None:
+    """Drop cached public lookups that could include this violation"""
+    invalidate_lookup_cache_many([violation_code], [normalized_plate])
+
+def invalidate_lookup_cache_many(violation_codes: Iterable[str], normalized_plates: Iterable[Optional[str]]) -> None:
+    """
+    Drop cached public lookups that could include any of these violations.
+    The keys are derived from the plates written, so the cost does not grow
+    with the number of cached lookups.
+    """
+    keys = {("code", violation_code) for violation_code in violation_codes}
+    for plate in set(normalized_plates):
+        if plate:
+            keys.update(("plate", query) for query in plate_queries_matching(plate))
+    lookup_cache.invalidate_many(keys)
+
 def get_violation(db: Session, violation_id: int) -> Optional[Violation]:
     return db.query(Violation).filter(Violation.id == violation_id).first()
 
-def get_violation_by_code(db: Session, violation_code: str) -> Optional[Violation]:
-    return db.query(Violation).filter(Violation.violation_code == violation_code).first()
+# Lookups return rows of these columns whether the violation is hot or archived
+LOOKUP_COLUMNS = lookup_columns(Violation.__table__)
 
-def get_violations(
+def build_code_query(violation_code: str):
+    return select(*LOOKUP_COLUMNS).where(Violation.violation_code == violation_code).limit(1)
+
+def get_violation_by_code(db: Session, violation_code: str) -> Optional[Row]:
+    """
+    Look in the hot table first, then in archived violations (including
+    detached partitions). Either way the result is a row of LOOKUP_COLUMNS.
+    """
+    violation = db.execute(build_code_query(violation_code)).first()
+    if violation is None:
+        violation = get_archived_violation_by_code(db, violation_code)
+    return violation
+
+def _keyset_datetime(db: Session, value: datetime):
+    # SQLite keeps server-side CURRENT_TIMESTAMP defaults as 'YYYY-MM-DD HH:MM:SS'
+    # text; bind the cursor in the same format so equal timestamps compare equal
+    if db.get_bind().dialect.name == "sqlite" and value.microsecond == 0:
+        return literal(value.strftime("%Y-%m-%d %H:%M:%S"), type_=String)
+    return value
+
+def build_violations_query(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
@@ -24,33 +78,95 @@ def get_violations(
     license_plate: Optional[str] = None,
     violation_type: Optional[str] = None,
     date_from: Optional[datetime] = None,
-    date_to: Optional[datetime] = None
-) -> List[Violation]:
-    query = db.query(Violation)
+    date_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    reported_by: Optional[int] = None,
+    columns: Optional[list] = None
+):
+    """Select for get_violations, shared with the async crud; pass columns to select only those"""
+    query = select(*columns) if columns else select(Violation)
     
     if status:
-        query = query.filter(Violation.status == status)
+        query = query.where(Violation.status == status)
     if license_plate:
-        query = query.filter(Violation.license_plate.ilike(f"%{license_plate}%"))
+        query = query.where(plate_filter(db, license_plate))
     if violation_type:
-        query = query.filter(Violation.violation_type.ilike(f"%{violation_type}%"))
+        query = query.where(Violation.violation_type.ilike(f"%{violation_type}%"))
     if date_from:
-        query = query.filter(Violation.violation_time >= date_from)
+        query = query.where(Violation.violation_time >= date_from)
     if date_to:
-        query = query.filter(Violation.violation_time <= date_to)
+        query = query.where(Violation.violation_time <= date_to)
+    if reported_by is not None:
+        query = query.where(Violation.reported_by == reported_by)
     
-    return query.order_by(desc(Violation.created_at)).offset(skip).limit(limit).all()
+    query = query.order_by(desc(Violation.created_at), desc(Violation.id))
+    if after:
+        after_created_at, after_id = after
+        query = query.where(
+            tuple_(Violation.created_at, Violation.id)
+            < tuple_(_keyset_datetime(db, after_created_at), after_id)
+        )
+    else:
+        query = query.offset(skip)
+    
+    return query.limit(limit)
 
-def get_violations_by_license_plate(db: Session, license_plate: str) -> List[Violation]:
-    return db.query(Violation).filter(
-        Violation.license_plate.ilike(f"%{license_plate}%")
-    ).order_by(desc(Violation.violation_time)).all()
+def get_violations(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    status: Optional[str] = None,
+    license_plate: Optional[str] = None,
+    violation_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[Violation]:
+    """
+    List violations newest first. Pass the (created_at, id) of the last row
+    of the previous page as `after` for keyset pagination instead of `skip`.
+    """
+    query = build_violations_query(
+        db,
+        skip=skip,
+        limit=limit,
+        status=status,
+        license_plate=license_plate,
+        violation_type=violation_type,
+        date_from=date_from,
+        date_to=date_to,
+        after=after
+    )
+    return db.execute(query).scalars().all()
+
+# Column-only select for list endpoints: plain rows, no Text columns and no identity map
+VIOLATION_SUMMARY_COLUMNS = [getattr(Violation, name) for name in VIOLATION_SUMMARY_FIELDS]
+
+def get_violation_summaries(db: Session, **filters) -> List[Row]:
+    """get_violations as summary rows (see schemas.violation.ViolationSummary); takes the same filters"""
+    return db.execute(build_violations_query(db, columns=VIOLATION_SUMMARY_COLUMNS, **filters)).all()
+
+def build_license_plate_query(db: Session, license_plate: str):
+    return select(*LOOKUP_COLUMNS).where(
+        plate_filter(db, license_plate)
+    ).order_by(desc(Violation.violation_time))
+
+def get_violations_by_license_plate(db: Session, license_plate: str) -> List[Row]:
+    """
+    Plate search over the hot table, falling back to archived violations of
+    that exact plate; rows of LOOKUP_COLUMNS either way
+    """
+    violations = db.execute(build_license_plate_query(db, license_plate)).all()
+    if not violations:
+        violations = get_archived_violations_by_license_plate(db, license_plate)
+    return violations
 
 def create_violation(db: Session, violation: ViolationCreate, reported_by: Optional[int] = None) -> Violation:
     violation_code = generate_violation_code()
     db_violation = Violation(
         violation_code=violation_code,
         license_plate=violation.license_plate,
+        license_plate_normalized=normalize_plate(violation.license_plate),
         violation_type=violation.violation_type,
         description=violation.description,
         location=violation.location,
@@ -64,10 +180,149 @@ def create_violation(db: Session, violation: ViolationCreate, reported_by: Optio
         evidence_urls=",".join(violation.evidence_urls) if violation.evidence_urls else None,
     )
     db.add(db_violation)
+    db.flush()
+    record_violation_created(db, db_violation)
+    index_plates(db, [(db_violation.id, db_violation.license_plate_normalized)])
+    add_references(db, violation_evidence_urls(
+        db_violation.image_url, db_violation.video_url, db_violation.evidence_urls
+    ))
     db.commit()
+    dashboard_cache.invalidate_namespace("violations")
+    invalidate_lookup_cache(db_violation.violation_code, db_violation.license_plate_normalized)
     db.refresh(db_violation)
     return db_violation
 
+def _ingest_insert(db: Session, rows: List[dict], returning: list):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # By name: on a partitioned table the constraint also covers violation_time
+        stmt = postgresql.insert(Violation).values(rows).on_conflict_do_nothing(
+            constraint="uq_violations_camera_idempotency_key"
+        )
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(Violation).values(rows).on_conflict_do_nothing(
+            index_elements=[Violation.camera_id, Violation.idempotency_key]
+        )
+    else:
+        return None
+    return db.execute(stmt.returning(*returning)).all()
+
+def ingest_camera_violations(
+    db: Session,
+    camera_id: int,
+    detections: List[CameraViolationIngest],
+    batch_size: Optional[int] = None
+) -> List[dict]:
+    """
+    Insert a camera's detections in one transaction with multi-row
+    INSERT ... ON CONFLICT DO NOTHING on (camera_id, idempotency_key), so a
+    retried upload creates nothing twice. Returns one entry per distinct key,
+    in request order, flagging keys that already existed.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    # A key repeated within the same upload keeps its first detection
+    by_key = {}
+    for detection in detections:
+        by_key.setdefault(detection.idempotency_key, detection)
+    unique = list(by_key.values())
+    rows = [
+        {
+            "violation_code": generate_violation_code(),
+            "license_plate": d.license_plate,
+            "license_plate_normalized": normalize_plate(d.license_plate),
+            "violation_type": d.violation_type,
+            "description": d.description,
+            "location": d.location,
+            "violation_time": d.violation_time,
+            "fine_amount": d.fine_amount,
+            "status": "pending",
+            "source": d.source,
+            "camera_id": camera_id,
+            "image_url": d.image_url,
+            "video_url": d.video_url,
+            "evidence_urls": ",".join(d.evidence_urls) if d.evidence_urls else None,
+            "idempotency_key": d.idempotency_key,
+        }
+        for d in unique
+    ]
+    returning = [
+        Violation.id,
+        Violation.idempotency_key,
+        Violation.violation_code,
+        Violation.license_plate_normalized,
+        Violation.violation_time,
+        Violation.camera_id,
+        Violation.violation_type,
+        Violation.source,
+    ]
+
+    created = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        inserted = _ingest_insert(db, batch, returning)
+        if inserted is None:
+            # Databases without ON CONFLICT: skip keys that already exist
+            existing = set(db.execute(
+                select(Violation.idempotency_key).where(
+                    Violation.camera_id == camera_id,
+                    Violation.idempotency_key.in_([row["idempotency_key"] for row in batch])
+                )
+            ).scalars())
+            batch = [row for row in batch if row["idempotency_key"] not in existing]
+            inserted = [Violation(**row) for row in batch]
+            db.add_all(inserted)
+            db.flush()
+        created.extend(inserted)
+
+    record_violations_created(db, created, status="pending")
+    index_plates(db, [(row.id, row.license_plate_normalized) for row in created])
+    created_keys = {row.idempotency_key for row in created}
+    add_references(db, [
+        url
+        for row in rows if row["idempotency_key"] in created_keys
+        for url in violation_evidence_urls(row["image_url"], row["video_url"], row["evidence_urls"])
+    ])
+    db.commit()
+
+    if created:
+        dashboard_cache.invalidate_namespace("violations")
+        invalidate_lookup_cache_many(
+            [row.violation_code for row in created],
+            [row.license_plate_normalized for row in created],
+        )
+
+    results = {
+        row.idempotency_key: {"id": row.id, "violation_code": row.violation_code, "duplicate": False}
+        for row in created
+    }
+    duplicate_keys = [d.idempotency_key for d in unique if d.idempotency_key not in results]
+    for start in range(0, len(duplicate_keys), batch_size):
+        for row in db.execute(
+            select(Violation.idempotency_key, Violation.id, Violation.violation_code).where(
+                Violation.camera_id == camera_id,
+                Violation.idempotency_key.in_(duplicate_keys[start:start + batch_size])
+            )
+        ):
+            results[row.idempotency_key] = {
+                "id": row.id, "violation_code": row.violation_code, "duplicate": True
+            }
+
+    return [
+        {"idempotency_key": d.idempotency_key, **results[d.idempotency_key]}
+        for d in unique
+        if d.idempotency_key in results
+    ]
+
+def add_violation_evidence(db: Session, violation: Violation, urls: List[str]) -> Violation:
+    """Append evidence file URLs to a violation and count the new references"""
+    existing = violation_evidence_urls(None, None, violation.evidence_urls)
+    violation.evidence_urls = ",".join(existing + urls)
+    add_references(db, urls)
+    db.commit()
+    invalidate_lookup_cache(violation.violation_code, violation.license_plate_normalized)
+    db.refresh(violation)
+    return violation
+
 def update_violation(
     db: Session, 
     violation_id: int, 
@@ -76,6 +331,7 @@ def update_violation(
 ) -> Optional[Violation]:
     db_violation = db.query(Violation).filter(Violation.id == violation_id).first()
     if db_violation:
+        old_status = db_violation.status
         update_data = violation_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_violation, field, value)
@@ -83,34 +339,95 @@ def update_violation(
         db_violation.processed_by = processed_by
         db_violation.processed_at = datetime.utcnow()
         
+        record_status_change(db, db_violation, old_status)
         db.commit()
+        dashboard_cache.invalidate_namespace("violations")
+        invalidate_lookup_cache(db_violation.violation_code, db_violation.license_plate_normalized)
         db.refresh(db_violation)
     return db_violation
 
+def bulk_update_status(
+    db: Session,
+    violation_ids: Iterable[int],
+    status: str,
+    processing_notes: Optional[str],
+    processed_by: int,
+    from_status: str = "pending"
+) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Move every violation in violation_ids that is still in from_status to
+    status with a single UPDATE ... RETURNING, in one transaction. Returns
+    (updated ids, {failed id: reason}), both in request order.
+    """
+    requested = list(dict.fromkeys(violation_ids))
+    if not requested:
+        return [], {}
+
+    returned = [
+        Violation.id,
+        Violation.violation_code,
+        Violation.license_plate_normalized,
+        Violation.violation_time,
+        Violation.camera_id,
+        Violation.violation_type,
+        Violation.source,
+    ]
+    condition = (Violation.id.in_(requested)) & (Violation.status == from_status)
+    values = {
+        "status": status,
+        "processing_notes": processing_notes,
+        "processed_by": processed_by,
+        "processed_at": datetime.utcnow(),
+    }
+    if db.get_bind().dialect.update_returning:
+        rows = db.execute(
+            update(Violation).where(condition).values(**values).returning(*returned),
+            execution_options={"synchronize_session": False},
+        ).all()
+    else:
+        # Databases without UPDATE ... RETURNING: lock the matching rows, then update them
+        rows = db.execute(select(*returned).where(condition).with_for_update()).all()
+        db.execute(
+            update(Violation).where(Violation.id.in_([row.id for row in rows])).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+
+    record_status_changes(db, rows, from_status, new_status=status)
+    db.commit()
+
+    if rows:
+        dashboard_cache.invalidate_namespace("violations")
+        invalidate_lookup_cache_many(
+            [row.violation_code for row in rows],
+            [row.license_plate_normalized for row in rows],
+        )
+
+    updated = {row.id for row in rows}
+    failed = [violation_id for violation_id in requested if violation_id not in updated]
+    failures = {}
+    if failed:
+        existing = set(db.execute(select(Violation.id).where(Violation.id.in_(failed))).scalars())
+        failures = {
+            violation_id: (
+                f"Violation is not {from_status}" if violation_id in existing else "Violation not found"
+            )
+            for violation_id in failed
+        }
+    return [violation_id for violation_id in requested if violation_id in updated], failures
+
+def violation_statistics_from_counts(counts: Dict[str, int], days: int):
+    return {
+        "total_violations": sum(counts.values()),
+        "pending_violations": counts.get("pending", 0),
+        "processed_violations": counts.get("processed", 0),
+        "paid_violations": counts.get("paid", 0),
+        "period_days": days
+    }
+
 def get_violation_statistics(db: Session, days: int = 30):
     """Get violation statistics for the last N days"""
     date_from = datetime.utcnow() - timedelta(days=days)
     
-    total_violations = db.query(Violation).filter(
-        Violation.created_at >= date_from
-    ).count()
+    counts = count_by(db, "status", date_from=date_from, time_field="created_at")
     
-    pending_violations = db.query(Violation).filter(
-        and_(Violation.status == "pending", Violation.created_at >= date_from)
-    ).count()
-    
-    processed_violations = db.query(Violation).filter(
-        and_(Violation.status == "processed", Violation.created_at >= date_from)
-    ).count()
-    
-    paid_violations = db.query(Violation).filter(
-        and_(Violation.status == "paid", Violation.created_at >= date_from)
-    ).count()
-    
-    return {
-        "total_violations": total_violations,
-        "pending_violations": pending_violations,
-        "processed_violations": processed_violations,
-        "paid_violations": paid_violations,
-        "period_days": days
-    }
+    return violation_statistics_from_counts(counts, days)
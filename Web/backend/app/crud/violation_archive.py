@@ -0,0 +1,102 @@
+from typing import List, Optional, Sequence
+from datetime import datetime, timedelta
+from sqlalchemy import Row, select, insert, delete, desc, union_all
+from sqlalchemy.orm import Session
+from app.models.violation import Violation
+from app.models.violation_archive import ViolationArchive
+from app.models.plate_ngram import ViolationPlateNgram
+from app.core.config import settings
+from app.core.plates import normalize_plate
+from app.db.partitions import archived_partition_tables
+
+# Every archive column except archived_at is copied from violations as is
+ARCHIVED_COLUMNS = [column.name for column in ViolationArchive.__table__.columns if column.name != "archived_at"]
+
+def lookup_columns(source) -> list:
+    """
+    The violation columns of source (violations, violations_archive or a
+    detached partition) in one order, so lookups return the same row shape
+    from every table
+    """
+    return [source.c[name] for name in ARCHIVED_COLUMNS]
+
+def _union(queries):
+    return union_all(*queries).subquery() if len(queries) > 1 else queries[0].subquery()
+
+def build_archived_code_query(partitions: list, violation_code: str):
+    """
+    A violation code in violations_archive or detached partitions (tables
+    from archived_partition_tables). Both hold only closed violations.
+    """
+    rows = _union([
+        select(*lookup_columns(source)).where(source.c.violation_code == violation_code)
+        for source in [ViolationArchive.__table__, *partitions]
+    ])
+    return select(rows).limit(1)
+
+def build_archived_plate_query(partitions: list, license_plate: str):
+    """Archived violations for one exact plate, newest first; substring plate search covers only the hot table"""
+    normalized = normalize_plate(license_plate)
+    rows = _union([
+        select(*lookup_columns(source)).where(source.c.license_plate_normalized == normalized)
+        for source in [ViolationArchive.__table__, *partitions]
+    ])
+    return select(rows).order_by(desc(rows.c.violation_time))
+
+def get_archived_violation_by_code(db: Session, violation_code: str) -> Optional[Row]:
+    """The archived violation with this code, as a row of lookup_columns"""
+    partitions = archived_partition_tables(db.connection())
+    return db.execute(build_archived_code_query(partitions, violation_code)).first()
+
+def get_archived_violations_by_license_plate(db: Session, license_plate: str) -> List[Row]:
+    """Archived violations of one plate, from violations_archive and detached partitions"""
+    partitions = archived_partition_tables(db.connection())
+    return db.execute(build_archived_plate_query(partitions, license_plate)).all()
+
+def archive_closed_violations(
+    db: Session,
+    older_than: Optional[timedelta] = None,
+    statuses: Optional[Sequence[str]] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Move closed violations whose violation_time is older than older_than
+    into violations_archive, batch_size rows per transaction. Returns the
+    number of violations moved (or that would be moved, with dry_run).
+    """
+    from app.crud.violation import invalidate_lookup_cache_many
+
+    older_than = older_than if older_than is not None else timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    statuses = list(statuses or settings.ARCHIVE_STATUSES)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    condition = Violation.status.in_(statuses) & (Violation.violation_time < datetime.utcnow() - older_than)
+    if dry_run:
+        return db.query(Violation.id).filter(condition).count()
+
+    source_columns = lookup_columns(Violation.__table__)
+    moved = 0
+    while True:
+        query = select(Violation.id, Violation.violation_code, Violation.license_plate_normalized).where(
+            condition
+        ).order_by(Violation.id).limit(batch_size)
+        if db.get_bind().dialect.name == "postgresql":
+            # Rows being processed elsewhere are left for the next run
+            query = query.with_for_update(skip_locked=True)
+        rows = db.execute(query).all()
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+
+        db.execute(
+            insert(ViolationArchive).from_select(ARCHIVED_COLUMNS, select(*source_columns).where(Violation.id.in_(ids)))
+        )
+        db.execute(delete(ViolationPlateNgram).where(ViolationPlateNgram.violation_id.in_(ids)))
+        db.execute(delete(Violation).where(Violation.id.in_(ids)), execution_options={"synchronize_session": False})
+        db.commit()
+        # A cached plate lookup may mix hot and archived rows; the fallback only covers misses
+        invalidate_lookup_cache_many(
+            [row.violation_code for row in rows], [row.license_plate_normalized for row in rows]
+        )
+        moved += len(rows)
+    return moved
@@ -0,0 +1,180 @@
+from typing import Dict, Iterable, Optional, Tuple
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from sqlalchemy import Date, func, select, delete, literal_column, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.violation import Violation
+from app.models.violation_archive import ViolationArchive
+from app.models.violation_rollup import ViolationDailyRollup
+from app.db.partitions import archived_partition_tables
+
+RollupKey = Tuple[date, int, str, str, str]
+
+def rollup_day(violation_time: datetime) -> date:
+    """Day bucket (UTC) a violation is counted under"""
+    if violation_time.tzinfo is not None:
+        violation_time = violation_time.astimezone(timezone.utc)
+    return violation_time.date()
+
+def rollup_key(violation: Violation, status: Optional[str] = None) -> RollupKey:
+    return (
+        rollup_day(violation.violation_time),
+        violation.camera_id or 0,
+        violation.violation_type,
+        status or violation.status or "pending",
+        violation.source,
+    )
+
+def _upsert_statement(db: Session, rows):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(ViolationDailyRollup).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(ViolationDailyRollup).values(rows)
+    else:
+        return None
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            ViolationDailyRollup.day,
+            ViolationDailyRollup.camera_id,
+            ViolationDailyRollup.violation_type,
+            ViolationDailyRollup.status,
+            ViolationDailyRollup.source,
+        ],
+        set_={
+            "violation_count": ViolationDailyRollup.violation_count
+            + stmt.excluded.violation_count
+        },
+    )
+
+def apply_rollup_deltas(db: Session, deltas: Dict[RollupKey, int]) -> None:
+    """Add per-key count deltas to the daily rollup. Does not commit."""
+    rows = [
+        {
+            "day": key[0],
+            "camera_id": key[1],
+            "violation_type": key[2],
+            "status": key[3],
+            "source": key[4],
+            "violation_count": delta,
+        }
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = _upsert_statement(db, rows)
+    if stmt is not None:
+        db.execute(stmt)
+        return
+
+    # Fallback for databases without ON CONFLICT support
+    for row in rows:
+        existing = db.get(
+            ViolationDailyRollup,
+            (row["day"], row["camera_id"], row["violation_type"], row["status"], row["source"]),
+        )
+        if existing:
+            existing.violation_count += row["violation_count"]
+        else:
+            db.add(ViolationDailyRollup(**row))
+    db.flush()
+
+def record_violation_created(db: Session, violation: Violation) -> None:
+    record_violations_created(db, [violation])
+
+def record_violations_created(db: Session, violations: Iterable[Violation], status: Optional[str] = None) -> None:
+    deltas: Dict[RollupKey, int] = defaultdict(int)
+    for violation in violations:
+        deltas[rollup_key(violation, status=status)] += 1
+    apply_rollup_deltas(db, deltas)
+
+def record_status_change(db: Session, violation: Violation, old_status: Optional[str]) -> None:
+    record_status_changes(db, [violation], old_status)
+
+def record_status_changes(
+    db: Session, violations: Iterable[Violation], old_status: Optional[str], new_status: Optional[str] = None
+) -> None:
+    """Move many violations from old_status to new_status (default: their current status) in one upsert"""
+    deltas: Dict[RollupKey, int] = defaultdict(int)
+    for violation in violations:
+        new_key = rollup_key(violation, status=new_status)
+        old_key = rollup_key(violation, status=old_status)
+        if old_key != new_key:
+            deltas[old_key] -= 1
+            deltas[new_key] += 1
+    apply_rollup_deltas(db, deltas)
+
+def record_violations_removed(db: Session, source) -> None:
+    """
+    Subtract every row of source (a table with the violations columns, such
+    as a partition about to be dropped) from the rollup. Does not commit.
+    """
+    apply_rollup_deltas(db, {
+        (row.day, row.camera_id, row.violation_type, row.status, row.source): -row.violation_count
+        for row in db.execute(_grouped_counts(db, source))
+    })
+
+def get_daily_counts(db: Session, day_from: date, day_to: date) -> Dict[date, int]:
+    """Total violations per day for day_from..day_to (inclusive)"""
+    rows = db.query(
+        ViolationDailyRollup.day,
+        func.sum(ViolationDailyRollup.violation_count),
+    ).filter(
+        ViolationDailyRollup.day >= day_from,
+        ViolationDailyRollup.day <= day_to,
+    ).group_by(ViolationDailyRollup.day).all()
+    return {day: int(count or 0) for day, count in rows}
+
+def _day_expression(db: Session, violation_time):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date(func.timezone(literal_column("'UTC'"), violation_time), type_=Date)
+    return func.date(violation_time, type_=Date)
+
+def _grouped_counts(db: Session, source):
+    """Rollup rows (day, camera_id, violation_type, status, source, violation_count) of the violations in source"""
+    # Literal columns keep the SELECT and GROUP BY expressions textually identical
+    day = _day_expression(db, source.c.violation_time)
+    camera_id = func.coalesce(source.c.camera_id, literal_column("0"))
+    status = func.coalesce(source.c.status, literal_column("'pending'"))
+    return select(
+        day.label("day"),
+        camera_id.label("camera_id"),
+        source.c.violation_type,
+        status.label("status"),
+        source.c.source,
+        func.count(source.c.id).label("violation_count"),
+    ).group_by(day, camera_id, source.c.violation_type, status, source.c.source)
+
+def rebuild_rollup(db: Session, day_from: Optional[date] = None) -> int:
+    """
+    Recompute the rollup from violations, violations_archive and detached
+    partitions kept in the archive schema. Returns the number of rollup rows.
+    """
+
+    delete_stmt = delete(ViolationDailyRollup)
+    if day_from:
+        delete_stmt = delete_stmt.where(ViolationDailyRollup.day >= day_from)
+    db.execute(delete_stmt)
+
+    # Archived violations still count towards the days they happened on
+    parts = []
+    for table in [Violation.__table__, ViolationArchive.__table__] + archived_partition_tables(db.connection()):
+        part = select(
+            table.c.violation_time, table.c.camera_id, table.c.violation_type, table.c.status, table.c.source, table.c.id
+        )
+        if day_from:
+            part = part.where(table.c.violation_time >= datetime.combine(day_from, datetime.min.time()))
+        parts.append(part)
+    source = union_all(*parts).subquery()
+
+    db.execute(
+        ViolationDailyRollup.__table__.insert().from_select(
+            ["day", "camera_id", "violation_type", "status", "source", "violation_count"],
+            _grouped_counts(db, source),
+        )
+    )
+    db.commit()
+    return db.query(ViolationDailyRollup).count()
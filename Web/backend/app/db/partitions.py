@@ -0,0 +1,282 @@
+"""
+Monthly range partitioning of violations on violation_time (PostgreSQL only).
+
+Partitioning is optional: scripts/manage_partitions.py converts an existing
+table once and then keeps partitions ahead of time and detaches old ones
+once every violation in them is closed.
+Partitions are named violations_pYYYY_MM and cover UTC calendar months; a
+violations_default partition catches rows outside every month partition.
+
+PostgreSQL requires the partition key in every unique constraint, so after
+conversion the primary key is (id, violation_time) and violation codes and
+camera idempotency keys are unique per violation_time.
+"""
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+import re
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint, CreateIndex
+from app.core.config import settings
+from app.models.violation import Violation
+
+PARENT = Violation.__tablename__
+PARTITION_KEY = "violation_time"
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT}_p(\d{{4}})_(\d{{2}})$")
+
+class PartitioningError(Exception):
+    pass
+
+@dataclass
+class Partition:
+    name: str
+    month: Optional[date]  # None for the default partition
+    rows: int  # planner estimate
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month.year:04d}_{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+def _require_postgresql(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        raise PartitioningError("Partitioning violations requires PostgreSQL")
+
+def _table_exists(connection: Connection, name: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+        {"name": PARENT},
+    ).scalar()
+
+def list_partitions(connection: Connection) -> List[Partition]:
+    _require_postgresql(connection)
+    rows = connection.execute(text(
+        "SELECT c.relname, c.reltuples::bigint FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+    ), {"name": PARENT}).all()
+    return [Partition(name=name, month=partition_month(name), rows=max(rows, 0)) for name, rows in rows]
+
+def create_month_partition(connection: Connection, month: date) -> bool:
+    """
+    Create the partition for one month; False if it already exists. Rows
+    that landed in the default partition for that month are moved into it.
+    """
+    name = partition_name(month)
+    if _table_exists(connection, name):
+        return False
+    start, end = _bound(month), _bound(add_months(month, 1))
+    in_range = f"{PARTITION_KEY} >= {start} AND {PARTITION_KEY} < {end}"
+
+    stray = _table_exists(connection, DEFAULT_PARTITION) and connection.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})")
+    ).scalar()
+    if stray:
+        # A new partition cannot be added while the default one holds rows in its range
+        connection.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+        connection.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+        connection.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+        connection.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})"))
+    else:
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ({start}) TO ({end})"))
+    return True
+
+def ensure_partitions(connection: Connection, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """Create any missing partitions from the current month to months_ahead. Returns the names created."""
+    _require_postgresql(connection)
+    if not is_partitioned(connection):
+        raise PartitioningError(f"{PARENT} is not partitioned; run scripts/manage_partitions.py convert first")
+    months_ahead = settings.VIOLATION_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(today or datetime.utcnow().date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_month_partition(connection, month):
+            created.append(partition_name(month))
+    return created
+
+def partition_table(name: str, schema: Optional[str] = None):
+    """A partition (attached or detached) as a lightweight table with every violations column"""
+    return table(name, *(column(c.name, c.type) for c in Violation.__table__.columns), schema=schema)
+
+def _release_evidence(connection: Connection, partition) -> None:
+    # Dropped rows no longer reference their evidence; let gc_evidence.py reclaim it
+    from app.crud.evidence import add_references, violation_evidence_urls
+
+    rows = connection.execute(
+        select(partition.c.image_url, partition.c.video_url, partition.c.evidence_urls),
+        execution_options={"stream_results": True},
+    )
+    add_references(
+        connection,
+        (url for row in rows for url in violation_evidence_urls(row.image_url, row.video_url, row.evidence_urls)),
+        delta=-1,
+    )
+
+def _release_rollup(connection: Connection, partition) -> None:
+    # Dropped rows no longer count towards their days in the daily rollup
+    from app.crud.violation_rollup import record_violations_removed
+
+    # The session works in a savepoint of the caller's transaction; its commit only releases that
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+        record_violations_removed(session, partition)
+        session.commit()
+
+@dataclass
+class DetachResult:
+    detached: List[str]
+    # Partitions kept attached because they still hold open violations, with how many
+    held: Dict[str, int] = field(default_factory=dict)
+
+def _open_violations(connection: Connection, partition, closed_statuses: Sequence[str]) -> int:
+    status = partition.c.status
+    return connection.execute(
+        select(func.count()).select_from(partition).where(status.is_(None) | status.not_in(closed_statuses))
+    ).scalar()
+
+def detach_partitions(
+    connection: Connection,
+    before: date,
+    drop: bool = False,
+    archive_schema: Optional[str] = None,
+    closed_statuses: Optional[Sequence[str]] = None,
+) -> DetachResult:
+    """
+    Detach month partitions that end on or before `before` and hold only
+    closed violations (ARCHIVE_STATUSES, the rule violations_archive uses).
+    A partition with open violations stays attached, so officers can still
+    process them and citizens pay them; it is reported in `held` and
+    detached by a later run once they are closed. Detached tables are moved
+    to archive_schema (still queryable, counted by the rollup and found by
+    the lookup fallback) or, with drop, deleted after their rows are
+    subtracted from the daily rollup and evidence reference counts.
+    """
+    _require_postgresql(connection)
+    archive_schema = archive_schema or settings.VIOLATION_PARTITION_ARCHIVE_SCHEMA
+    closed_statuses = list(closed_statuses or settings.ARCHIVE_STATUSES)
+    result = DetachResult(detached=[])
+    for partition in list_partitions(connection):
+        if partition.month is None or add_months(partition.month, 1) > before:
+            continue
+        detached_table = partition_table(partition.name)
+        # Counted after DETACH, whose lock keeps the rows from changing in between
+        savepoint = connection.begin_nested()
+        connection.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+        open_violations = _open_violations(connection, detached_table, closed_statuses)
+        if open_violations:
+            savepoint.rollback()
+            result.held[partition.name] = open_violations
+            continue
+        if drop:
+            _release_evidence(connection, detached_table)
+            _release_rollup(connection, detached_table)
+            connection.execute(text(f"DROP TABLE {partition.name}"))
+        else:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            connection.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {archive_schema}"))
+        savepoint.commit()
+        result.detached.append(partition.name)
+    return result
+
+def archived_partition_tables(connection: Connection, archive_schema: Optional[str] = None) -> list:
+    """Detached partitions kept in the archive schema, as lightweight tables"""
+    if connection.dialect.name != "postgresql":
+        return []
+    archive_schema = archive_schema or settings.VIOLATION_PARTITION_ARCHIVE_SCHEMA
+    names = connection.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = :schema ORDER BY tablename"),
+        {"schema": archive_schema},
+    ).scalars()
+    return [partition_table(name, schema=archive_schema) for name in names if partition_month(name)]
+
+def convert_to_partitioned(connection: Connection, months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Rebuild violations as a partitioned table in one transaction: copy every
+    row into monthly partitions, then recreate keys, foreign keys and the
+    model's indexes on the new parent. Holds an exclusive lock on violations
+    for the duration; run it in a maintenance window after all migrations.
+    Returns the partitions created.
+    """
+    _require_postgresql(connection)
+    if is_partitioned(connection):
+        raise PartitioningError(f"{PARENT} is already partitioned")
+    months_ahead = settings.VIOLATION_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    staging = f"{PARENT}_partitioned"
+
+    connection.execute(text(f"LOCK TABLE {PARENT} IN ACCESS EXCLUSIVE MODE"))
+    connection.execute(text(
+        f"CREATE TABLE {staging} (LIKE {PARENT} INCLUDING DEFAULTS) PARTITION BY RANGE ({PARTITION_KEY})"
+    ))
+    first = connection.execute(text(f"SELECT min({PARTITION_KEY}) FROM {PARENT}")).scalar()
+    current = month_start(datetime.utcnow().date())
+    if first is not None and first.tzinfo is not None:
+        first = first.astimezone(timezone.utc)
+    month = month_start(first.date()) if first else current
+    last = add_months(current, months_ahead)
+    created = []
+    while month <= last:
+        name = partition_name(month)
+        connection.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {staging} "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+        ))
+        created.append(name)
+        month = add_months(month, 1)
+    connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {staging} DEFAULT"))
+    connection.execute(text(f"INSERT INTO {staging} SELECT * FROM {PARENT}"))
+
+    # Foreign keys into violations would need the partition key; the n-gram
+    # side table is unused on PostgreSQL, so its reference is simply dropped
+    references = connection.execute(text(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+        "WHERE confrelid = to_regclass(:name) AND contype = 'f'"
+    ), {"name": PARENT}).all()
+    for referencing_table, constraint in references:
+        connection.execute(text(f'ALTER TABLE {referencing_table} DROP CONSTRAINT "{constraint}"'))
+
+    sequence = connection.execute(text(f"SELECT pg_get_serial_sequence('{PARENT}', 'id')")).scalar()
+    if sequence:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    connection.execute(text(f"DROP TABLE {PARENT}"))
+    connection.execute(text(f"ALTER TABLE {staging} RENAME TO {PARENT}"))
+    if sequence:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {PARENT}.id"))
+
+    connection.execute(text(
+        f"ALTER TABLE {PARENT} ADD CONSTRAINT {PARENT}_pkey PRIMARY KEY (id, {PARTITION_KEY})"
+    ))
+    connection.execute(text(
+        f"ALTER TABLE {PARENT} ADD CONSTRAINT uq_violations_violation_code UNIQUE (violation_code, {PARTITION_KEY})"
+    ))
+    connection.execute(text(
+        f"ALTER TABLE {PARENT} ADD CONSTRAINT uq_violations_camera_idempotency_key "
+        f"UNIQUE (camera_id, idempotency_key, {PARTITION_KEY})"
+    ))
+    for foreign_key in Violation.__table__.foreign_key_constraints:
+        connection.execute(AddConstraint(foreign_key))
+    for index in Violation.__table__.indexes:
+        # Unique indexes are replaced by the constraints above
+        if not index.unique:
+            connection.execute(CreateIndex(index))
+    return created
@@ -0,0 +1,157 @@
+from typing import Any, Dict, Optional
+from collections import deque
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.core.config import settings
+
+class PoolMetrics:
+    """Checkout wait times, in-use and overflow counters for one connection pool"""
+
+    def __init__(self, name: str, sample_size: int = 1000):
+        self.name = name
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.connections_created = 0
+        self.connections_invalidated = 0
+        self.pool: Optional[QueuePool] = None
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self._waits.append(seconds)
+
+    def record_usage(self, pool: QueuePool) -> None:
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def _percentile(self, waits, fraction: float) -> Optional[float]:
+        if not waits:
+            return None
+        return waits[min(int(len(waits) * fraction), len(waits) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_ms": {
+                    "avg": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else None,
+                    "p50": self._ms(self._percentile(waits, 0.5)),
+                    "p95": self._ms(self._percentile(waits, 0.95)),
+                    "p99": self._ms(self._percentile(waits, 0.99)),
+                    "max": round(self.max_wait * 1000, 3),
+                    "samples": len(waits),
+                },
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": max(self.peak_overflow, 0),
+                "connections_created": self.connections_created,
+                "connections_invalidated": self.connections_invalidated,
+            }
+        pool = self.pool
+        if pool is not None:
+            stats.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # Negative while the pool has not yet opened pool_size connections
+                "overflow": max(pool.overflow(), 0),
+                "timeout_seconds": pool.timeout(),
+            })
+        return stats
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 3)
+
+class InstrumentedPoolMixin:
+    """Times how long each checkout waits for a free connection"""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+# Pool metrics by engine name ("sync", "async"), read by the metrics endpoint
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def pool_options(url: str, use_async: bool = False) -> Dict[str, Any]:
+    """create_engine keyword arguments for the configured pool"""
+    if _is_memory_sqlite(url):
+        # In-memory SQLite needs its per-connection pool; leave it alone
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def instrument_pool(engine: Engine, name: str) -> PoolMetrics:
+    """Attach metrics to engine's pool through pool events"""
+    metrics = PoolMetrics(name)
+    pool_metrics[name] = metrics
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPoolMixin):
+        pool.metrics = metrics
+        metrics.pool = pool
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connections_created += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if metrics.pool is not None:
+            metrics.record_usage(metrics.pool)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.connections_invalidated += 1
+
+    return metrics
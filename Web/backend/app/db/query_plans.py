@@ -0,0 +1,177 @@
+"""
+EXPLAIN the hot violation queries against a seeded database and report the
+ones that scan the whole violations table.
+
+Everything runs inside one transaction that is rolled back, so the seed
+rows never persist. On PostgreSQL sequential scans are discouraged for the
+check (enable_seqscan = off), so a scan is only reported where no usable
+index exists rather than where the planner prefers one on the small seed.
+"""
+from typing import List, Tuple
+from dataclasses import dataclass
+import random
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.camera import Camera
+from app.models.violation import Violation
+from app.crud import violation as crud_violation
+from app.crud import analytics as crud_analytics
+from app.crud import export as crud_export
+from app.core.plates import normalize_plate
+
+# Large tables that must never be scanned sequentially by a hot query
+CHECKED_TABLES = {"violations"}
+
+# A bare scan (possibly the inner side of a LEFT JOIN), or an automatic index SQLite builds by scanning the table
+_SQLITE_FULL_SCAN = re.compile(r"^(?:SCAN (\w+)(?: AS \w+)?(?: LEFT-JOIN)?|SEARCH (\w+)(?: AS \w+)? USING AUTOMATIC .*)$")
+
+STATUSES = ["processed"] * 12 + ["paid"] * 6 + ["appealed"] + ["pending"]
+
+def seed(db: Session, rows: int) -> dict:
+    now = datetime.utcnow()
+    officers = [
+        {"username": f"plan_officer{i}", "email": f"plan_officer{i}@example.com", "hashed_password": "x",
+         "full_name": f"Officer {i}", "role": "officer", "is_active": True, "badge_number": f"PLAN{i}"}
+        for i in range(20)
+    ]
+    citizens = [
+        {"username": f"plan_citizen{i}", "email": f"plan_citizen{i}@example.com", "hashed_password": "x",
+         "full_name": f"Citizen {i}", "role": "citizen", "is_active": True}
+        for i in range(200)
+    ]
+    officer_ids = list(db.execute(insert(User).returning(User.id), officers).scalars())
+    citizen_ids = list(db.execute(insert(User).returning(User.id), citizens).scalars())
+    camera_ids = list(db.execute(insert(Camera).returning(Camera.id), [
+        {"camera_code": f"PLAN{i:03d}", "name": f"Camera {i}", "location": "Plan check",
+         "camera_type": "speed", "status": "active"}
+        for i in range(50)
+    ]).scalars())
+
+    batch = []
+    for i in range(rows):
+        created_at = now - timedelta(minutes=random.randint(0, 365 * 24 * 60))
+        status = random.choice(STATUSES)
+        from_camera = random.random() < 0.8
+        plate = f"{random.randint(10, 99)}A-{random.randint(100, 999)}.{random.randint(10, 99)}"
+        batch.append({
+            "violation_code": f"PLAN{i:012d}",
+            "license_plate": plate,
+            "license_plate_normalized": normalize_plate(plate),
+            "violation_type": random.choice(["speed", "red_light", "wrong_lane"]),
+            "location": "Plan check",
+            "violation_time": created_at - timedelta(minutes=5),
+            "fine_amount": 500000.0,
+            "status": status,
+            "source": "camera" if from_camera else "report",
+            "camera_id": random.choice(camera_ids) if from_camera else None,
+            "reported_by": None if from_camera else random.choice(citizen_ids),
+            "processed_by": random.choice(officer_ids) if status != "pending" else None,
+            "processed_at": created_at + timedelta(hours=random.randint(1, 72)) if status != "pending" else None,
+            "created_at": created_at,
+        })
+        if len(batch) == 5000:
+            db.execute(insert(Violation), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Violation), batch)
+    db.execute(text("ANALYZE"))
+    return {"now": now, "citizen_id": citizen_ids[0], "officer_id": officer_ids[0]}
+
+def hot_queries(db: Session, seeded: dict):
+    """(label, callable) for every query shape the indexes are meant to serve"""
+    now = seeded["now"]
+    month_ago = now - timedelta(days=30)
+    pending = crud_violation.get_violation_summaries(db, limit=101, status="pending")
+    after = (pending[-1].created_at, pending[-1].id) if pending else None
+    return [
+        ("violation list", lambda: crud_violation.get_violation_summaries(db, limit=101)),
+        ("violation list by status", lambda: crud_violation.get_violation_summaries(db, limit=101, status="processed")),
+        ("officer queue", lambda: crud_violation.get_violation_summaries(db, limit=101, status="pending")),
+        ("officer queue, next page", lambda: crud_violation.get_violation_summaries(db, limit=101, status="pending", after=after)),
+        ("violations by date range", lambda: crud_violation.get_violation_summaries(db, limit=101, date_from=month_ago, date_to=now)),
+        ("citizen reports", lambda: crud_violation.get_violation_summaries(db, limit=101, reported_by=seeded["citizen_id"])),
+        ("lookup by code", lambda: crud_violation.get_violation_by_code(db, "PLAN000000000001")),
+        ("lookup by plate", lambda: crud_violation.get_violations_by_license_plate(db, "51A-123")),
+        ("status counts", lambda: crud_analytics.count_by(db, "status", date_from=month_ago, time_field="created_at")),
+        ("officer performance", lambda: crud_analytics.officer_performance(db, month_ago)),
+        ("officer performance, one officer", lambda: crud_analytics.officer_performance(db, month_ago, officer_id=seeded["officer_id"])),
+        ("camera efficiency", lambda: crud_analytics.camera_efficiency(db, month_ago, days=30)),
+        ("export", lambda: list(crud_export.iter_export_rows(db, crud_export.build_export_query(month_ago, now, status="paid")))),
+    ]
+
+def capture_statements(connection, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+    return statements
+
+def full_scans(connection, statement, parameters):
+    """(tables scanned sequentially, plan lines) for one statement"""
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        scanned, lines = [], []
+
+        def walk(node, depth=0):
+            relation = node.get("Relation Name")
+            index = node.get("Index Name")
+            lines.append(
+                f"{'  ' * depth}{node['Node Type']}{' using ' + index if index else ''}{' on ' + relation if relation else ''}"
+            )
+            if node["Node Type"] == "Seq Scan" and relation in CHECKED_TABLES:
+                scanned.append(relation)
+            for child in node.get("Plans", []):
+                walk(child, depth + 1)
+
+        walk(plan[0]["Plan"])
+        return scanned, lines
+
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    lines = [row[-1] for row in rows]
+    scanned = []
+    for line in lines:
+        match = _SQLITE_FULL_SCAN.match(line)
+        table_name = match and (match.group(1) or match.group(2))
+        if table_name in CHECKED_TABLES:
+            scanned.append(table_name)
+    return scanned, lines
+
+@dataclass
+class StatementPlan:
+    statement: str
+    scanned: List[str]  # checked tables read with a full sequential scan
+    lines: List[str]
+
+def explain_hot_queries(bind: Engine, rows: int) -> List[Tuple[str, List[StatementPlan]]]:
+    """Seed rows violations, then the plan of every statement each hot query runs, by label"""
+    random.seed(0)
+    connection = bind.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection)
+    try:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+        seeded = seed(db, rows)
+        report = []
+        for label, fn in hot_queries(db, seeded):
+            plans = [
+                StatementPlan(statement, *full_scans(connection, statement, parameters))
+                for statement, parameters in capture_statements(connection, fn)
+            ]
+            report.append((label, plans))
+        return report
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import pool_options, instrument_pool
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
+instrument_pool(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
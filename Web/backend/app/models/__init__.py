@@ -1 +1,8 @@
-# Empty file to make models a Python package
+# Import every model so relationship() targets resolve whichever model is used first
+from app.models.user import User
+from app.models.camera import Camera
+from app.models.violation import Violation
+from app.models.violation_rollup import ViolationDailyRollup
+from app.models.plate_ngram import ViolationPlateNgram
+from app.models.evidence import EvidenceBlob
+from app.models.violation_archive import ViolationArchive
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class EvidenceBlob(Base):
+    __tablename__ = "evidence_blobs"
+
+    # Content-addressed evidence file, stored once under UPLOAD_DIR/<storage_key>
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(200), nullable=False)  # evidence/ab/cd/<sha256>.<ext>
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100))
+    # Number of violation references (image_url, video_url, evidence_urls)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Last time an upload stored or deduplicated onto this blob; starts the GC grace period
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now())
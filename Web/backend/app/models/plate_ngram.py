@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.db.base import Base
+
+class ViolationPlateNgram(Base):
+    __tablename__ = "violation_plate_ngrams"
+
+    # N-gram side index over violations.license_plate_normalized, used for
+    # substring plate search on databases without pg_trgm (e.g. SQLite)
+    gram = Column(String(3), primary_key=True)
+    violation_id = Column(Integer, ForeignKey("violations.id", ondelete="CASCADE"), primary_key=True, index=True)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import event, DDL, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -9,6 +10,7 @@ class Violation(Base):
     id = Column(Integer, primary_key=True, index=True)
     violation_code = Column(String(20), unique=True, index=True, nullable=False)
     license_plate = Column(String(20), nullable=False, index=True)
+    license_plate_normalized = Column(String(20), index=True)  # uppercase, no '-', '.' or spaces
     violation_type = Column(String(100), nullable=False)
     description = Column(Text)
     location = Column(String(200), nullable=False)
@@ -21,6 +23,8 @@ class Violation(Base):
     camera_id = Column(Integer, ForeignKey("cameras.id"))
     image_url = Column(String(500))
     video_url = Column(String(500))
+    # Client-supplied per-detection key; retried camera uploads are deduplicated on (camera_id, idempotency_key)
+    idempotency_key = Column(String(64))
     
     # Processing fields
     processed_by = Column(Integer, ForeignKey("users.id"))
@@ -38,3 +42,41 @@ class Violation(Base):
     camera = relationship("Camera", back_populates="violations")
     processor = relationship("User", foreign_keys=[processed_by])
     reporter = relationship("User", foreign_keys=[reported_by])
+    
+    __table_args__ = (
+        UniqueConstraint("camera_id", "idempotency_key", name="uq_violations_camera_idempotency_key"),
+        # Indexes matched to the hot query shapes; scripts/check_query_plans.py checks they are used.
+        # Newest-first lists and keyset pages, unfiltered and by status
+        Index("ix_violations_created_at_id", "created_at", "id"),
+        Index("ix_violations_status_created_at_id", "status", "created_at", "id"),
+        # Officer queue: pending violations only, a small fraction of the table
+        Index(
+            "ix_violations_pending_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # Officer performance (processed_by join with a processed_at range)
+        Index("ix_violations_processed_by_processed_at", "processed_by", "processed_at"),
+        # Camera efficiency and per-camera reports (camera_id join with a violation_time range)
+        Index("ix_violations_camera_id_violation_time", "camera_id", "violation_time"),
+        # Citizen "my violations"
+        Index("ix_violations_reported_by_status", "reported_by", "status"),
+        # Date-range filters, exports and analytics buckets
+        Index("ix_violations_violation_time", "violation_time"),
+        # Trigram index for substring plate search (requires the pg_trgm extension)
+        Index(
+            "ix_violations_license_plate_normalized_trgm",
+            "license_plate_normalized",
+            postgresql_using="gin",
+            postgresql_ops={"license_plate_normalized": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# The trigram index needs pg_trgm; create it along with the table
+event.listen(
+    Violation.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ViolationArchive(Base):
+    __tablename__ = "violations_archive"
+
+    # Closed violations moved out of the hot violations table by
+    # scripts/archive_violations.py. Same columns and ids as violations, with
+    # no foreign keys so archived rows never block changes to users or cameras.
+    id = Column(Integer, primary_key=True)
+    violation_code = Column(String(20), unique=True, index=True, nullable=False)
+    license_plate = Column(String(20), nullable=False)
+    license_plate_normalized = Column(String(20), index=True)
+    violation_type = Column(String(100), nullable=False)
+    description = Column(Text)
+    location = Column(String(200), nullable=False)
+    violation_time = Column(DateTime(timezone=True), nullable=False)
+    fine_amount = Column(Float, nullable=False)
+    status = Column(String(20))
+    source = Column(String(20), nullable=False)
+    camera_id = Column(Integer)
+    image_url = Column(String(500))
+    video_url = Column(String(500))
+    idempotency_key = Column(String(64))
+    processed_by = Column(Integer)
+    processed_at = Column(DateTime(timezone=True))
+    processing_notes = Column(Text)
+    reported_by = Column(Integer)
+    evidence_urls = Column(Text)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
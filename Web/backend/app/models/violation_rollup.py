@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date
+from app.db.base import Base
+
+class ViolationDailyRollup(Base):
+    __tablename__ = "violation_daily_rollup"
+
+    # One row per (day, camera_id, violation_type, status, source) combination.
+    # camera_id is 0 for violations that did not come from a camera so that it
+    # can take part in the primary key.
+    day = Column(Date, primary_key=True)
+    camera_id = Column(Integer, primary_key=True, default=0)
+    violation_type = Column(String(100), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    source = Column(String(20), primary_key=True)
+    violation_count = Column(Integer, nullable=False, default=0)
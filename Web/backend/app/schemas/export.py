@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class ExportJobCreate(BaseModel):
+    format: str = Field("csv", pattern="^(csv|ndjson)$")
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    status: Optional[str] = None
+    violation_type: Optional[str] = None
+
+class ExportJob(BaseModel):
+    id: str
+    format: str
+    status: str  # queued, running, completed, failed
+    rows_written: int
+    total_rows: Optional[int] = None
+    progress: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
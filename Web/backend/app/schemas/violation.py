@@ -1,6 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, computed_field, field_serializer
+from pydantic_core import to_json
+from typing import Any, Iterable, Optional, List
 from datetime import datetime
+from app.core.derivatives import derivative_url, THUMBNAIL, PREVIEW
+from app.core.evidence_delivery import public_upload_url
 
 class ViolationBase(BaseModel):
     license_plate: str
@@ -17,6 +20,22 @@ class ViolationCreate(ViolationBase):
     video_url: Optional[str] = None
     evidence_urls: Optional[List[str]] = None
 
+class CameraViolationIngest(ViolationCreate):
+    source: str = "camera"
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+
+class IngestedViolation(BaseModel):
+    idempotency_key: str
+    id: int
+    violation_code: str
+    duplicate: bool
+
+class CameraIngestResult(BaseModel):
+    received: int
+    created: int
+    duplicates: int
+    violations: List[IngestedViolation]
+
 class ViolationUpdate(BaseModel):
     status: Optional[str] = None
     processing_notes: Optional[str] = None
@@ -48,7 +67,62 @@ class ViolationInDB(ViolationBase):
         from_attributes = True
 
 class Violation(ViolationInDB):
-    pass
+    @computed_field
+    @property
+    def image_thumbnail_url(self) -> Optional[str]:
+        """Fixed-size thumbnail of image_url (404 until generated)"""
+        return public_upload_url(derivative_url(self.image_url, THUMBNAIL))
+
+    @computed_field
+    @property
+    def image_preview_url(self) -> Optional[str]:
+        """Web-sized preview of image_url (404 until generated)"""
+        return public_upload_url(derivative_url(self.image_url, PREVIEW))
+
+    @field_serializer("image_url", "video_url")
+    def serialize_file_url(self, url: Optional[str]) -> Optional[str]:
+        return public_upload_url(url)
+
+    @field_serializer("evidence_urls")
+    def serialize_evidence_urls(self, urls: Optional[str]) -> Optional[str]:
+        if not urls:
+            return urls
+        return ",".join(public_upload_url(url.strip()) for url in urls.split(","))
+
+class ViolationSummary(BaseModel):
+    """List view of a violation; only the detail endpoint serves the full Violation"""
+    id: int
+    violation_code: str
+    license_plate: str
+    violation_type: str
+    location: str
+    violation_time: datetime
+    fine_amount: float
+    status: str
+    source: str
+    camera_id: Optional[int] = None
+    image_url: Optional[str] = None
+    reported_by: Optional[int] = None
+    processed_by: Optional[int] = None
+    processed_at: Optional[datetime] = None
+    created_at: datetime
+    image_thumbnail_url: Optional[str] = None
+
+# Columns a summary row is selected with (everything except the derived thumbnail URL)
+VIOLATION_SUMMARY_FIELDS = [name for name in ViolationSummary.model_fields if name != "image_thumbnail_url"]
+
+def violation_summaries_json(rows: Iterable[Any]) -> bytes:
+    """
+    Encode rows selected with VIOLATION_SUMMARY_FIELDS as a JSON array of
+    ViolationSummary, straight from the row tuples without building models.
+    """
+    items = []
+    for row in rows:
+        item = dict(row._mapping)
+        item["image_thumbnail_url"] = public_upload_url(derivative_url(item["image_url"], THUMBNAIL))
+        item["image_url"] = public_upload_url(item["image_url"])
+        items.append(item)
+    return to_json(items)
 
 class ViolationLookup(BaseModel):
     license_plate: Optional[str] = None
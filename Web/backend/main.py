@@ -1,11 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 
 from app.api.v1.api import api_router
+from app.api import uploads
 from app.core.config import settings
+from app.core.export_jobs import export_jobs
+from app.core.security import password_hasher
+from app.core.derivatives import derivative_pipeline
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.db.async_session import dispose_async_engine
 
 # Load environment variables
 load_dotenv()
@@ -23,15 +29,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Refuse oversized upload bodies before Starlette spools them
+app.add_middleware(UploadSizeLimitMiddleware, max_size=settings.MAX_UPLOAD_REQUEST_SIZE)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
-# Serve uploaded files
-if not os.path.exists("uploads"):
-    os.makedirs("uploads")
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Serve uploaded files (ETag, Range and cache headers; see app/api/uploads.py)
+if not os.path.exists(settings.UPLOAD_DIR):
+    os.makedirs(settings.UPLOAD_DIR)
+app.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
+
+@app.on_event("shutdown")
+def shutdown_background_workers():
+    export_jobs.shutdown()
+    password_hasher.shutdown()
+    derivative_pipeline.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
 
 @app.get("/")
 async def root():
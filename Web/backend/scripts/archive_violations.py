@@ -0,0 +1,47 @@
+"""
+Script to move old closed violations to the violations_archive table
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.violation_archive import archive_closed_violations
+from app.core.config import settings
+
+def archive_violations(older_than_days: int, statuses: list, batch_size: int, dry_run: bool):
+    db: Session = SessionLocal()
+
+    try:
+        count = archive_closed_violations(
+            db,
+            older_than=timedelta(days=older_than_days),
+            statuses=statuses,
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+        if dry_run:
+            print(f"ℹ️  Would archive {count} violations ({', '.join(statuses)}, older than {older_than_days} days)")
+        else:
+            print(f"✅ Archived {count} violations ({', '.join(statuses)}, older than {older_than_days} days)")
+    except Exception as e:
+        print(f"❌ Archiving violations failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old closed violations to the archive table")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument(
+        "--statuses", nargs="+", default=settings.ARCHIVE_STATUSES,
+        help="violation statuses that count as closed",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="violations moved per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only report how many violations would be archived")
+    args = parser.parse_args()
+    archive_violations(args.older_than_days, args.statuses, args.batch_size, args.dry_run)
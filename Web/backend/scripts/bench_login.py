@@ -0,0 +1,98 @@
+"""
+Script to measure bcrypt cost and login throughput, for sizing BCRYPT_ROUNDS
+and PASSWORD_HASH_WORKERS on the target hardware.
+
+Without --url it times password verification through the app's hashing pool
+(app.core.security.password_hasher, or one of the same class sized by
+--workers) for each cost factor. With --url it also fires concurrent logins
+at a running API.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.security import PasswordHasher, password_hasher
+
+def bench_rounds(hasher: PasswordHasher, rounds: int, count: int) -> None:
+    # The verifier reads the cost factor from the hash, so only hashing needs a per-round context
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash("benchmark-password")
+
+    start = time.perf_counter()
+    hasher.verify("benchmark-password", hashed)
+    single_ms = (time.perf_counter() - start) * 1000
+
+    waited, completed = hasher.total_queue_wait, hasher.completed
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=count) as callers:
+        list(callers.map(lambda _: hasher.verify("benchmark-password", hashed), range(count)))
+    elapsed = time.perf_counter() - start
+    queue_wait_ms = (hasher.total_queue_wait - waited) / max(hasher.completed - completed, 1) * 1000
+    print(
+        f"  rounds={rounds:<3} verify={single_ms:7.1f} ms  "
+        f"{count / elapsed:7.1f} logins/s with {hasher.max_workers} workers  "
+        f"avg queue wait={queue_wait_ms:.1f} ms"
+    )
+
+def bench_http(url: str, username: str, password: str, role: str, concurrency: int, count: int) -> None:
+    body = json.dumps({"username": username, "password": password, "role": role}).encode()
+
+    def login(_):
+        request = urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        return status, time.perf_counter() - started
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(login, range(count)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000
+    print(f"  {count / elapsed:.1f} logins/s, p50={p50:.0f} ms, p95={p95:.0f} ms, statuses={statuses}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt cost and login throughput")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--count", type=int, default=50, help="verifications or logins per run")
+    parser.add_argument("--url", help="login URL of a running API, e.g. http://localhost:8000/api/v1/auth/login")
+    parser.add_argument("--username", default="officer1")
+    parser.add_argument("--password", default="officer123")
+    parser.add_argument("--role", default="officer")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"🔐 bcrypt verification through the hashing pool ({args.count} per cost factor)")
+    for rounds in args.rounds:
+        hasher = password_hasher
+        if args.workers != settings.PASSWORD_HASH_WORKERS:
+            hasher = PasswordHasher(max_workers=args.workers, max_pending=settings.PASSWORD_HASH_MAX_PENDING)
+        bench_rounds(hasher, rounds, args.count)
+
+    if args.url:
+        print(f"🌐 Logins against {args.url} ({args.concurrency} concurrent)")
+        bench_http(args.url, args.username, args.password, args.role, args.concurrency, args.count)
+
+    print("ℹ️  Pick the highest BCRYPT_ROUNDS whose logins/s covers the peak login rate")
+
+if __name__ == "__main__":
+    main()
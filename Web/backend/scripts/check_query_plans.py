@@ -0,0 +1,49 @@
+"""
+Script to check that the hot violation queries are served by indexes.
+
+Seeds users, cameras and violations inside a transaction, runs each hot
+query through the real crud functions while recording the SQL they emit,
+then EXPLAINs every statement and fails if any of them scans the whole
+violations table. The transaction is rolled back at the end, but the seed
+is still written to the database first: point DATABASE_URL at a scratch
+database migrated with scripts/create_database.py. tests/test_query_plans.py
+runs the same check against a temporary database.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from app.db.session import engine
+from app.db.query_plans import explain_hot_queries
+
+def check_query_plans(rows: int, verbose: bool = False) -> bool:
+    print(f"🌱 Seeding {rows} violations ({engine.dialect.name})")
+    ok = True
+    for label, plans in explain_hot_queries(engine, rows):
+        failed = any(plan.scanned for plan in plans)
+        ok = ok and not failed
+        print(f"{'❌' if failed else '✅'} {label}")
+        for plan in plans:
+            if not plan.scanned and not verbose:
+                continue
+            if plan.scanned:
+                print(f"   sequential scan of {', '.join(plan.scanned)} in:")
+                print("   " + " ".join(plan.statement.split()))
+            for line in plan.lines:
+                print(f"     {line}")
+    return ok
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot violation query scans the violations table")
+    parser.add_argument("--rows", type=int, default=20000, help="violations to seed")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not just failures")
+    args = parser.parse_args()
+
+    if check_query_plans(args.rows, args.verbose):
+        print("✅ All hot queries use indexes")
+    else:
+        print("❌ Some hot queries scan the violations table; add or fix an index")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
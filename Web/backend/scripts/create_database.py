@@ -1,35 +1,54 @@
 """
-Script to create database tables using Alembic migrations
+Script to create or upgrade database tables using the Alembic migrations in alembic/versions
 """
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from alembic.config import Config
 from alembic import command
-import os
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from app.db.session import engine
+
+# Revision matching the schema of databases created before migrations were tracked;
+# later revisions only add what such a database is missing
+INITIAL_REVISION = "0001"
 
 def create_database():
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # Go up one level to the backend directory
     backend_dir = os.path.dirname(script_dir)
-    
+
     # Path to alembic.ini
     alembic_cfg_path = os.path.join(backend_dir, "alembic.ini")
-    
+
     # Create Alembic configuration
     alembic_cfg = Config(alembic_cfg_path)
-    
-    # Generate initial migration
-    try:
-        command.revision(alembic_cfg, autogenerate=True, message="Initial migration")
-        print("✅ Generated initial migration")
-    except Exception as e:
-        print(f"⚠️  Migration generation failed (might already exist): {e}")
-    
+    alembic_cfg.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+
+    # Databases created before migrations were tracked have no alembic_version,
+    # or one naming a revision that was generated locally and is not in alembic/versions
+    tables = inspect(engine).get_table_names()
+    if "violations" in tables:
+        current = None
+        if "alembic_version" in tables:
+            with engine.connect() as connection:
+                current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        known = {script.revision for script in ScriptDirectory.from_config(alembic_cfg).walk_revisions()}
+        if current not in known:
+            command.stamp(alembic_cfg, INITIAL_REVISION, purge=True)
+            print(f"ℹ️  Existing tables found, marked as revision {INITIAL_REVISION}")
+            print("ℹ️  Afterwards run scripts/rebuild_plate_index.py and scripts/rebuild_violation_rollup.py")
+
     # Run migrations
     try:
         command.upgrade(alembic_cfg, "head")
         print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Migration failed: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     create_database()
@@ -0,0 +1,44 @@
+"""
+Script to remove evidence blobs that no violation refers to
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.evidence import collect_garbage, recount_references
+from app.core.config import settings
+
+def gc_evidence(grace_hours: int, recount: bool, dry_run: bool):
+    db: Session = SessionLocal()
+
+    try:
+        if recount:
+            referenced = recount_references(db)
+            print(f"✅ Recounted references: {referenced} blobs are referenced by violations")
+        blobs = collect_garbage(db, grace=timedelta(hours=grace_hours), dry_run=dry_run)
+        freed = sum(blob.size for blob in blobs)
+        if dry_run:
+            print(f"ℹ️  Would remove {len(blobs)} unreferenced blobs ({freed} bytes)")
+        else:
+            print(f"✅ Removed {len(blobs)} unreferenced blobs ({freed} bytes)")
+    except Exception as e:
+        print(f"❌ Evidence garbage collection failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove unreferenced evidence blobs")
+    parser.add_argument(
+        "--grace-hours", type=int, default=settings.EVIDENCE_GC_GRACE_HOURS,
+        help="keep unreferenced blobs uploaded within this many hours (reports not yet submitted)",
+    )
+    parser.add_argument("--recount", action="store_true", help="recompute reference counts from violations first")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    args = parser.parse_args()
+    gc_evidence(args.grace_hours, args.recount, args.dry_run)
@@ -0,0 +1,50 @@
+"""
+Script to generate missing thumbnails and previews for existing violation images
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import wait
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.models.violation import Violation
+from app.crud.evidence import violation_evidence_urls
+from app.core.derivatives import derivative_pipeline
+
+def generate(batch_size: int = 1000):
+    if not derivative_pipeline.available:
+        print("❌ Pillow is not installed")
+        sys.exit(1)
+
+    db: Session = SessionLocal()
+
+    try:
+        futures = []
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Violation.id, Violation.image_url, Violation.video_url, Violation.evidence_urls)
+                .where(Violation.id > last_id)
+                .order_by(Violation.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                futures.extend(derivative_pipeline.submit(
+                    violation_evidence_urls(row.image_url, row.video_url, row.evidence_urls)
+                ))
+            last_id = rows[-1].id
+        wait(futures)
+        failed = sum(1 for future in futures if future.exception() is not None)
+        print(f"✅ Generated derivatives for {len(futures) - failed} images")
+        if failed:
+            print(f"⚠️  {failed} images could not be processed")
+    finally:
+        derivative_pipeline.shutdown()
+        db.close()
+
+if __name__ == "__main__":
+    generate()
@@ -0,0 +1,93 @@
+"""
+Script to manage monthly partitions of the violations table (PostgreSQL only)
+
+  convert   one-time rebuild of violations as a partitioned table
+  maintain  create upcoming partitions and detach ones past retention;
+            safe to run repeatedly, e.g. daily from cron
+  list      show partitions with estimated row counts
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from datetime import datetime
+from app.db.session import engine
+from app.db.partitions import (
+    PartitioningError,
+    add_months,
+    convert_to_partitioned,
+    detach_partitions,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+)
+from app.core.config import settings
+
+def convert(months_ahead: int):
+    print("🔄 Converting violations to a partitioned table (locks violations until done)")
+    with engine.begin() as connection:
+        created = convert_to_partitioned(connection, months_ahead=months_ahead)
+    print(f"✅ Created {len(created)} monthly partitions ({created[0]} .. {created[-1]})")
+
+def maintain(months_ahead: int, retention_months: int, drop: bool):
+    with engine.begin() as connection:
+        created = ensure_partitions(connection, months_ahead=months_ahead)
+    for name in created:
+        print(f"✅ Created partition {name}")
+
+    detached, held = [], {}
+    if retention_months > 0:
+        cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+        with engine.begin() as connection:
+            result = detach_partitions(connection, before=cutoff, drop=drop)
+        detached, held = result.detached, result.held
+        for name in detached:
+            if drop:
+                print(f"🗑️  Dropped partition {name}")
+            else:
+                print(f"📦 Moved partition {name} to schema {settings.VIOLATION_PARTITION_ARCHIVE_SCHEMA}")
+        for name, open_violations in held.items():
+            print(f"⏸️  Kept partition {name}: {open_violations} violations are not closed yet")
+    if not created and not detached and not held:
+        print("✅ Partitions are up to date")
+
+def show():
+    with engine.connect() as connection:
+        partitions = list_partitions(connection)
+    if not partitions:
+        print("ℹ️  violations is not partitioned")
+    for partition in partitions:
+        print(f"  {partition.name:<28} ~{partition.rows} rows")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage monthly partitions of the violations table")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="rebuild violations as a partitioned table")
+    convert_parser.add_argument("--months-ahead", type=int, default=settings.VIOLATION_PARTITION_MONTHS_AHEAD)
+
+    maintain_parser = subparsers.add_parser("maintain", help="create upcoming and detach expired partitions")
+    maintain_parser.add_argument("--months-ahead", type=int, default=settings.VIOLATION_PARTITION_MONTHS_AHEAD)
+    maintain_parser.add_argument(
+        "--retention-months", type=int, default=settings.VIOLATION_PARTITION_RETENTION_MONTHS,
+        help="detach partitions older than this many months (0 keeps everything)",
+    )
+    maintain_parser.add_argument(
+        "--drop", action="store_true",
+        help="drop expired partitions instead of moving them to the archive schema",
+    )
+
+    subparsers.add_parser("list", help="show partitions")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "convert":
+            convert(args.months_ahead)
+        elif args.command == "maintain":
+            maintain(args.months_ahead, args.retention_months, args.drop)
+        else:
+            show()
+    except PartitioningError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,30 @@
+"""
+Script to backfill normalized license plates and rebuild the plate n-gram index
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.plate_search import rebuild_plate_index, uses_ngram_index
+
+def rebuild():
+    db: Session = SessionLocal()
+
+    try:
+        processed = rebuild_plate_index(db)
+        print(f"✅ Normalized {processed} license plates")
+        if uses_ngram_index(db):
+            print("✅ Rebuilt the plate n-gram index")
+        else:
+            print("ℹ️  PostgreSQL uses the pg_trgm index, no n-gram table to rebuild")
+    except Exception as e:
+        print(f"❌ Plate index rebuild failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,37 @@
+"""
+Script to rebuild the violation_daily_rollup table from the violations table
+"""
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.violation_rollup import rebuild_rollup
+from datetime import date
+
+def rebuild(day_from: date = None):
+    db: Session = SessionLocal()
+
+    try:
+        rows = rebuild_rollup(db, day_from=day_from)
+        scope = f"from {day_from.isoformat()}" if day_from else "for all days"
+        print(f"✅ Rebuilt daily rollup {scope} ({rows} rollup rows)")
+    except Exception as e:
+        print(f"❌ Rollup rebuild failed: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="Only rebuild days on or after this date (YYYY-MM-DD)",
+    )
+    args = parser.parse_args()
+    rebuild(args.since)
@@ -0,0 +1,93 @@
+"""
+Script to read frames from every active camera and pass sampled frames to a
+detection handler, printing per-camera metrics until interrupted
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import importlib
+import importlib.util
+import logging
+import time
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.crud.camera import get_streaming_cameras
+from app.core.camera_ingest import CameraFeed, CameraIngestService, Frame, camera_source
+from app.core.config import settings
+
+def load_handler(spec: Optional[str]) -> Optional[Callable[[Frame], None]]:
+    """Resolve a "module:function" handler, e.g. a detection entry point"""
+    if not spec:
+        return None
+    module_name, _, function_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), function_name or "handle_frame")
+
+def load_feeds(video: Optional[str], camera_codes: Optional[list]) -> list:
+    db: Session = SessionLocal()
+    try:
+        cameras = get_streaming_cameras(db)
+    finally:
+        db.close()
+    if camera_codes:
+        cameras = [camera for camera in cameras if camera.camera_code in camera_codes]
+    return [
+        CameraFeed(camera.id, camera.camera_code, video or camera_source(camera.rtsp_url))
+        for camera in cameras
+    ]
+
+def print_stats(service: CameraIngestService):
+    for code, stats in service.stats().items():
+        state = "🟢" if stats["connected"] else "🔴"
+        lag = f"{stats['lag_seconds']:.3f}s" if stats["lag_seconds"] is not None else "-"
+        print(
+            f"{state} {code:<12} read {stats['read_fps']:>6.2f} fps  "
+            f"sampled {stats['sampled_fps']:>5.2f} fps  processed {stats['processed_fps']:>5.2f} fps  "
+            f"lag {lag}  queued {stats['queue_depth']}  dropped {stats['frames_dropped']}  "
+            f"reconnects {stats['reconnects']}"
+        )
+        if stats["last_error"] and not stats["connected"]:
+            print(f"   ⚠️  {stats['last_error']}")
+
+def run(args):
+    if importlib.util.find_spec("cv2") is None:
+        print("❌ OpenCV is not installed (pip install opencv-python-headless)")
+        sys.exit(1)
+
+    feeds = load_feeds(args.video, args.cameras)
+    if not feeds:
+        print("ℹ️  No active cameras with a stream URL")
+        return
+
+    service = CameraIngestService(
+        feeds,
+        handler=load_handler(args.handler),
+        sample_fps=args.sample_fps,
+        queue_size=args.queue_size,
+        workers=args.workers,
+    )
+    print(f"🎥 Reading {len(feeds)} cameras at {args.sample_fps} sampled fps each (Ctrl+C to stop)")
+    service.start()
+    try:
+        while True:
+            time.sleep(args.report_seconds)
+            print_stats(service)
+    except KeyboardInterrupt:
+        print("🛑 Stopping camera readers")
+    finally:
+        service.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest frames from active camera streams")
+    parser.add_argument("--sample-fps", type=float, default=settings.CAMERA_SAMPLE_FPS, help="frames per second per camera")
+    parser.add_argument("--queue-size", type=int, default=settings.CAMERA_QUEUE_SIZE, help="sampled frames buffered per camera")
+    parser.add_argument("--workers", type=int, default=settings.CAMERA_INGEST_WORKERS)
+    parser.add_argument("--handler", help='frame handler as "module:function"; frames are only counted without one')
+    parser.add_argument("--video", help="read this local video for every camera instead of its stream")
+    parser.add_argument("--cameras", nargs="+", help="only these camera codes")
+    parser.add_argument("--report-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    run(args)
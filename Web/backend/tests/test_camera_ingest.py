@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.api import deps
+from app.api.v1.endpoints import cameras
+from app.core.config import settings
+from app.models.violation import Violation
+
+WHEN = datetime(2025, 3, 10, 9, 0, tzinfo=timezone.utc).isoformat()
+
+
+def _detection(key, image=None):
+    return {
+        "idempotency_key": key,
+        "license_plate": "51A-123.45",
+        "violation_type": "Speeding",
+        "location": "Main St",
+        "violation_time": WHEN,
+        "fine_amount": 1200000,
+        "image_url": image,
+    }
+
+
+def _ndjson(detections):
+    return "\n".join(json.dumps(detection) for detection in detections).encode()
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    urls = []
+    monkeypatch.setattr(cameras.derivative_pipeline, "submit", lambda images: urls.extend(images) or [])
+    return urls
+
+
+@pytest.fixture
+def client(db, submitted):
+    app = FastAPI()
+    app.include_router(cameras.router, prefix="/cameras")
+    app.dependency_overrides[deps.get_db] = lambda: db
+    app.dependency_overrides[deps.get_current_officer_user] = lambda: None
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def url(camera):
+    return f"/cameras/{camera.id}/violations"
+
+
+def _count(db):
+    return db.execute(select(func.count()).select_from(Violation)).scalar()
+
+
+def test_retried_upload_creates_nothing_twice(db, client, url, submitted):
+    detections = [_detection("a", "/uploads/a.jpg"), _detection("b", "/uploads/b.jpg")]
+
+    first = client.post(url, json=detections).json()
+    retry = client.post(url, json=detections).json()
+
+    assert (first["created"], first["duplicates"]) == (2, 0)
+    assert (retry["created"], retry["duplicates"]) == (0, 2)
+    assert [v["duplicate"] for v in retry["violations"]] == [True, True]
+    assert [(v["id"], v["violation_code"]) for v in retry["violations"]] == [
+        (v["id"], v["violation_code"]) for v in first["violations"]
+    ]
+    assert _count(db) == 2
+    assert submitted == ["/uploads/a.jpg", "/uploads/b.jpg"]
+
+
+def test_repeated_key_in_one_upload_keeps_the_first_detection(db, client, url, submitted):
+    detections = [_detection("a", "/uploads/first.jpg"), _detection("b"), _detection("a", "/uploads/second.jpg")]
+
+    result = client.post(url, json=detections).json()
+
+    assert (result["received"], result["created"], result["duplicates"]) == (3, 2, 0)
+    assert [v["idempotency_key"] for v in result["violations"]] == ["a", "b"]
+    assert db.execute(select(Violation.image_url).where(Violation.idempotency_key == "a")).scalar() == "/uploads/first.jpg"
+    assert submitted == ["/uploads/first.jpg", None]
+
+
+def test_ndjson_upload_reports_duplicates(client, url, submitted):
+    client.post(url, json=[_detection("a", "/uploads/a.jpg")])
+    submitted.clear()
+
+    response = client.post(
+        url,
+        content=_ndjson([_detection("a", "/uploads/a.jpg"), _detection("c", "/uploads/c.jpg")]) + b"\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert [(v["idempotency_key"], v["duplicate"]) for v in response.json()["violations"]] == [("a", True), ("c", False)]
+    assert submitted == ["/uploads/c.jpg"]
+
+
+@pytest.mark.parametrize("content_type", ["application/json", "application/x-ndjson"])
+def test_oversized_body_is_refused_from_content_length(db, client, url, monkeypatch, content_type):
+    body = json.dumps([_detection("a")]).encode() if content_type == "application/json" else _ndjson([_detection("a")])
+    monkeypatch.setattr(settings, "INGEST_MAX_BODY_BYTES", len(body) - 1)
+
+    response = client.post(url, content=body, headers={"Content-Type": content_type})
+
+    assert response.status_code == 413
+    assert _count(db) == 0
+
+
+def test_oversized_body_without_content_length_is_cut_off(db, client, url, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_MAX_BODY_BYTES", 1000)
+    chunks = iter([b"[" + json.dumps(_detection("a")).encode()] + [b" " * 500] * 4 + [b"]"])
+
+    response = client.post(url, content=chunks, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 413
+    assert _count(db) == 0
+
+
+def test_ndjson_line_over_the_limit_is_refused(db, client, url, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_MAX_LINE_BYTES", 400)
+    long_line = json.dumps({**_detection("b"), "description": "x" * 500})
+
+    response = client.post(
+        url,
+        content=_ndjson([_detection("a")]) + b"\n" + long_line.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 413
+    assert "Line 2" in response.json()["detail"]
+    assert _count(db) == 0
+
+
+def test_too_many_detections_are_refused(db, client, url, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_MAX_ITEMS", 2)
+
+    response = client.post(url, json=[_detection(key) for key in "abc"])
+
+    assert response.status_code == 413
+    assert _count(db) == 0
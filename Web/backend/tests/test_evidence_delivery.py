@@ -0,0 +1,125 @@
+from urllib.parse import parse_qs, urlsplit
+import hashlib
+import hmac
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.evidence_delivery import (
+    RangeNotSatisfiable,
+    etag_matches,
+    parse_range,
+    sign_upload_url,
+    url_expiry,
+    verify_upload_signature,
+)
+
+BLOB_URL = "/uploads/evidence/ab/cd/" + "ab" * 32 + ".jpg"
+BLOB_PATH = BLOB_URL[len("/uploads/"):]
+
+
+def _query(url):
+    query = parse_qs(urlsplit(url).query)
+    return int(query["expires"][0]), query["signature"][0]
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        (" bytes=0-0 ", (0, 0)),
+        (None, None),
+        ("", None),
+        ("bytes=-", None),
+        ("bytes=10-5", None),
+        ("bytes=0-1,5-9", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header, size", [("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=-10", 0), ("bytes=0-", 0)])
+def test_parse_range_not_satisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
+
+
+@pytest.mark.parametrize(
+    "header, weak, expected",
+    [
+        ('"abc"', True, True),
+        ('"abc"', False, True),
+        ('W/"abc"', True, True),
+        ('W/"abc"', False, False),
+        ('"xyz", W/"abc"', True, True),
+        ('"xyz" ,  "abc"', False, True),
+        ("*", False, True),
+        ('"xyz"', True, False),
+        ("abc", True, False),
+        ("", True, False),
+        (None, True, False),
+    ],
+)
+def test_etag_matches(header, weak, expected):
+    assert etag_matches(header, '"abc"', weak=weak) is expected
+
+
+def test_signed_url_verifies():
+    expires, signature = _query(sign_upload_url(BLOB_URL))
+    assert verify_upload_signature(BLOB_PATH, expires, signature)
+
+
+@pytest.mark.parametrize(
+    "path, expires_delta, signature",
+    [
+        ("evidence/ab/cd/other.jpg", 0, None),
+        (BLOB_PATH, 1, None),
+        (BLOB_PATH, 0, "0" * 64),
+        (BLOB_PATH, 0, ""),
+    ],
+)
+def test_tampered_signature_is_rejected(path, expires_delta, signature):
+    expires, valid = _query(sign_upload_url(BLOB_URL))
+    assert not verify_upload_signature(path, expires + expires_delta, valid if signature is None else signature)
+
+
+def test_missing_or_expired_signature_is_rejected():
+    expires, signature = _query(sign_upload_url(BLOB_URL, ttl=-10, window=0))
+    assert expires < time.time()
+    assert not verify_upload_signature(BLOB_PATH, expires, signature)
+    assert not verify_upload_signature(BLOB_PATH, None, signature)
+
+
+def test_signature_is_not_keyed_with_secret_key(monkeypatch):
+    monkeypatch.setattr(settings, "EVIDENCE_URL_SIGNING_KEY", "")
+    expires, signature = _query(sign_upload_url(BLOB_URL))
+    plain = hmac.new(settings.SECRET_KEY.encode(), f"{BLOB_PATH}:{expires}".encode(), hashlib.sha256).hexdigest()
+    assert signature != plain
+
+    monkeypatch.setattr(settings, "EVIDENCE_URL_SIGNING_KEY", "separate-key")
+    assert _query(sign_upload_url(BLOB_URL))[1] != signature
+    assert not verify_upload_signature(BLOB_PATH, expires, signature)
+
+
+def test_urls_are_stable_within_a_window():
+    first = sign_upload_url(BLOB_URL, ttl=3600, now=1_000_000, window=300)
+    assert sign_upload_url(BLOB_URL, ttl=3600, now=1_000_199, window=300) == first
+    assert sign_upload_url(BLOB_URL, ttl=3600, now=1_000_200, window=300) != first
+
+
+@pytest.mark.parametrize("now", [1_000_000, 1_000_001, 1_000_299, 1_000_300.5])
+def test_expiry_is_rounded_up_past_the_ttl(now):
+    expires = url_expiry(3600, now, 300)
+    assert expires % 300 == 0
+    assert now + 3600 < expires <= now + 3600 + 300
+
+
+def test_expiry_without_window():
+    assert url_expiry(3600, 1_000_000.7, 0) == 1_003_600
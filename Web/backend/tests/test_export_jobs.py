@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+import os
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core import export_jobs as export_jobs_module
+from app.core.config import settings
+from app.core.export_jobs import ExportJobManager
+
+FILTERS = {
+    "date_from": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    "date_to": datetime(2025, 12, 31, tzinfo=timezone.utc),
+    "status": None,
+    "violation_type": None,
+}
+
+
+@pytest.fixture
+def managers(engine, monkeypatch, tmp_path):
+    """Two managers sharing EXPORT_DIR, standing in for two worker processes"""
+    monkeypatch.setattr(export_jobs_module, "SessionLocal", sessionmaker(bind=engine))
+    workers = [ExportJobManager(max_workers=1, max_queued=2, export_dir=str(tmp_path / "exports")) for _ in range(2)]
+    yield workers
+    for worker in workers:
+        worker.shutdown()
+
+
+def _wait(manager, job_id):
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Export job {job_id} did not finish")
+
+
+def test_another_worker_sees_the_job(managers, make_violation):
+    for day in range(3):
+        make_violation(datetime(2025, 3, 1 + day, tzinfo=timezone.utc))
+    running_worker, other_worker = managers
+
+    job = running_worker.submit(owner_id=7, format="csv", filters=FILTERS)
+    assert other_worker.get(job.id).status in ("queued", "running", "completed")
+    _wait(running_worker, job.id)
+
+    seen = other_worker.get(job.id)
+    assert seen.status == "completed"
+    assert (seen.owner_id, seen.format, seen.rows_written, seen.total_rows) == (7, "csv", 3, 3)
+    assert seen.to_dict()["download_url"].endswith(f"/export-jobs/{job.id}/download")
+    with open(seen.file_path, encoding="utf-8") as exported:
+        assert len(exported.read().strip().splitlines()) == 4
+
+
+def test_failed_job_is_shared_too(managers):
+    running_worker, other_worker = managers
+
+    job = running_worker.submit(owner_id=7, format="xlsx", filters=FILTERS)
+    _wait(running_worker, job.id)
+
+    seen = other_worker.get(job.id)
+    assert seen.status == "failed" and seen.error
+    assert seen.finished_at is not None
+
+
+@pytest.mark.parametrize("job_id", ["0" * 32, "../../etc/passwd", "", "A" * 32])
+def test_unknown_or_malformed_ids_are_not_found(managers, job_id):
+    assert managers[1].get(job_id) is None
+
+
+def test_expired_jobs_are_removed_by_any_worker(managers, monkeypatch):
+    running_worker, other_worker = managers
+    job = _wait(running_worker, running_worker.submit(owner_id=7, format="csv", filters=FILTERS).id)
+    state_path = os.path.join(running_worker.export_dir, f"{job.id}.json")
+    assert os.path.exists(job.file_path) and os.path.exists(state_path)
+
+    monkeypatch.setattr(settings, "EXPORT_JOB_RETENTION_HOURS", 0)
+    job.finished_at -= timedelta(seconds=1)
+    running_worker._save(job)
+    _wait(other_worker, other_worker.submit(owner_id=7, format="csv", filters=FILTERS).id)
+
+    assert not os.path.exists(job.file_path) and not os.path.exists(state_path)
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crud.analytics import officer_performance, percentile_cont
+from app.models.user import User
+from app.models.violation import Violation
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+CREATED = datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def officers(db):
+    def user(name, role="officer", is_active=True):
+        return User(
+            username=name, email=f"{name}@example.com", hashed_password="x", full_name=name.title(),
+            role=role, is_active=is_active, badge_number=name.upper() if role == "officer" else None,
+        )
+
+    users = {name: user(name) for name in ("alpha", "bravo", "charlie")}
+    users["retired"] = user("retired", is_active=False)
+    users["citizen"] = user("citizen", role="citizen")
+    db.add_all(users.values())
+    db.flush()
+
+    latencies = {"alpha": [60, 120, 180, 240], "bravo": [30], "retired": [10]}
+    for name, seconds in latencies.items():
+        for index, latency in enumerate(seconds):
+            db.add(Violation(
+                violation_code=f"V{name[:3].upper()}{index}", license_plate="51A-123.45", violation_type="Speeding",
+                location="Main St", violation_time=CREATED, fine_amount=1, status="processed", source="camera",
+                created_at=CREATED, processed_at=CREATED + timedelta(seconds=latency), processed_by=users[name].id,
+            ))
+    db.commit()
+    return {name: user.id for name, user in users.items()}
+
+
+def _names(rows):
+    return [row["officer_name"] for row in rows]
+
+
+@pytest.mark.parametrize(
+    "values, fraction, expected",
+    [([], 0.5, None), ([5], 0.9, 5), ([1, 2, 3, 4], 0.5, 2.5), ([60, 120, 180, 240], 0.9, 222)],
+)
+def test_percentile_cont(values, fraction, expected):
+    assert percentile_cont(values, fraction) == expected
+
+
+def test_percentiles_on_every_database(db, officers):
+    rows, total = officer_performance(db, SINCE)
+
+    assert total == 3
+    by_name = {row["officer_name"]: row for row in rows}
+    assert by_name["Alpha"]["processed_violations"] == 4
+    # SQLite measures latencies with julianday, which is accurate to about a millisecond
+    assert by_name["Alpha"]["median_processing_seconds"] == pytest.approx(150, abs=0.01)
+    assert by_name["Alpha"]["p90_processing_seconds"] == pytest.approx(222, abs=0.01)
+    assert by_name["Bravo"]["median_processing_seconds"] == pytest.approx(30, abs=0.01)
+    assert by_name["Charlie"]["processed_violations"] == 0
+    assert by_name["Charlie"]["median_processing_seconds"] is None
+
+
+@pytest.mark.parametrize(
+    "descending, skip, limit, expected",
+    [
+        (True, 0, None, ["Alpha", "Bravo", "Charlie"]),
+        (False, 0, None, ["Bravo", "Alpha", "Charlie"]),
+        (False, 1, 1, ["Alpha"]),
+        (True, 2, 5, ["Charlie"]),
+    ],
+)
+def test_sort_and_page_by_percentile(db, officers, descending, skip, limit, expected):
+    rows, total = officer_performance(
+        db, SINCE, sort_by="median_processing_seconds", descending=descending, skip=skip, limit=limit
+    )
+    assert _names(rows) == expected
+    assert total == 3
+
+
+def test_page_past_the_end_counts_only_the_filtered_officers(db, officers):
+    assert officer_performance(db, SINCE, skip=10) == ([], 3)
+    assert officer_performance(db, SINCE, officer_id=officers["bravo"], skip=10) == ([], 1)
+
+
+def test_one_officer(db, officers):
+    rows, total = officer_performance(db, SINCE, officer_id=officers["retired"])
+    assert total == 1
+    assert rows[0]["processed_violations"] == 1
+    assert rows[0]["p90_processing_seconds"] == pytest.approx(10, abs=0.01)
@@ -0,0 +1,152 @@
+"""Monthly partitioning of violations; PostgreSQL only, so these need TEST_POSTGRES_URL"""
+from datetime import date, datetime, timezone
+import hashlib
+
+import pytest
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.crud.evidence import get_blob, register_blob, storage_key
+from app.crud.violation import get_violation_by_code, get_violations_by_license_plate
+from app.db.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    convert_to_partitioned,
+    create_month_partition,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_table,
+)
+from app.models.violation import Violation
+
+pytestmark = pytest.mark.postgres
+
+JANUARY = datetime(2025, 1, 15, 8, 30, tzinfo=timezone.utc)
+FEBRUARY = datetime(2025, 2, 10, 17, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine(postgres_engine):
+    return postgres_engine
+
+
+def _convert(db, engine, months_ahead=1):
+    # The session must not hold a lock on violations while it is rebuilt
+    db.rollback()
+    with engine.begin() as connection:
+        return convert_to_partitioned(connection, months_ahead=months_ahead)
+
+
+def _detach(db, engine, **options):
+    db.rollback()
+    with engine.begin() as connection:
+        return detach_partitions(connection, before=date(2025, 3, 1), **options)
+
+
+def _archive_tables(engine):
+    with engine.connect() as connection:
+        return set(connection.execute(
+            text("SELECT tablename FROM pg_tables WHERE schemaname = :schema"),
+            {"schema": settings.VIOLATION_PARTITION_ARCHIVE_SCHEMA},
+        ).scalars())
+
+
+def test_convert_keeps_rows_and_ids(db, engine, make_violation):
+    violations = [make_violation(JANUARY), make_violation(FEBRUARY), make_violation()]
+    expected = {violation.id: violation.violation_code for violation in violations}
+
+    created = _convert(db, engine)
+
+    current = month_start(datetime.utcnow().date())
+    assert created[0] == "violations_p2025_01"
+    assert created[-1] == f"violations_p{add_months(current, 1):%Y_%m}"
+    with engine.connect() as connection:
+        assert is_partitioned(connection)
+        assert {partition.name for partition in list_partitions(connection)} == {*created, DEFAULT_PARTITION}
+        rows = connection.execute(select(Violation.id, Violation.violation_code)).all()
+        january = connection.execute(select(partition_table("violations_p2025_01").c.id)).scalars().all()
+    assert dict(rows) == expected
+    assert january == [violations[0].id]
+
+    # New violations keep taking ids from the original sequence
+    assert make_violation(FEBRUARY).id > max(expected)
+
+
+def test_ensure_creates_upcoming_partitions_and_moves_stray_rows(db, engine, make_violation):
+    make_violation(JANUARY)
+    _convert(db, engine, months_ahead=0)
+    later = datetime(2031, 6, 1, tzinfo=timezone.utc)
+    stray_id = make_violation(later).id
+    db.rollback()
+
+    with engine.begin() as connection:
+        assert connection.execute(text(f"SELECT id FROM {DEFAULT_PARTITION}")).scalars().all() == [stray_id]
+        created = ensure_partitions(connection, months_ahead=2, today=date(2031, 5, 20))
+        assert created == ["violations_p2031_05", "violations_p2031_06", "violations_p2031_07"]
+        assert ensure_partitions(connection, months_ahead=2, today=date(2031, 5, 20)) == []
+        assert not create_month_partition(connection, date(2031, 6, 1))
+        assert connection.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar() == 0
+        assert connection.execute(text("SELECT id FROM violations_p2031_06")).scalars().all() == [stray_id]
+
+
+def test_detach_holds_partitions_with_open_violations(db, engine, make_violation, assert_rollup_consistent):
+    closed = make_violation(JANUARY, status="paid", license_plate="30F-999.99")
+    closed_id, closed_code, plate = closed.id, closed.violation_code, closed.license_plate
+    open_violation = make_violation(FEBRUARY, status="processed")
+    make_violation(FEBRUARY, status="rejected")
+    _convert(db, engine)
+
+    result = _detach(db, engine)
+
+    assert result.detached == ["violations_p2025_01"]
+    assert result.held == {"violations_p2025_02": 1}
+    assert _archive_tables(engine) == {"violations_p2025_01"}
+    with engine.connect() as connection:
+        names = {partition.name for partition in list_partitions(connection)}
+    assert "violations_p2025_02" in names and "violations_p2025_01" not in names
+
+    # The open violation can still be processed, and the archived one is still found
+    assert db.get(Violation, open_violation.id).status == "processed"
+    assert get_violation_by_code(db, closed_code).id == closed_id
+    assert [violation.id for violation in get_violations_by_license_plate(db, plate)] == [closed_id]
+    assert_rollup_consistent()
+
+
+def test_detach_treats_missing_status_as_open(db, engine, make_violation):
+    violation = make_violation(JANUARY)
+    db.execute(text("UPDATE violations SET status = NULL WHERE id = :id"), {"id": violation.id})
+    db.commit()
+    _convert(db, engine)
+
+    result = _detach(db, engine)
+
+    assert "violations_p2025_01" not in result.detached
+    assert result.held == {"violations_p2025_01": 1}
+
+
+def test_drop_releases_rollup_and_evidence(db, engine, make_violation, assert_rollup_consistent):
+    sha = hashlib.sha256(b"plate photo").hexdigest()
+    key = storage_key(sha, "jpg")
+    register_blob(db, sha, key, 11, "image/jpeg")
+    image_url = f"/uploads/{key}"
+    dropped = make_violation(JANUARY, status="paid", image_url=image_url)
+    dropped_id, dropped_code = dropped.id, dropped.violation_code
+    kept = make_violation(FEBRUARY, status="paid", image_url=image_url)
+    make_violation(FEBRUARY)
+    assert get_blob(db, sha).ref_count == 2
+    _convert(db, engine)
+
+    result = _detach(db, engine, drop=True)
+
+    assert result.detached == ["violations_p2025_01"]
+    assert result.held == {"violations_p2025_02": 1}
+    assert _archive_tables(engine) == set()
+    assert db.get(Violation, dropped_id) is None
+    assert get_blob(db, sha).ref_count == 1
+    assert get_violation_by_code(db, dropped_code) is None
+    assert get_violation_by_code(db, kept.violation_code).id == kept.id
+    counts = assert_rollup_consistent()
+    assert all(day >= date(2025, 2, 1) for day, *_ in counts)
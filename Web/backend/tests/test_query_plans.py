@@ -0,0 +1,71 @@
+import re
+
+import pytest
+from sqlalchemy import text
+
+from app.db.query_plans import explain_hot_queries
+
+ROWS = 3000
+
+# Indexes each hot query is meant to be served by; where SQLite and PostgreSQL
+# plan it differently, either one is fine
+EXPECTED_INDEXES = {
+    "violation list": {"ix_violations_created_at_id"},
+    "violation list by status": {"ix_violations_status_created_at_id"},
+    "officer queue": {"ix_violations_pending_created_at_id", "ix_violations_status_created_at_id"},
+    "officer queue, next page": {"ix_violations_pending_created_at_id", "ix_violations_status_created_at_id"},
+    "violations by date range": {"ix_violations_violation_time"},
+    "citizen reports": {"ix_violations_reported_by_status"},
+    "lookup by code": {"ix_violations_violation_code"},
+    "lookup by plate": {"ix_violations_license_plate_normalized_trgm", "sqlite_autoindex_violation_plate_ngrams_1"},
+    "status counts": {"ix_violations_status_created_at_id", "ix_violations_created_at_id"},
+    "officer performance": {"ix_violations_processed_by_processed_at"},
+    "officer performance, one officer": {"ix_violations_processed_by_processed_at"},
+    "camera efficiency": {"ix_violations_camera_id_violation_time", "ix_violations_violation_time"},
+    "export": {"ix_violations_violation_time"},
+}
+
+_INDEX_NAME = re.compile(r"\b(ix_\w+|sqlite_autoindex_\w+)")
+
+
+def _report(engine):
+    return {label: plans for label, plans in explain_hot_queries(engine, ROWS)}
+
+
+def _scans(plans):
+    return [" ".join(plan.statement.split()) for plan in plans if plan.scanned]
+
+
+def _indexes(plans):
+    return {name for plan in plans for line in plan.lines for name in _INDEX_NAME.findall(line)}
+
+
+def test_every_hot_query_is_checked(engine):
+    assert set(_report(engine)) == set(EXPECTED_INDEXES)
+
+
+def test_hot_queries_do_not_scan_violations(engine):
+    scans = {label: _scans(plans) for label, plans in _report(engine).items() if _scans(plans)}
+    assert not scans, f"Sequential scans of violations: {scans}"
+
+
+def test_hot_queries_use_their_indexes(engine):
+    missing = {
+        label: sorted(_indexes(plans))
+        for label, plans in _report(engine).items()
+        if not _indexes(plans) & EXPECTED_INDEXES[label]
+    }
+    assert not missing, f"Hot queries planned without their index (indexes used): {missing}"
+
+
+@pytest.mark.parametrize(
+    "index, label",
+    [
+        ("ix_violations_processed_by_processed_at", "officer performance, one officer"),
+        ("ix_violations_created_at_id", "violation list"),
+    ],
+)
+def test_dropped_index_shows_up_as_a_scan(engine, index, label):
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX {index}"))
+    assert _scans(_report(engine)[label])
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api import deps
+from app.core.rate_limit import TokenBucketLimiter
+
+
+def _request(host="203.0.113.7"):
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "client": (host, 1234)})
+
+
+def test_burst_then_finite_retry():
+    limiter = TokenBucketLimiter(rate=0.5, burst=2)
+
+    assert [limiter.acquire("a"), limiter.acquire("a")] == [0.0, 0.0]
+    assert 0 < limiter.acquire("a") <= 2.0
+    assert limiter.acquire("b") == 0.0
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_zero_rate_disables_the_limit(rate):
+    limiter = TokenBucketLimiter(rate=rate, burst=1)
+    assert all(limiter.acquire("a") == 0.0 for _ in range(100))
+
+
+def test_zero_burst_still_lets_a_request_through():
+    limiter = TokenBucketLimiter(rate=1.0, burst=0)
+    assert limiter.acquire("a") == 0.0
+
+
+def test_lookup_dependency_with_rate_limiting_disabled(monkeypatch):
+    monkeypatch.setattr(deps, "lookup_rate_limiter", TokenBucketLimiter(rate=0, burst=1))
+    for _ in range(5):
+        asyncio.run(deps.rate_limit_lookup(_request()))
+
+
+def test_lookup_dependency_sets_retry_after(monkeypatch):
+    monkeypatch.setattr(deps, "lookup_rate_limiter", TokenBucketLimiter(rate=1 / 60, burst=1))
+    asyncio.run(deps.rate_limit_lookup(_request()))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(deps.rate_limit_lookup(_request()))
+
+    assert error.value.status_code == 429
+    assert 1 <= int(error.value.headers["Retry-After"]) <= 60
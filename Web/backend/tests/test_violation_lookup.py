@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+
+from app.crud.violation import LOOKUP_COLUMNS, get_violation_by_code, get_violations_by_license_plate
+from app.crud.violation_archive import archive_closed_violations
+from app.schemas.violation import Violation as ViolationSchema
+
+LOOKUP_FIELDS = tuple(column.name for column in LOOKUP_COLUMNS)
+LONG_AGO = datetime.now(timezone.utc) - timedelta(days=400)
+
+
+def _archive(db):
+    return archive_closed_violations(db, older_than=timedelta(days=365))
+
+
+def test_hot_and_archived_lookups_return_the_same_shape(db, make_violation):
+    hot = make_violation(license_plate="51A-111.11")
+    archived = make_violation(LONG_AGO, status="paid", license_plate="51A-222.22")
+    hot_code, archived_code, archived_id = hot.violation_code, archived.violation_code, archived.id
+    assert _archive(db) == 1
+
+    from_hot = get_violation_by_code(db, hot_code)
+    from_archive = get_violation_by_code(db, archived_code)
+
+    assert from_hot._fields == from_archive._fields == LOOKUP_FIELDS
+    assert from_archive.id == archived_id and from_archive.status == "paid"
+    for row in (from_hot, from_archive):
+        # What the lookup endpoint serves
+        assert ViolationSchema.model_validate(row).model_dump(mode="json")["violation_code"] == row.violation_code
+
+
+def test_plate_lookup_falls_back_to_the_archive(db, make_violation):
+    older = make_violation(LONG_AGO, status="paid", license_plate="30F-555.55")
+    newer = make_violation(LONG_AGO + timedelta(days=1), status="rejected", license_plate="30F-555.55")
+    expected = [newer.id, older.id]
+    assert _archive(db) == 2
+
+    rows = get_violations_by_license_plate(db, "30f 555 55")
+
+    assert [row.id for row in rows] == expected
+    assert all(row._fields == LOOKUP_FIELDS for row in rows)
+
+    # Hot matches win over the archive
+    hot = make_violation(license_plate="30F-555.55")
+    assert [row.id for row in get_violations_by_license_plate(db, "30F-555.55")] == [hot.id]
+
+
+def test_unknown_code_is_not_found(db, make_violation):
+    make_violation()
+    assert get_violation_by_code(db, "VNOPE") is None
+    assert get_violations_by_license_plate(db, "99Z-000.00") == []
@@ -0,0 +1,94 @@
+"""
+The daily rollup is maintained incrementally by every write path; after
+each one it must match what rebuild_rollup computes from scratch.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from app.crud.violation import bulk_update_status, ingest_camera_violations
+from app.crud.violation_archive import archive_closed_violations
+from app.crud.violation_rollup import get_daily_counts, record_violations_removed
+from app.models.violation import Violation
+from app.schemas.violation import CameraViolationIngest
+
+DAY = datetime(2025, 3, 10, 9, 0, tzinfo=timezone.utc)
+LONG_AGO = datetime.now(timezone.utc) - timedelta(days=400)
+
+
+def _detection(key, when=DAY, **fields):
+    return CameraViolationIngest(
+        idempotency_key=key,
+        license_plate="51A-123.45",
+        violation_type="Speeding",
+        location="Main St",
+        violation_time=when,
+        fine_amount=1200000,
+        **fields,
+    )
+
+
+def test_create(db, make_violation, assert_rollup_consistent):
+    make_violation(DAY)
+    make_violation(DAY + timedelta(hours=20))
+    make_violation(DAY, violation_type="Speeding")
+
+    assert_rollup_consistent()
+    assert get_daily_counts(db, date(2025, 3, 10), date(2025, 3, 11)) == {date(2025, 3, 10): 2, date(2025, 3, 11): 1}
+
+
+def test_status_change(db, make_violation, assert_rollup_consistent):
+    make_violation(DAY, status="processed")
+    make_violation(DAY, status="paid")
+    make_violation(DAY)
+
+    counts = assert_rollup_consistent()
+    assert {key[3]: count for key, count in counts.items()} == {"pending": 1, "processed": 1, "paid": 1}
+
+
+def test_bulk_status_change(db, make_violation, assert_rollup_consistent):
+    ids = [make_violation(DAY).id for _ in range(3)]
+    already_processed = make_violation(DAY, status="processed").id
+
+    updated, failed = bulk_update_status(db, [*ids, already_processed, 999999], "processed", None, processed_by=None)
+
+    assert updated == ids and set(failed) == {already_processed, 999999}
+    counts = assert_rollup_consistent()
+    assert {key[3]: count for key, count in counts.items()} == {"processed": 4}
+
+
+def test_camera_ingest_counts_only_new_detections(db, camera, assert_rollup_consistent):
+    ingest_camera_violations(db, camera.id, [_detection("a"), _detection("b"), _detection("a")])
+    ingest_camera_violations(db, camera.id, [_detection("b"), _detection("c", DAY + timedelta(days=1))])
+
+    counts = assert_rollup_consistent()
+    assert counts == {
+        (date(2025, 3, 10), camera.id, "Speeding", "pending", "camera"): 2,
+        (date(2025, 3, 11), camera.id, "Speeding", "pending", "camera"): 1,
+    }
+
+
+def test_archive_keeps_counts(db, make_violation, assert_rollup_consistent):
+    make_violation(LONG_AGO, status="paid")
+    make_violation(LONG_AGO, status="rejected")
+    make_violation(LONG_AGO)
+    before = assert_rollup_consistent()
+
+    assert archive_closed_violations(db, older_than=timedelta(days=365)) == 2
+
+    assert assert_rollup_consistent() == before
+
+
+def test_removed_violations_are_subtracted(db, make_violation, assert_rollup_consistent):
+    make_violation(DAY, status="paid")
+    make_violation(DAY, status="paid")
+    kept = make_violation(DAY + timedelta(days=1), status="paid").id
+
+    # What dropping a partition does: subtract its rows, then delete them
+    removed = select(Violation).where(Violation.id != kept).subquery()
+    record_violations_removed(db, removed)
+    db.execute(delete(Violation).where(Violation.id != kept))
+    db.commit()
+
+    counts = assert_rollup_consistent()
+    assert counts == {(date(2025, 3, 11), 0, "Red light", "paid", "report"): 1}